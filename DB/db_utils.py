@@ -1,12 +1,85 @@
-from ..Discord.api_utils import Game
 import sqlite3
+import sys
 from dotenv import load_dotenv
 from datetime import datetime, date
 import os
 
+# The bot's modules use flat imports, so they are imported from its directory
+# (as in maintenance.py).
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "Discord"))
+from api_utils import Game  # noqa: E402
+from season_calendar import season_for  # noqa: E402
+
 load_dotenv()
 DATABASE_FILE = os.getenv('DATABASE_FILE')
 
+FINAL_GAME_STATES = ("FINAL", "OFF")
+REGULAR_SEASON = 2
+PLAYOFFS = 3
+
+
+def _apply_final(cursor, game_id):
+    """
+    Adds one final result from the 'games' table to team_standings and head_to_head.
+    Must run in the same transaction as the update that made the game final.
+    """
+    cursor.execute(
+        "SELECT game_date, game_type, home_abbrv, away_abbrv, home_score, away_score, period "
+        "FROM games WHERE id = ?;", (game_id,))
+    row = cursor.fetchone()
+    if row is None:
+        return False
+    game_date, game_type, home, away, home_score, away_score, period = row
+    if home_score == away_score:
+        return False  # Not a real final (e.g. a stale row); nothing to count
+    season = season_for(game_date)
+
+    for team, opponent, goals_for, goals_against in ((home, away, home_score, away_score),
+                                                     (away, home, away_score, home_score)):
+        if goals_for > goals_against:
+            result = "W"
+        elif period > 3 and game_type != PLAYOFFS:
+            result = "O"
+        else:
+            result = "L"
+        win, loss, ot_loss = int(result == "W"), int(result == "L"), int(result == "O")
+
+        # Right-hand sides of an UPSERT's SET read the row's old values, so the
+        # streak can be compared against the previous result here.
+        cursor.execute("""
+        INSERT INTO team_standings (
+            season, game_type, team, games_played, wins, losses, ot_losses, points,
+            goals_for, goals_against, streak_type, streak_count, last_10
+        ) VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?, ?, ?, 1, ?)
+        ON CONFLICT (season, game_type, team) DO UPDATE SET
+            games_played = games_played + 1,
+            wins = wins + excluded.wins,
+            losses = losses + excluded.losses,
+            ot_losses = ot_losses + excluded.ot_losses,
+            points = points + excluded.points,
+            goals_for = goals_for + excluded.goals_for,
+            goals_against = goals_against + excluded.goals_against,
+            streak_count = CASE WHEN streak_type = excluded.streak_type THEN streak_count + 1 ELSE 1 END,
+            streak_type = excluded.streak_type,
+            last_10 = substr(excluded.last_10 || last_10, 1, 10);
+        """, (season, game_type, team, win, loss, ot_loss, 2 * win + ot_loss,
+              goals_for, goals_against, result, result))
+
+        cursor.execute("""
+        INSERT INTO head_to_head (
+            season, game_type, team, opponent, games_played, wins, losses, ot_losses,
+            goals_for, goals_against
+        ) VALUES (?, ?, ?, ?, 1, ?, ?, ?, ?, ?)
+        ON CONFLICT (season, game_type, team, opponent) DO UPDATE SET
+            games_played = games_played + 1,
+            wins = wins + excluded.wins,
+            losses = losses + excluded.losses,
+            ot_losses = ot_losses + excluded.ot_losses,
+            goals_for = goals_for + excluded.goals_for,
+            goals_against = goals_against + excluded.goals_against;
+        """, (season, game_type, team, opponent, win, loss, ot_loss, goals_for, goals_against))
+    return True
+
 
 def add_games_to_db(games_data):
     """
@@ -88,6 +161,8 @@ def update_games_from_objects(games_objs: list[Game]) -> tuple[int, int]:
     Updates specified fields for a list of Game objects in the 'games' table.
     The updated fields are: home_score, away_score, game_state, period,
     in_intermission, and seconds_remaining.
+    Rows whose fields actually change are also appended to the game_changes
+    log by database triggers, in the same transaction (see change_feed.py).
 
     Args:
         games_objs (list[Game]): A list of Game objects containing updated status and their IDs.
@@ -141,9 +216,20 @@ def update_games_from_objects(games_objs: list[Game]) -> tuple[int, int]:
 
         # Use executemany for efficient batch updates
         cursor.executemany(update_sql, data_to_update)
-        conn.commit()
-
         total_updated = cursor.rowcount
+
+        # Fold newly final games into the standings in the same transaction,
+        # each game exactly once no matter how often its final state is written.
+        for game_obj in games_objs:
+            if game_obj.game_state in FINAL_GAME_STATES:
+                cursor.execute(
+                    "INSERT OR IGNORE INTO standings_applied (game_id) VALUES (?);", (game_obj.id,))
+                if cursor.rowcount == 1 and not _apply_final(cursor, game_obj.id):
+                    # Nothing was counted (no row yet, or a tied score from a stale
+                    # write), so leave the game to be counted by its real final.
+                    cursor.execute("DELETE FROM standings_applied WHERE game_id = ?;", (game_obj.id,))
+
+        conn.commit()
         print(
             f"Attempted to update {total_attempted} games. Successfully updated {total_updated} game(s).")
         return total_attempted, total_updated
@@ -311,3 +397,71 @@ def get_tracked_games_for_today():
     finally:
         if conn:
             conn.close()  # Always close the connectionb
+
+
+
+def _fetch_aggregates(sql, params):
+    """Runs a read-only aggregate query and returns its rows as dicts."""
+    conn = None
+    try:
+        conn = sqlite3.connect(DATABASE_FILE)
+        conn.row_factory = sqlite3.Row
+        return [dict(row) for row in conn.execute(sql, params)]
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return []
+    finally:
+        if conn:
+            conn.close()
+
+
+def get_standings(season=None, game_type=REGULAR_SEASON):
+    """
+    Retrieves the league standings, best first, from the materialized team_standings table.
+
+    Returns:
+        A list of dicts, one per team.
+    """
+    return _fetch_aggregates("""
+        SELECT * FROM team_standings
+        WHERE season = ? AND game_type = ?
+        ORDER BY points DESC, wins DESC, goals_for - goals_against DESC;
+        """, (season or season_for(date.today()), game_type))
+
+
+def get_team_record(team, season=None, game_type=REGULAR_SEASON):
+    """
+    Retrieves a team's record, streak and last-10 results (most recent first).
+
+    Returns:
+        A dict, or None if the team has no final games stored for the season.
+    """
+    rows = _fetch_aggregates("""
+        SELECT * FROM team_standings
+        WHERE season = ? AND game_type = ? AND team = ?;
+        """, (season or season_for(date.today()), game_type, team))
+    return rows[0] if rows else None
+
+
+def get_head_to_head(team, opponent, season=None, game_type=REGULAR_SEASON):
+    """
+    Retrieves a team's results against one opponent, from the team's point of view.
+
+    Returns:
+        A dict, or None if they haven't met this season.
+    """
+    rows = _fetch_aggregates("""
+        SELECT * FROM head_to_head
+        WHERE season = ? AND game_type = ? AND team = ? AND opponent = ?;
+        """, (season or season_for(date.today()), game_type, team, opponent))
+    return rows[0] if rows else None
+
+
+def get_series(team, opponent, season=None):
+    """
+    Retrieves a playoff series tally between two teams, from the first team's point of view.
+
+    Returns:
+        A dict with 'wins' and 'losses', or None if they haven't played in the playoffs.
+    """
+    return get_head_to_head(team, opponent, season, PLAYOFFS)
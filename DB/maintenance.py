@@ -0,0 +1,204 @@
+"""
+Retention and compaction for the bot's SQLite database.
+
+    python maintenance.py [--db PATH] [--retention-days 30] [--changes-retention-days 7]
+                          [--stale-consumer-days 14] [--dry-run]
+
+- Finished games older than --retention-days move from 'games' into the
+  compact 'game_results' table (see migrations/20251022_create_game_results.sql).
+- game_changes rows older than --changes-retention-days are deleted, but
+  never rows a registered consumer (change_cursors) hasn't read yet, unless
+  that consumer hasn't moved its cursor in --stale-consumer-days.
+- Leases and standings_applied markers of compacted games go too, as do
+  day claims (see Discord/leases.py) older than --retention-days.
+- Freed pages are returned to the filesystem with incremental vacuum and the
+  query planner statistics are refreshed with ANALYZE.
+
+Database size and the latency of the bot's hot queries are printed before
+and after. Run it from cron, e.g. nightly outside game hours.
+"""
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+from dotenv import load_dotenv
+
+# Run as a script from cron; the bot's modules, like the shared season_for,
+# are imported from its directory (as in db_utils.py).
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "Discord"))
+from season_calendar import season_for  # noqa: E402
+
+FINAL_GAME_STATES = ("FINAL", "OFF")
+# name -> (sql, parameters), the lookups the bot and HA run most often
+HOT_QUERIES = {
+    "games for today": ("SELECT * FROM games WHERE game_date = ?;", lambda: (date.today().isoformat(),)),
+    "tracked games for today": ("SELECT * FROM games WHERE game_date = ? AND tracked = 1;",
+                                lambda: (date.today().isoformat(),)),
+    "change log tail": ("SELECT * FROM game_changes WHERE seq > (SELECT COALESCE(MAX(seq), 0) - 100 FROM game_changes) "
+                        "ORDER BY seq;", lambda: ()),
+    "standings": ("SELECT * FROM team_standings WHERE season = ? AND game_type = 2 ORDER BY points DESC;",
+                  lambda: (season_for(date.today()),)),
+}
+
+
+def _table_exists(conn, table):
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?;", (table,)).fetchone() is not None
+
+
+def report(conn, path, repeat=20):
+    """Returns {"file_bytes", "free_bytes", "rows": {table: n}, "latency_ms": {query: median}}."""
+    page_size = conn.execute("PRAGMA page_size;").fetchone()[0]
+    stats = {
+        "file_bytes": os.path.getsize(path),
+        "free_bytes": conn.execute("PRAGMA freelist_count;").fetchone()[0] * page_size,
+        "rows": {},
+        "latency_ms": {},
+    }
+    for table in ("games", "game_results", "game_changes", "standings_applied", "leases"):
+        if _table_exists(conn, table):
+            stats["rows"][table] = conn.execute(f"SELECT COUNT(*) FROM {table};").fetchone()[0]
+    for name, (sql, params) in HOT_QUERIES.items():
+        try:
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                conn.execute(sql, params()).fetchall()
+                timings.append(time.perf_counter() - started)
+            stats["latency_ms"][name] = statistics.median(timings) * 1000
+        except sqlite3.OperationalError:
+            pass  # Table not created yet on this database
+    return stats
+
+
+def compact_finished_games(conn, retention_days):
+    """Moves finished games older than the retention period into game_results."""
+    cutoff = (date.today() - timedelta(days=retention_days)).isoformat()
+    rows = conn.execute(f"""
+        SELECT id, game_date, game_type, home_abbrv, away_abbrv, home_score, away_score, period
+        FROM games
+        WHERE game_date < ? AND game_state IN ({", ".join("?" * len(FINAL_GAME_STATES))});
+        """, (cutoff, *FINAL_GAME_STATES)).fetchall()
+    conn.executemany("""
+        INSERT OR REPLACE INTO game_results (
+            game_id, season, game_date, game_type, home_abbrv, away_abbrv, home_score, away_score, periods
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?);
+        """, [(game_id, season_for(game_date), game_date, game_type, home, away, home_score, away_score, period)
+              for game_id, game_date, game_type, home, away, home_score, away_score, period in rows])
+    conn.executemany("DELETE FROM games WHERE id = ?;", [(row[0],) for row in rows])
+    if _table_exists(conn, "standings_applied"):
+        # Compacted games can't be written again, so their markers aren't needed.
+        conn.execute("DELETE FROM standings_applied WHERE game_id NOT IN (SELECT id FROM games);")
+    return len(rows)
+
+
+def prune_changes(conn, retention_days, stale_consumer_days=14):
+    """
+    Deletes old change log rows that every registered consumer has already
+    read. A consumer whose cursor hasn't moved in stale_consumer_days is taken
+    to be gone and doesn't hold rows back; if it comes back, it resumes from
+    the oldest row left.
+    """
+    if not _table_exists(conn, "game_changes"):
+        return 0
+    cutoff = (datetime.utcnow() - timedelta(days=retention_days)).strftime("%Y-%m-%d %H:%M:%S")
+    stale_cutoff = (datetime.utcnow() - timedelta(days=stale_consumer_days)).strftime("%Y-%m-%d %H:%M:%S")
+    max_seq = conn.execute("SELECT MAX(seq) FROM game_changes;").fetchone()[0]
+    # A consumer that has read everything blocks nothing, however long it has been idle.
+    for consumer, seq, updated_at in conn.execute(
+            "SELECT consumer, seq, updated_at FROM change_cursors WHERE updated_at < ? AND seq < ?;",
+            (stale_cutoff, max_seq)):
+        print(f"Ignoring change log consumer {consumer!r}: cursor {seq} hasn't moved since {updated_at}")
+    min_cursor = conn.execute(
+        "SELECT MIN(seq) FROM change_cursors WHERE updated_at >= ?;", (stale_cutoff,)).fetchone()[0]
+    cursor = conn.execute(
+        "DELETE FROM game_changes WHERE changed_at < ? AND seq <= COALESCE(?, seq);", (cutoff, min_cursor))
+    return cursor.rowcount
+
+
+def prune_leases(conn, retention_days):
+    """
+    Deletes the leases of work that can't run again: games compacted into
+    game_results and day claims older than the retention period. Other rows
+    stay even once expired, because deleting a row restarts its fencing
+    token at 1 and a stale holder's writes would be accepted again.
+    """
+    if not _table_exists(conn, "leases") or not _table_exists(conn, "game_results"):
+        return 0
+    cutoff = (date.today() - timedelta(days=retention_days)).isoformat()
+    return conn.execute("""
+        DELETE FROM leases
+        WHERE (name LIKE 'game:%' AND expires_at < ?
+               AND CAST(substr(name, 6) AS INTEGER) IN (SELECT game_id FROM game_results))
+           OR (name LIKE 'today:%' AND substr(name, 7) < ?);
+        """, (time.time(), cutoff)).rowcount
+
+
+def vacuum(conn):
+    """
+    Returns free pages to the filesystem. The first run on a database created
+    without auto_vacuum=INCREMENTAL switches it over, which needs one full VACUUM.
+    """
+    if conn.execute("PRAGMA auto_vacuum;").fetchone()[0] != 2:
+        print("Switching the database to incremental auto-vacuum (one-time full VACUUM)")
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL;")
+        conn.execute("VACUUM;")
+    else:
+        conn.execute("PRAGMA incremental_vacuum;")
+    conn.execute("ANALYZE;")
+
+
+def print_report(before, after):
+    print(f"{'':<28} {'before':>12} {'after':>12}")
+    print(f"{'file size (B)':<28} {before['file_bytes']:>12,} {after['file_bytes']:>12,}")
+    print(f"{'free pages (B)':<28} {before['free_bytes']:>12,} {after['free_bytes']:>12,}")
+    for table, count in before["rows"].items():
+        print(f"{'rows: ' + table:<28} {count:>12,} {after['rows'].get(table, 0):>12,}")
+    for name, latency in before["latency_ms"].items():
+        print(f"{name + ' (ms)':<28} {latency:>12.3f} {after['latency_ms'].get(name, float('nan')):>12.3f}")
+
+
+def main(argv=None):
+    load_dotenv()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", default=os.getenv("DATABASE_FILE"))
+    parser.add_argument("--retention-days", type=int, default=30,
+                        help="Keep finished games in 'games' this long")
+    parser.add_argument("--changes-retention-days", type=int, default=7,
+                        help="Keep game_changes rows this long")
+    parser.add_argument("--stale-consumer-days", type=int, default=14,
+                        help="Stop keeping game_changes rows for a consumer whose cursor hasn't moved this long")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be removed, then roll back")
+    args = parser.parse_args(argv)
+    if not args.db:
+        parser.error("--db or DATABASE_FILE is required")
+
+    conn = sqlite3.connect(args.db, isolation_level=None)
+    try:
+        before = report(conn, args.db)
+
+        conn.execute("BEGIN IMMEDIATE;")
+        try:
+            compacted = compact_finished_games(conn, args.retention_days)
+            pruned = prune_changes(conn, args.changes_retention_days, args.stale_consumer_days)
+            leases = prune_leases(conn, args.retention_days)
+            conn.execute("ROLLBACK;" if args.dry_run else "COMMIT;")
+        except Exception:
+            conn.execute("ROLLBACK;")
+            raise
+        print(f"{'Would compact' if args.dry_run else 'Compacted'} {compacted} finished game(s), "
+              f"pruned {pruned} change log row(s) and {leases} finished lease(s).")
+
+        if not args.dry_run:
+            vacuum(conn)
+        print_report(before, report(conn, args.db))
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+-- Aggregates maintained by db_utils.update_games_from_objects as games go FINAL.
+-- Each final is applied once (see standings_applied), adding to the rows below
+-- instead of recomputing the season.
+
+-- Games whose result has been added to the aggregates
+CREATE TABLE IF NOT EXISTS standings_applied (
+    game_id INTEGER PRIMARY KEY,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- One row per team, season and game type (2 regular season, 3 playoffs)
+CREATE TABLE IF NOT EXISTS team_standings (
+    season CHAR(8) NOT NULL,
+    game_type INT NOT NULL,
+    team CHAR(3) NOT NULL,
+    games_played INT DEFAULT 0,
+    wins INT DEFAULT 0,
+    losses INT DEFAULT 0,
+    ot_losses INT DEFAULT 0,
+    points INT DEFAULT 0,
+    goals_for INT DEFAULT 0,
+    goals_against INT DEFAULT 0,
+    streak_type CHAR(1),           -- W, L or O (overtime/shootout loss)
+    streak_count INT DEFAULT 0,
+    last_10 VARCHAR(10) DEFAULT '', -- results, most recent first
+    PRIMARY KEY (season, game_type, team)
+);
+
+CREATE INDEX IF NOT EXISTS team_standings_points
+ON team_standings (season, game_type, points DESC, wins DESC);
+
+-- Both directions of every matchup; with game_type 3 this is the playoff series tally
+CREATE TABLE IF NOT EXISTS head_to_head (
+    season CHAR(8) NOT NULL,
+    game_type INT NOT NULL,
+    team CHAR(3) NOT NULL,
+    opponent CHAR(3) NOT NULL,
+    games_played INT DEFAULT 0,
+    wins INT DEFAULT 0,
+    losses INT DEFAULT 0,
+    ot_losses INT DEFAULT 0,
+    goals_for INT DEFAULT 0,
+    goals_against INT DEFAULT 0,
+    PRIMARY KEY (season, game_type, team, opponent)
+);
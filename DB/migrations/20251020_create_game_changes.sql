@@ -0,0 +1,64 @@
+-- Append-only change log of the 'games' table (change-data-capture outbox).
+-- Rows are written by triggers, so they commit in the same transaction as the
+-- game insert/update that caused them, whichever code path wrote it.
+-- AUTOINCREMENT keeps seq strictly increasing and never reused, so consumers
+-- can tail the log with "seq > cursor".
+CREATE TABLE IF NOT EXISTS game_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    game_id INTEGER NOT NULL,
+    change_type VARCHAR(6) NOT NULL,  -- insert, update or final
+    game_state VARCHAR(5),
+    home_abbrv CHAR(3),
+    away_abbrv CHAR(3),
+    home_score INT,
+    away_score INT,
+    period INT,
+    in_intermission BOOLEAN,
+    seconds_remaining INT,
+    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS game_changes_game ON game_changes (game_id, seq);
+
+-- Last seq each named consumer has processed
+CREATE TABLE IF NOT EXISTS change_cursors (
+    consumer VARCHAR(64) PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TRIGGER IF NOT EXISTS games_log_insert
+AFTER INSERT ON games
+FOR EACH ROW
+BEGIN
+    INSERT INTO game_changes (
+        game_id, change_type, game_state, home_abbrv, away_abbrv, home_score, away_score,
+        period, in_intermission, seconds_remaining
+    ) VALUES (
+        NEW.id, 'insert', NEW.game_state, NEW.home_abbrv, NEW.away_abbrv, NEW.home_score, NEW.away_score,
+        NEW.period, NEW.in_intermission, NEW.seconds_remaining
+    );
+END;
+
+-- Only writes that change a live field are logged (not e.g. the updated_at touch)
+CREATE TRIGGER IF NOT EXISTS games_log_update
+AFTER UPDATE OF home_score, away_score, game_state, period, in_intermission, seconds_remaining ON games
+FOR EACH ROW
+WHEN OLD.home_score IS NOT NEW.home_score
+  OR OLD.away_score IS NOT NEW.away_score
+  OR OLD.game_state IS NOT NEW.game_state
+  OR OLD.period IS NOT NEW.period
+  OR OLD.in_intermission IS NOT NEW.in_intermission
+  OR OLD.seconds_remaining IS NOT NEW.seconds_remaining
+BEGIN
+    INSERT INTO game_changes (
+        game_id, change_type, game_state, home_abbrv, away_abbrv, home_score, away_score,
+        period, in_intermission, seconds_remaining
+    ) VALUES (
+        NEW.id,
+        CASE WHEN NEW.game_state IN ('FINAL', 'OFF') AND OLD.game_state NOT IN ('FINAL', 'OFF')
+             THEN 'final' ELSE 'update' END,
+        NEW.game_state, NEW.home_abbrv, NEW.away_abbrv, NEW.home_score, NEW.away_score,
+        NEW.period, NEW.in_intermission, NEW.seconds_remaining
+    );
+END;
@@ -0,0 +1,10 @@
+-- Leases for running several tracker instances against one database
+-- (see Discord/leases.py). A lease is held until expires_at unless renewed;
+-- token increases every time the lease changes hands (a fencing token).
+CREATE TABLE IF NOT EXISTS leases (
+    name VARCHAR(64) PRIMARY KEY,
+    holder VARCHAR(128) NOT NULL,
+    expires_at REAL NOT NULL,  -- Unix time
+    token INTEGER NOT NULL DEFAULT 1,
+    acquired_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,18 @@
+-- Compact rows for finished games, written by DB/maintenance.py when it
+-- removes them from 'games' after the retention period.
+CREATE TABLE IF NOT EXISTS game_results (
+    game_id INTEGER PRIMARY KEY,
+    season CHAR(8) NOT NULL,
+    game_date DATE NOT NULL,
+    game_type INT NOT NULL,
+    home_abbrv CHAR(3) NOT NULL,
+    away_abbrv CHAR(3) NOT NULL,
+    home_score INT NOT NULL,
+    away_score INT NOT NULL,
+    periods INT NOT NULL  -- more than 3 means overtime or a shootout
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS game_results_season ON game_results (season, game_date);
+
+-- The live lookups (today's games, tracked games) filter on game_date
+CREATE INDEX IF NOT EXISTS games_game_date ON games (game_date, tracked);
@@ -0,0 +1,311 @@
+"""
+Local fetch daemon that owns all NHL API traffic for this host.
+
+    python nhl_fetchd.py [--port 8765] [--unix /run/nhl_fetchd.sock] [--interval 10]
+
+The Home Assistant integration and the Discord bot both poll the same
+endpoints; pointed at this daemon, each upstream document is fetched once per
+TTL no matter how many clients ask for it.
+
+    GET /v1/<path>   NHL API passthrough with a per-endpoint TTL cache.
+                     Concurrent misses for a path share one upstream request.
+    GET /games       Normalized snapshots of the current day's games.
+    GET /events      text/event-stream. On connect, one "game" event per
+                     current snapshot and then a "synced" event; after that,
+                     a "game" event per snapshot that changed and a "gone"
+                     event ({"id": ...}) per game that left /score/now.
+
+Snapshots come from one /score/now poll every --interval seconds and use the
+/score entry's key names, so clients apply them like any /score game.
+
+Clients switch over by configuration only:
+    Discord bot:  NHL_API=http://127.0.0.1:8765/v1
+    Home Assistant: the "fetch daemon" option, http://127.0.0.1:8765 or
+                    unix:///run/nhl_fetchd.sock
+"""
+import argparse
+import json
+import logging
+import os
+import queue
+import random
+import socketserver
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+UPSTREAM = os.getenv("NHL_API", "https://api-web.nhle.com/v1")
+REQUEST_TIMEOUT_SECONDS = 10
+KEEPALIVE_SECONDS = 15
+# Seconds a cached body is served for, by the path's first segment
+TTL_SECONDS = {
+    "score": 5,
+    "gamecenter": 5,
+    "schedule": 300,
+    "club-schedule-season": 3600,
+}
+DEFAULT_TTL_SECONDS = 30
+# Bodies kept at most; expired ones are dropped first, then the oldest
+MAX_CACHE_ENTRIES = 512
+MAX_BACKOFF_SECONDS = 120
+SNAPSHOT_FIELDS = ("id", "season", "gameType", "gameState", "gameScheduleState", "startTimeUTC",
+                   "venue", "awayTeam", "homeTeam", "periodDescriptor", "clock")
+TEAM_FIELDS = ("id", "abbrev", "score", "commonName", "placeName", "name")
+
+_LOGGER = logging.getLogger("nhl_fetchd")
+
+
+def snapshot(game: dict) -> dict:
+    """The fields of a /score game entry the clients use, and nothing else."""
+    result = {key: game[key] for key in SNAPSHOT_FIELDS if key in game}
+    for side in ("awayTeam", "homeTeam"):
+        if side in result:
+            result[side] = {key: result[side][key] for key in TEAM_FIELDS if key in result[side]}
+    return result
+
+
+class Cache:
+    """
+    Upstream bodies by path, with one in-flight request per path. Expired
+    bodies are dropped whenever one is stored, and the oldest go once there
+    are more than MAX_CACHE_ENTRIES, since every game, date and team season
+    is a path of its own.
+    """
+
+    def __init__(self, upstream: str):
+        self.upstream = upstream
+        self._entries = {}  # path -> (expires, status, body)
+        self._in_flight = {}  # path -> Event set when the fetch finished
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "shared": 0, "errors": 0}
+
+    def get(self, path: str) -> tuple[int, bytes]:
+        """Returns (status, body) for an upstream path, fetching it if stale."""
+        while True:
+            with self._lock:
+                entry = self._entries.get(path)
+                if entry and entry[0] > time.monotonic():
+                    self.stats["hits"] += 1
+                    return entry[1], entry[2]
+                done = self._in_flight.get(path)
+                if done is None:
+                    done = self._in_flight[path] = threading.Event()
+                    self.stats["misses"] += 1
+                    break
+                self.stats["shared"] += 1
+            # Someone else is fetching this path; use their result.
+            done.wait(REQUEST_TIMEOUT_SECONDS * 2)
+
+        try:
+            status, body = self._fetch(path)
+            endpoint = path.split("?", 1)[0].split("/", 1)[0]
+            ttl = TTL_SECONDS.get(endpoint, DEFAULT_TTL_SECONDS) if status == 200 else 1
+            with self._lock:
+                if status != 200:
+                    self.stats["errors"] += 1
+                now = time.monotonic()
+                self._entries.pop(path, None)
+                self._evict(now)
+                self._entries[path] = (now + ttl, status, body)
+            return status, body
+        finally:
+            with self._lock:
+                self._in_flight.pop(path).set()
+
+    def _evict(self, now: float) -> None:
+        """Drop expired bodies, then the oldest stored until one more fits. Hold _lock."""
+        for path in [path for path, entry in self._entries.items() if entry[0] <= now]:
+            del self._entries[path]
+        while len(self._entries) >= MAX_CACHE_ENTRIES:
+            del self._entries[next(iter(self._entries))]
+
+    def snapshot_stats(self) -> dict:
+        with self._lock:
+            return {**self.stats, "entries": len(self._entries)}
+
+    def _fetch(self, path: str) -> tuple[int, bytes]:
+        request = urllib.request.Request(f"{self.upstream}/{path}", headers={"User-Agent": "nhl_fetchd"})
+        try:
+            with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT_SECONDS) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+        except (urllib.error.URLError, OSError) as e:
+            return 502, json.dumps({"error": str(e)}).encode()
+
+
+class Ticker(threading.Thread):
+    """
+    Polls /score/now through the cache and pushes changed snapshots to
+    subscribers. Games that leave the response (the NHL's day rolled over)
+    are dropped and announced as gone.
+    """
+
+    def __init__(self, cache: Cache, interval: float):
+        super().__init__(daemon=True, name="nhl_fetchd-ticker")
+        self.cache = cache
+        self.interval = interval
+        self.games = {}
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> queue.Queue:
+        """
+        A queue of (event, data): a "game" for every current snapshot and then
+        "synced" now, and a "game" per changed snapshot or a "gone" per dropped
+        game later.
+        """
+        events = queue.Queue()
+        with self._lock:
+            for game in self.games.values():
+                events.put(("game", game))
+            events.put(("synced", {}))
+            self._subscribers.add(events)
+        return events
+
+    def unsubscribe(self, events: queue.Queue) -> None:
+        with self._lock:
+            self._subscribers.discard(events)
+
+    def run(self):
+        failures = 0
+        while True:
+            try:
+                status, body = self.cache.get("score/now")
+                if status == 200:
+                    self._publish(json.loads(body).get("games", []))
+                else:
+                    _LOGGER.warning(f"score/now returned {status}")
+            except Exception:
+                # An undecodable or unexpected body must not end the thread:
+                # /events would go quiet for every client while /v1 kept
+                # serving. Log it and back off like an upstream error.
+                _LOGGER.exception("score/now poll failed")
+                status = None
+            if status == 200:
+                failures = 0
+                delay = self.interval
+            else:
+                # Jittered exponential backoff, capped at two minutes.
+                failures += 1
+                delay = min(MAX_BACKOFF_SECONDS, self.interval * 2 ** failures) * random.uniform(0.5, 1)
+            time.sleep(delay)
+
+    def _publish(self, games: list) -> None:
+        with self._lock:
+            seen = set()
+            for game in games:
+                current = snapshot(game)
+                seen.add(current["id"])
+                if self.games.get(current["id"]) != current:
+                    self.games[current["id"]] = current
+                    for events in self._subscribers:
+                        events.put(("game", current))
+            for game_id in self.games.keys() - seen:
+                del self.games[game_id]
+                for events in self._subscribers:
+                    events.put(("gone", {"id": game_id}))
+
+
+class Handler(BaseHTTPRequestHandler):
+    server_version = "nhl_fetchd"
+
+    def address_string(self):
+        # Unix socket peers have no address.
+        return self.client_address[0] if self.client_address else "unix"
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path.startswith("/v1/"):
+            # The query string is part of the upstream request, and of the cache key.
+            status, body = self.server.cache.get(self.path[len("/v1/"):])
+            self._send(status, body)
+        elif path == "/games":
+            with self.server.ticker._lock:
+                games = list(self.server.ticker.games.values())
+            self._send(200, json.dumps({"games": games}).encode())
+        elif path == "/stats":
+            self._send(200, json.dumps(self.server.cache.snapshot_stats()).encode())
+        elif path == "/events":
+            self._stream()
+        else:
+            self._send(404, b'{"error": "not found"}')
+
+    def _send(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        events = self.server.ticker.subscribe()
+        try:
+            while True:
+                try:
+                    event, data = events.get(timeout=KEEPALIVE_SECONDS)
+                    self.wfile.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode())
+                except queue.Empty:
+                    self.wfile.write(b": keepalive\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            self.server.ticker.unsubscribe(events)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(host="127.0.0.1", port=8765, unix=None, interval=10, upstream=UPSTREAM, verbose=False):
+    if unix:
+        if os.path.exists(unix):
+            os.unlink(unix)
+        server = UnixHTTPServer(unix, Handler)
+        where = f"unix://{unix}"
+    else:
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        where = f"http://{host}:{server.server_address[1]}"
+    server.cache = Cache(upstream)
+    server.ticker = Ticker(server.cache, interval)
+    server.verbose = verbose
+    server.ticker.start()
+    print(f"nhl_fetchd serving {upstream} on {where}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if unix and os.path.exists(unix):
+            os.unlink(unix)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", metavar="PATH", help="Listen on a Unix socket instead of TCP")
+    parser.add_argument("--interval", type=float, default=10, help="Seconds between /score/now polls")
+    parser.add_argument("--upstream", default=UPSTREAM)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    serve(args.host, args.port, args.unix, args.interval, args.upstream, args.verbose)
+
+
+if __name__ == "__main__":
+    main()
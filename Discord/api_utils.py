@@ -1,15 +1,88 @@
+import os
+import sys
+import threading
+import pytz
 import requests
+from contextlib import contextmanager
 from datetime import datetime
 
+from decoding import decode_game, decode_json, decode_scores
+from metrics import Metrics
+from resilience import CircuitBreaker
+from season_calendar import SeasonCalendar
 from utils import time_to_EST
 
-NHL_API = "https://api-web.nhle.com/v1"
+# Overridable so the bots can be pointed at a replay server (see bench/replay.py)
+# or at the shared fetch daemon (see Daemon/nhl_fetchd.py)
+NHL_API = os.getenv("NHL_API", "https://api-web.nhle.com/v1")
+METRICS_FILE = os.getenv("METRICS_FILE")
+REQUEST_TIMEOUT_SECONDS = 10
+
+metrics = Metrics("nhl_discord", thread_safe=True)
+breakers = {}
+# Per-team season schedules, see get_next_game
+calendar = SeasonCalendar()
+# The fetchers below run on the event loop (sens_tracker) and in
+# asyncio.to_thread workers (game_index). The breakers, the calendar and the
+# metrics file aren't thread-safe, so they are only touched under this lock;
+# the requests themselves run concurrently.
+_lock = threading.RLock()
+
+
+def breaker(endpoint):
+    """
+    Returns the circuit breaker for an endpoint. While it is open, requests to
+    the endpoint raise resilience.CircuitOpenError without going upstream.
+    """
+    with _lock:
+        if endpoint not in breakers:
+            breakers[endpoint] = CircuitBreaker(endpoint)
+        return breakers[endpoint]
+
+
+@contextmanager
+def _guarded(endpoint):
+    """The endpoint's breaker around a request, its state only read and updated under the lock."""
+    with _lock:
+        guard = breaker(endpoint).__enter__()
+    try:
+        yield
+    except BaseException as exc:
+        with _lock:
+            guard.__exit__(type(exc), exc, exc.__traceback__)
+        raise
+    with _lock:
+        guard.__exit__(None, None, None)
+
+
+def _get(endpoint, url, decode=decode_json):
+    """
+    GETs an NHL API url and records latency, bytes and errors for the endpoint.
+    Returns the body decoded with `decode` (see decoding.py).
+    """
+    try:
+        with _guarded(endpoint), metrics.track(endpoint) as call:
+            response = requests.get(url, timeout=REQUEST_TIMEOUT_SECONDS)
+            call["bytes"] = len(response.content)
+            response.raise_for_status()
+            return decode(response.content)
+    finally:
+        if METRICS_FILE:
+            with _lock:
+                metrics.write_textfile(METRICS_FILE)
+
+
+def _ingest(games):
+    """Updates the calendar from a score document's games."""
+    with _lock:
+        calendar.ingest(games)
 
 
 class Game:
     def __init__(self, away_team, home_team, start_time, game_id, game_type, home_score=0, away_score=0, period=0, inIntermission=False, secondsRemaining=0, game_state="FUT"):
-        self.away_team = away_team
-        self.home_team = home_team
+        # Interned: every Game of a team shares one abbreviation string.
+        self.away_team = sys.intern(away_team) if away_team else away_team
+        self.home_team = sys.intern(home_team) if home_team else home_team
         self.start_time = start_time
         self.id = game_id
         self.home_score = home_score
@@ -39,13 +112,11 @@ def get_todays_games():
         '%Y-%m-%d')  # Get today's date in YYYY-MM-DD format
 
     # NHL API endpoint for today's games
-    todays_games = requests.get(
-        f'{NHL_API}/score/{YYYY_MM_DD}')
-
-    todays_games = todays_games.json()
+    todays_games = _get("score", f'{NHL_API}/score/{YYYY_MM_DD}', decode_scores)
 
     # Extract the 'games' key from the JSON response
     todays_games = todays_games['games']
+    _ingest(todays_games)
 
     # Loop through the games and list them with their start times in EST
     games = []
@@ -64,13 +135,11 @@ def get_games_by_date(date):
         date (str): The date in 'YYYY-MM-DD' format.
     """
     # NHL API endpoint for games on a specific date
-    games_by_date = requests.get(
-        f'{NHL_API}/score/{date}')
-
-    games_by_date = games_by_date.json()
+    games_by_date = _get("score", f'{NHL_API}/score/{date}', decode_scores)
 
     # Extract the 'games' key from the JSON response
     games_by_date = games_by_date['games']
+    _ingest(games_by_date)
 
     # Loop through the games and create Game objects
     games = []
@@ -81,16 +150,40 @@ def get_games_by_date(date):
     return games
 
 
+def get_scoreboard(date="now"):
+    """
+    Fetches score, period and clock for every game of a day in a single request.
+    Args:
+        date (str): The date in 'YYYY-MM-DD' format, or "now" for the NHL's current day.
+    Returns a dictionary of game id to Game object.
+    """
+    scoreboard = _get("score", f'{NHL_API}/score/{date}', decode_scores)
+    _ingest(scoreboard['games'])
+
+    games = {}
+    for game in scoreboard['games']:
+        clock = game.get('clock', {})
+        games[game['id']] = Game(game_id=game['id'],
+                                 away_team=game['awayTeam']['abbrev'],
+                                 away_score=game['awayTeam'].get('score', 0),
+                                 home_team=game['homeTeam']['abbrev'],
+                                 home_score=game['homeTeam'].get('score', 0),
+                                 period=game.get('periodDescriptor', {}).get('number', 0),
+                                 secondsRemaining=clock.get('secondsRemaining', 0),
+                                 inIntermission=clock.get('inIntermission', False),
+                                 game_state=game['gameState'],
+                                 start_time=game['startTimeUTC'],
+                                 game_type=game['gameType'])
+    return games
+
+
 def get_game(game_id):
     """
     Fetches the current game information from the NHL API.
     Returns a list of strings with game information.
     """
     # NHL API endpoint for current game info
-    game_data = requests.get(
-        f'{NHL_API}/gamecenter/{game_id}/landing')
-
-    game_data = game_data.json()
+    game_data = _get("landing", f'{NHL_API}/gamecenter/{game_id}/landing', decode_game)
 
     if game_data['gameState'] == "PRE" or game_data['gameState'] == "FUT":
         return Game(game_id=game_id,
@@ -116,3 +209,46 @@ def get_game(game_id):
                 game_state=game_data['gameState'],
                 start_time=game_data['startTimeUTC'],
                 game_type=game_data['gameType'])
+
+
+def load_team_season(team, season="now"):
+    """
+    Fetches a team's whole season schedule into the calendar. Score fetches
+    keep it up to date afterwards, so this is only needed once per team.
+    Args:
+        team (str): The team's abbreviation, e.g. "OTT".
+        season (str): The season as "20242025", or "now" for the current one.
+    """
+    schedule = _get("club_schedule_season", f'{NHL_API}/club-schedule-season/{team}/{season}', decode_scores)
+    with _lock:
+        return calendar.ingest_team_season(team, schedule)
+
+
+def get_next_game(team, now=None):
+    """
+    Looks up a team's next game in the season calendar. Only the first lookup
+    for a team makes a request, to load its season.
+    Returns a Game object, or None if the team has no games left this season.
+    """
+    if team not in calendar.loaded_teams:
+        load_team_season(team)
+    with _lock:
+        game = calendar.next_game(team, now)
+    if game is None:
+        return None
+    return Game(away_team=game['away_team'],
+                home_team=game['home_team'],
+                start_time=game['start'].strftime("%Y-%m-%dT%H:%M:%SZ"),
+                game_id=game['game_id'],
+                game_type=None)
+
+
+def get_days_until_next_game(team, now=None):
+    """
+    Calendar days (Eastern time) until a team's next game, 0 if it plays today.
+    Returns None if the team has no games left this season.
+    """
+    if team not in calendar.loaded_teams:
+        load_team_season(team)
+    with _lock:
+        return calendar.days_until_next_game(team, now, pytz.timezone("America/New_York"))
@@ -0,0 +1 @@
+../nhl_tracker/decoding.py
\ No newline at end of file
@@ -0,0 +1,164 @@
+"""
+In-memory index of the NHL's current day, for answering slash commands.
+
+One follower keeps the index current from /score/now once per interval.
+Commands only read the index, so any number of them costs no NHL API
+requests, and the rendered replies are cached until the next change.
+
+api_utils calls run in asyncio.to_thread workers so they don't block the
+loop; api_utils locks its breakers and calendar, and Metrics locks, because
+sens_tracker makes its own calls on the loop thread at the same time.
+"""
+import asyncio
+import time
+
+from api_utils import Game, get_next_game, get_scoreboard
+from resilience import Backoff, CircuitOpenError
+from utils import time_to_EST
+
+FINISHED_STATES = ("FINAL", "OFF")
+LIVE_STATES = ("LIVE", "CRIT")
+# Team abbreviations as the NHL API uses them; commands reject anything else
+TEAMS = frozenset((
+    "ANA", "BOS", "BUF", "CAR", "CBJ", "CGY", "CHI", "COL", "DAL", "DET", "EDM",
+    "FLA", "LAK", "MIN", "MTL", "NJD", "NSH", "NYI", "NYR", "OTT", "PHI", "PIT",
+    "SEA", "SJS", "STL", "TBL", "TOR", "UTA", "VAN", "VGK", "WPG", "WSH",
+))
+SCOREBOARD_INTERVAL_SECONDS = 10
+
+
+def period_name(game: Game) -> str:
+    """1st, 2nd, 3rd, then OT/SO in the regular season or 1OT, 2OT... in the playoffs."""
+    if game.period <= 3:
+        return f"{game.period}{('st', 'nd', 'rd')[game.period - 1]}" if game.period > 0 else ""
+    if game.game_type == 3:
+        return f"{game.period - 3}OT"
+    return "OT" if game.period == 4 else "SO"
+
+
+def format_clock(game: Game) -> str:
+    """e.g. "2nd 12:34", "1st intermission 10:00" or "Final"."""
+    if game.game_state in FINISHED_STATES:
+        return "Final" if game.period <= 3 else f"Final/{period_name(game)}"
+    minutes, seconds = divmod(game.secondsRemaining or 0, 60)
+    if game.inIntermission:
+        return f"{period_name(game)} intermission {minutes}:{seconds:02d}"
+    return f"{period_name(game)} {minutes}:{seconds:02d}"
+
+
+def format_game(game: Game) -> str:
+    """One line: the start time before puck drop, the score and clock after it."""
+    if game.game_state in ("FUT", "PRE"):
+        return str(game)
+    return f"{game.away_team} {game.away_score}-{game.home_score} {game.home_team} ({format_clock(game)})"
+
+
+class GameIndex:
+    """The current day's games by id and by team, plus rendered replies."""
+
+    def __init__(self):
+        self.games: dict[int, Game] = {}
+        self._by_team: dict[str, int] = {}
+        self._rendered: dict[str, str] = {}
+        self.updated_at = None  # time.monotonic() of the last refresh
+
+    def __len__(self):
+        return len(self.games)
+
+    def replace(self, games) -> None:
+        """Replace the index with a full day of games (a /score response)."""
+        self.games = {game.id: game for game in games}
+        self._by_team = {}
+        for game in sorted(self.games.values(), key=lambda game: game.start_time):
+            self._by_team.setdefault(game.away_team, game.id)
+            self._by_team.setdefault(game.home_team, game.id)
+        self._rendered.clear()
+        self.updated_at = time.monotonic()
+
+    def team_game(self, team: str) -> Game | None:
+        """The team's game today, or None."""
+        game_id = self._by_team.get(team.upper())
+        return self.games.get(game_id) if game_id is not None else None
+
+    def slate(self) -> list[Game]:
+        return sorted(self.games.values(), key=lambda game: (game.start_time, game.id))
+
+    def _cached(self, key: str, render) -> str:
+        text = self._rendered.get(key)
+        if text is None:
+            text = self._rendered[key] = render()
+        return text
+
+    def scores_text(self) -> str:
+        return self._cached("scores", lambda: "\n".join(
+            format_game(game) for game in self.slate() if game.game_state not in ("FUT", "PRE"))
+            or "No games have started yet today.")
+
+    def today_text(self) -> str:
+        if not self.games:
+            return "No games today."
+        return self._cached("today", lambda: "Today's Games: \n" + "\n".join(
+            format_game(game) for game in self.slate()))
+
+    def clock_text(self, team: str) -> str:
+        team = team.upper()
+
+        def render():
+            game = self.team_game(team)
+            if game is None:
+                return f"{team} doesn't play today."
+            if game.game_state not in LIVE_STATES and game.game_state not in FINISHED_STATES:
+                return f"{game} (not started)"
+            return format_game(game)
+        return self._cached(f"clock:{team}", render)
+
+    def next_game_text(self, team: str) -> str | None:
+        """
+        Today's game if the team still has one to finish, otherwise None and
+        the answer comes from the season calendar.
+        """
+        game = self.team_game(team)
+        if game is None or game.game_state in FINISHED_STATES:
+            return None
+        return format_game(game) if game.game_state in LIVE_STATES else f"Today: {game}"
+
+
+async def next_game_text(index: GameIndex, team: str) -> str:
+    """
+    A team's next game, from the index or else the season calendar. Never
+    raises: a failed season load is reported in the reply.
+    """
+    team = team.upper()
+    if team not in TEAMS:
+        return f"Unknown team {team}, use an abbreviation like OTT."
+    text = index.next_game_text(team)
+    if text is not None:
+        return text
+    # Only the first lookup for a team loads its season; later ones are in memory.
+    try:
+        game = await asyncio.to_thread(get_next_game, team)
+    except CircuitOpenError as e:
+        return f"The NHL API is unavailable, try again in {e.retry_in:.0f}s."
+    except Exception as e:
+        print(f"Loading {team}'s season failed: {e}")
+        return f"Couldn't load {team}'s schedule, try again later."
+    if game is None:
+        return f"{team} has no games left this season."
+    return f"{game.start_time[:10]}: {game.away_team} @ {game.home_team} at {time_to_EST(game.start_time)}"
+
+
+async def follow_scoreboard(index: GameIndex, interval: float = SCOREBOARD_INTERVAL_SECONDS) -> None:
+    """Refresh the index from /score/now every interval, backing off while the API fails."""
+    backoff = Backoff(base=interval)
+    while True:
+        delay = interval
+        try:
+            index.replace((await asyncio.to_thread(get_scoreboard, "now")).values())
+            backoff.reset()
+        except CircuitOpenError as e:
+            delay = max(e.retry_in, interval)
+        except Exception as e:
+            delay = backoff.next_delay()
+            print(f"Refreshing the game index failed, retrying in {delay:.0f}s: {e}")
+        await asyncio.sleep(delay)
+
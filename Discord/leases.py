@@ -0,0 +1,225 @@
+"""
+Leader election for running several sens_tracker instances side by side.
+
+Each tracked game is guarded by a named lease. Only the holder polls and
+posts; the others stand by and take over once the holder stops renewing,
+i.e. within one TTL of a crash. Work done once (today's games post) is
+claimed instead: the claim never expires, so it isn't repeated.
+
+SQLiteLease keeps leases in the bot's database, so instances can run on any
+host that shares it. FileLease is a stand-in for a single host without the
+database: an flock held for as long as the process lives, released by the
+OS the moment it dies.
+
+Every time a lease changes hands its token goes up. The holder checks the
+token it acquired with (still_held) right before each post: an instance
+that stalled past its TTL and was replaced finds a newer token and doesn't
+post on top of its successor.
+
+The lease methods block on the database, so async code calls them through
+asyncio.to_thread, as run_as_leader does.
+
+Games can also be split between instances with owns_game, so each shard only
+competes for (and polls) its own games.
+"""
+import asyncio
+import fcntl
+import os
+import socket
+import sqlite3
+import time
+
+
+def instance_id():
+    """Default holder name, unique per process."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def owns_game(game_id, shard=0, shards=1):
+    """Whether game_id belongs to this instance's shard."""
+    return shards <= 1 or game_id % shards == shard
+
+
+class SQLiteLease:
+    """A lease row in the 'leases' table, taken over when it expires."""
+
+    def __init__(self, path, name, holder=None, ttl=10.0):
+        self.path = path
+        self.name = name
+        self.holder = holder or instance_id()
+        self.ttl = ttl
+        self.token = None
+
+    def acquire(self):
+        """Take or renew the lease. Returns True if this instance now holds it."""
+        now = time.time()
+        conn = sqlite3.connect(self.path, timeout=self.ttl / 2)
+        try:
+            with conn:
+                # The WHERE on the upsert only lets us overwrite our own or an expired lease.
+                conn.execute("""
+                    INSERT INTO leases (name, holder, expires_at) VALUES (?, ?, ?)
+                    ON CONFLICT (name) DO UPDATE SET
+                        token = CASE WHEN holder = excluded.holder THEN token ELSE token + 1 END,
+                        acquired_at = CASE WHEN holder = excluded.holder THEN acquired_at ELSE CURRENT_TIMESTAMP END,
+                        holder = excluded.holder,
+                        expires_at = excluded.expires_at
+                    WHERE holder = excluded.holder OR expires_at < ?;
+                    """, (self.name, self.holder, now + self.ttl, now))
+                row = conn.execute(
+                    "SELECT holder, token FROM leases WHERE name = ?;", (self.name,)).fetchone()
+        except sqlite3.Error as e:
+            # Can't prove we hold it, so act as if we don't.
+            print(f"Lease {self.name}: database error: {e}")
+            return False
+        finally:
+            conn.close()
+        held = row is not None and row[0] == self.holder
+        self.token = row[1] if held else None
+        return held
+
+    def claim(self):
+        """
+        Take the name for good, for work done once (e.g. a day's post). The row
+        never expires and is never taken over, so an instance starting later,
+        even after this one has exited, sees the work as done. Returns True
+        only to the instance that claimed it.
+        """
+        conn = sqlite3.connect(self.path, timeout=self.ttl / 2)
+        try:
+            with conn:
+                conn.execute("""
+                    INSERT INTO leases (name, holder, expires_at) VALUES (?, ?, ?)
+                    ON CONFLICT (name) DO NOTHING;
+                    """, (self.name, self.holder, float("inf")))
+                row = conn.execute(
+                    "SELECT holder, token FROM leases WHERE name = ?;", (self.name,)).fetchone()
+        except sqlite3.Error as e:
+            print(f"Lease {self.name}: database error: {e}")
+            return False
+        finally:
+            conn.close()
+        held = row is not None and row[0] == self.holder
+        self.token = row[1] if held else None
+        return held
+
+    def still_held(self):
+        """
+        Whether the lease is still ours, under the token it was acquired with.
+        Checked right before a side effect, since renewals only run every
+        third of the TTL.
+        """
+        if self.token is None:
+            return False
+        conn = sqlite3.connect(self.path, timeout=self.ttl / 2)
+        try:
+            row = conn.execute(
+                "SELECT holder, token, expires_at FROM leases WHERE name = ?;", (self.name,)).fetchone()
+        except sqlite3.Error as e:
+            print(f"Lease {self.name}: database error: {e}")
+            return False
+        finally:
+            conn.close()
+        return row is not None and row[0] == self.holder and row[1] == self.token and row[2] > time.time()
+
+    def release(self):
+        """
+        Give the lease up early so a standby doesn't wait for it to expire.
+        The row is expired and emptied rather than deleted, so whoever takes
+        it next, this instance included, gets the next fencing token.
+        """
+        conn = sqlite3.connect(self.path, timeout=self.ttl / 2)
+        try:
+            with conn:
+                conn.execute("UPDATE leases SET holder = '', expires_at = 0 WHERE name = ? AND holder = ?;",
+                             (self.name, self.holder))
+        except sqlite3.Error as e:
+            print(f"Lease {self.name}: database error: {e}")
+        finally:
+            conn.close()
+        self.token = None
+
+
+class FileLease:
+    """An flock on <directory>/<name>.lock, held until released or the process exits."""
+
+    def __init__(self, directory, name, holder=None, ttl=1.0):
+        self.path = os.path.join(directory, f"{name.replace(':', '_')}.lock")
+        self.name = name
+        self.holder = holder or instance_id()
+        self.ttl = ttl
+        self._file = None
+
+    def acquire(self):
+        if self._file is not None:
+            return True
+        lock_file = open(self.path, "a+")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(self.holder)
+        lock_file.flush()
+        self._file = lock_file
+        return True
+
+    def claim(self):
+        """Take the name for good: <name>.claimed is created once and never removed."""
+        try:
+            fd = os.open(self.path[:-len(".lock")] + ".claimed", os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, "w") as claimed:
+            claimed.write(self.holder)
+        return True
+
+    def still_held(self):
+        """An flock can't be lost while the process lives."""
+        return self._file is not None
+
+    def release(self):
+        if self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+
+async def run_as_leader(lease, work):
+    """
+    Waits until the lease is ours, then runs work(took_over) while renewing it
+    every third of its TTL. took_over is True if another instance held the
+    lease first. If a renewal fails, work is cancelled so that two instances
+    never act on the same game, and this instance goes back to standing by:
+    should the new holder fail too, work runs again with took_over=True. The
+    lease is released when work ends; its result is returned.
+    """
+    took_over = False
+    while True:
+        while not await asyncio.to_thread(lease.acquire):
+            took_over = True
+            await asyncio.sleep(lease.ttl / 3)
+
+        print(f"Lease {lease.name} acquired by {lease.holder}")
+        task = asyncio.ensure_future(work(took_over))
+        lost = False
+        try:
+            while not task.done():
+                await asyncio.wait({task}, timeout=lease.ttl / 3)
+                if not task.done() and not await asyncio.to_thread(lease.acquire):
+                    print(f"Lease {lease.name} lost by {lease.holder}, standing down")
+                    lost = True
+                    task.cancel()
+                    # Let work unwind before the lease row is touched again.
+                    await asyncio.wait({task})
+            # Our own cancellation isn't an error for the caller; anything
+            # else work raised, or a cancellation of this coroutine, is.
+            if not (lost and task.cancelled()):
+                return task.result()
+        finally:
+            if not task.done():
+                task.cancel()
+            await asyncio.to_thread(lease.release)
+        took_over = True
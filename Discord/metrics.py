@@ -0,0 +1 @@
+../nhl_tracker/metrics.py
\ No newline at end of file
@@ -1,13 +1,19 @@
+import asyncio
 import discord
 import os
+from discord import app_commands
 from dotenv import load_dotenv
-from api_utils import Game
+from api_utils import Game, metrics
+from game_index import TEAMS, GameIndex, follow_scoreboard, next_game_text
 
 load_dotenv()
 
 TOKEN = os.getenv('DISCORD_TOKEN')
 TODAY_CHANNEL_ID = int(os.getenv('TODAYS_GAMES_CHANNEL_ID'))
 SENS_CHANNEL_ID = int(os.getenv('SENS_GAMES_CHANNEL_ID'))
+# Slash commands: registered on this guild only (instant) when set, globally otherwise.
+COMMAND_GUILD_ID = os.getenv('COMMAND_GUILD_ID')
+DEFAULT_TEAM = os.getenv('DEFAULT_TEAM', 'OTT')
 
 # Enable intents
 intents = discord.Intents.default()
@@ -16,12 +22,20 @@ intents.guilds = True  # Ensure guild-related intents are enabled
 
 
 class MyClient(discord.Client):
-    def __init__(self, action, channel_id: int, game: Game = None, games: list[Game] = None):
+    def __init__(self, action, channel_id: int, game: Game = None, games: list[Game] = None, lease=None):
         super().__init__(intents=intents)  # Pass intents here
         self.channel_id = channel_id
         self.action = action
         self.game = game
         self.games = games
+        # The leases.py lease this post is made under, checked right before sending
+        self.lease = lease
+
+    async def _send(self, channel, text):
+        if self.lease is not None and not await asyncio.to_thread(self.lease.still_held):
+            print(f"Lease {self.lease.name} is no longer held by {self.lease.holder}, not posting")
+            return
+        await channel.send(text)
 
     async def on_ready(self):
         print(f'Logged in as {self.user}')
@@ -44,7 +58,7 @@ class MyClient(discord.Client):
             for game in self.games:
                 todays_games += str(game)+'\n'
 
-            await channel.send(todays_games)
+            await self._send(channel, todays_games)
         else:
             print(f'Channel with ID {TODAY_CHANNEL_ID} not found.')
 
@@ -53,7 +67,7 @@ class MyClient(discord.Client):
         if channel:
             print(f'Found channel: {channel.name}')
 
-            await channel.send(self.game)
+            await self._send(channel, self.game)
         else:
             print(f'Channel with ID {self.channel_id} not found.')
 
@@ -62,6 +76,74 @@ class MyClient(discord.Client):
         if channel:
             print(f'Found channel: {channel.name}')
 
-            await channel.send(str(self.game.period_starting()))
+            await self._send(channel, str(self.game.period_starting()))
         else:
             print(f'Channel with ID {self.channel_id} not found.')
+
+
+class QueryClient(discord.Client):
+    """
+    Long-running client answering slash commands from a GameIndex. The index
+    is kept current by a single follower task, so commands never call the NHL
+    API (except /next, once per team, to load its season calendar).
+    """
+
+    def __init__(self, index: GameIndex, guild_id: int = None):
+        super().__init__(intents=intents)
+        self.index = index
+        self.guild = discord.Object(id=guild_id) if guild_id else None
+        self.tree = app_commands.CommandTree(self)
+        self._follower = None
+        self._register_commands()
+
+    async def setup_hook(self):
+        self._follower = asyncio.create_task(follow_scoreboard(self.index))
+        if self.guild:
+            self.tree.copy_global_to(guild=self.guild)
+        await self.tree.sync(guild=self.guild)
+
+    async def on_ready(self):
+        print(f'Logged in as {self.user}, answering slash commands')
+
+    async def _reply(self, interaction: discord.Interaction, command: str, text: str):
+        metrics.increment(f"command_{command}")
+        await interaction.response.send_message(text)
+
+    def _register_commands(self):
+        index = self.index
+
+        @self.tree.command(name="scores", description="Scores of today's games that have started")
+        async def scores(interaction: discord.Interaction):
+            await self._reply(interaction, "scores", index.scores_text())
+
+        @self.tree.command(name="today", description="Today's games and start times")
+        async def today(interaction: discord.Interaction):
+            await self._reply(interaction, "today", index.today_text())
+
+        @self.tree.command(name="clock", description="Score, period and clock of a team's game")
+        @app_commands.describe(team="Team abbreviation, e.g. OTT")
+        async def clock(interaction: discord.Interaction, team: str = DEFAULT_TEAM):
+            await self._reply(interaction, "clock", index.clock_text(team))
+
+        @self.tree.command(name="next", description="A team's next game")
+        @app_commands.describe(team="Team abbreviation, e.g. OTT")
+        async def next_game(interaction: discord.Interaction, team: str = DEFAULT_TEAM):
+            team = team.upper()
+            if team in TEAMS and index.next_game_text(team) is None:
+                # May load the team's season on first use, which can take longer than
+                # Discord's 3 second reply window.
+                await interaction.response.defer()
+                metrics.increment("command_next")
+                await interaction.followup.send(await next_game_text(index, team))
+            else:
+                # Today's game from the index, or an unknown team: no request either way.
+                await self._reply(interaction, "next", await next_game_text(index, team))
+
+
+async def serve_commands():
+    async with QueryClient(GameIndex(), int(COMMAND_GUILD_ID) if COMMAND_GUILD_ID else None) as client:
+        await client.start(TOKEN)
+
+
+if __name__ == "__main__":
+    asyncio.run(serve_commands())
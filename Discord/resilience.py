@@ -0,0 +1 @@
+../nhl_tracker/resilience.py
\ No newline at end of file
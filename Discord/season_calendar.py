@@ -0,0 +1 @@
+../nhl_tracker/season_calendar.py
\ No newline at end of file
@@ -2,13 +2,24 @@ import asyncio
 import os
 from datetime import datetime, timedelta
 import pytz
+import requests
 
 from nhl_discord import MyClient
 from api_utils import Game, get_game, get_todays_games
+from leases import FileLease, SQLiteLease, owns_game, run_as_leader
+from resilience import Backoff, CircuitOpenError
 
 TOKEN = os.getenv('DISCORD_TOKEN')
 TODAY_CHANNEL_ID = int(os.getenv('TODAYS_GAMES_CHANNEL_ID'))
 SENS_CHANNEL_ID = int(os.getenv('SENS_GAMES_CHANNEL_ID'))
+# Running several instances: leases live in LEASE_DATABASE (the bot's SQLite
+# database) or, on a single host without it, as lock files in LEASE_DIR.
+# TRACKER_SHARDS > 1 splits games between instances by game id.
+LEASE_DATABASE = os.getenv('LEASE_DATABASE')
+LEASE_DIR = os.getenv('LEASE_DIR')
+LEASE_TTL_SECONDS = float(os.getenv('LEASE_TTL_SECONDS', 10))
+TRACKER_SHARD = int(os.getenv('TRACKER_SHARD', 0))
+TRACKER_SHARDS = int(os.getenv('TRACKER_SHARDS', 1))
 
 test_id = 2024021230
 
@@ -24,20 +35,75 @@ async def wait_until(target_time):
         await asyncio.sleep(wait_seconds)
 
 
+async def fetch_game(game_id):
+    """
+    Fetches a game, retrying with jittered exponential backoff while the NHL API
+    is failing instead of letting the tracker crash.
+    """
+    backoff = Backoff()
+    while True:
+        try:
+            return get_game(game_id)
+        except CircuitOpenError as e:
+            delay = max(e.retry_in, 1)
+        except (requests.RequestException, ValueError) as e:
+            delay = backoff.next_delay()
+            print(f"Fetching game {game_id} failed, retrying in {delay:.0f}s: {e}")
+        await asyncio.sleep(delay)
+
+
+def lease(name):
+    """The lease guarding one unit of work, or None when running as a single instance."""
+    if LEASE_DATABASE:
+        return SQLiteLease(LEASE_DATABASE, name, ttl=LEASE_TTL_SECONDS)
+    if LEASE_DIR:
+        return FileLease(LEASE_DIR, name)
+    return None
+
+
 async def get_today():
     games: list[Game] = get_todays_games()
-    async with MyClient("today", int(TODAY_CHANNEL_ID), games=games) as client:
-        await client.start(TOKEN)
+    today = datetime.now(pytz.timezone("US/Eastern")).strftime("%Y-%m-%d")
+
+    # Only one instance posts the day's games; one that starts later doesn't repost.
+    today_lease = lease(f"today:{today}")
+    if today_lease is None or await asyncio.to_thread(today_lease.claim):
+        async with MyClient("today", int(TODAY_CHANNEL_ID), games=games) as client:
+            await client.start(TOKEN)
 
     for game in games:
         if game.away_team == "OTT" or game.home_team == "OTT":
-            async with MyClient("sens_today", int(SENS_CHANNEL_ID), game=game) as client:
-                await client.start(TOKEN)
+            if not owns_game(game.id, TRACKER_SHARD, TRACKER_SHARDS):
+                continue
+            game_lease = lease(f"game:{game.id}")
+            if game_lease is None:
+                await track_game(game, took_over=False)
+            else:
+                await run_as_leader(game_lease, lambda took_over, game=game, game_lease=game_lease:
+                                    track_game(game, took_over, game_lease))
 
-            await period_tracker(game)
+
+async def track_game(game: Game, took_over: bool, game_lease=None):
+    """
+    Announces and follows one game. An instance that took over from a failed
+    one picks the game up where it is instead of announcing it again. With
+    game_lease, every post first checks that the lease is still held.
+    """
+    if took_over:
+        game = await fetch_game(game.id)
+        if game.game_state in ("FINAL", "OFF"):
+            return
+        if game.game_state not in ("FUT", "PRE"):
+            await resume_period_tracker(game, game_lease)
+            return
+    else:
+        async with MyClient("sens_today", int(SENS_CHANNEL_ID), game=game, lease=game_lease) as client:
+            await client.start(TOKEN)
+
+    await period_tracker(game, game_lease)
 
 
-async def period_tracker(game: Game):
+async def period_tracker(game: Game, game_lease=None):
     """
     Waits until the game's start time in EST and performs actions.
     :param game: A Game object containing the start time in UTC.
@@ -56,18 +122,28 @@ async def period_tracker(game: Game):
 
     game.period += 1
 
-    async with MyClient("game", int(SENS_CHANNEL_ID), game=game) as client:
+    async with MyClient("game", int(SENS_CHANNEL_ID), game=game, lease=game_lease) as client:
         await client.start(TOKEN)
 
+    await resume_period_tracker(game, game_lease, first_wait=25*60)
+
+
+async def resume_period_tracker(game: Game, game_lease=None, first_wait=0):
+    """
+    The part of period_tracker after the opening announcement: waits for each
+    intermission and announces the period after it.
+    """
+    wait = first_wait
     while True:
         print("Game Loop Started")
-        await asyncio.sleep(25*60)
+        await asyncio.sleep(wait)
+        wait = 25*60
 
-        game = get_game(game.id)
+        game = await fetch_game(game.id)
 
         while (game.game_state != "OFF" or game.game_state == "FINAL") and not game.inIntermission:
             await asyncio.sleep(15*60)
-            game = get_game(game.id)
+            game = await fetch_game(game.id)
 
         if game.game_state == "OFF" or game.game_state == "FINAL":
             break
@@ -75,7 +151,9 @@ async def period_tracker(game: Game):
         await asyncio.sleep(game.secondsRemaining)
         game.period += 1
 
-        async with MyClient("game", int(SENS_CHANNEL_ID), game=game) as client:
+        async with MyClient("game", int(SENS_CHANNEL_ID), game=game, lease=game_lease) as client:
             await client.start(TOKEN)
 
-asyncio.run(get_today())
+
+if __name__ == "__main__":
+    asyncio.run(get_today())
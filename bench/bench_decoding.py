@@ -0,0 +1,118 @@
+"""
+Compares CPU time and peak allocation of decoding recorded landing,
+play-by-play and score payloads with json.loads against the selective
+decoders in nhl_tracker/decoding.py.
+
+    python bench_decoding.py [fixture.json.gz] [--repeat 5]
+
+Before timing anything, every selective decoder is checked on an off-day
+/score document (no games), which must still come back with "games": [].
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from bench_pollers import ROOT, load_module
+from fixtures import Fixture
+from synthetic import build_slate
+
+decoding = load_module("nhl_tracker_decoding", os.path.join(ROOT, "nhl_tracker", "decoding.py"))
+
+
+def payloads(fixture, kind):
+    """Encoded bodies of every recorded sample of one document kind."""
+    bodies = []
+    for path, samples in fixture.timelines.items():
+        if path.endswith(f"/{kind}") or path.startswith(f"{kind}/"):
+            bodies.extend(json.dumps(body).encode("utf-8") for _, body in samples)
+    return bodies
+
+
+def measure(decode, bodies, repeat):
+    """Returns (CPU microseconds per payload, peak bytes allocated by one decode)."""
+    started = time.process_time()
+    for _ in range(repeat):
+        for body in bodies:
+            decode(body)
+    cpu = (time.process_time() - started) / (repeat * len(bodies))
+
+    peak = 0
+    for body in bodies[-min(len(bodies), 20):]:
+        tracemalloc.start()
+        result = decode(body)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        del result
+    return cpu * 1e6, peak
+
+
+def decoders(kind):
+    selective = decoding.decode_scores if kind == "score" else decoding.decode_game
+    candidates = [("json.loads", json.loads)]
+    if decoding.orjson is not None:
+        candidates.append(("orjson.loads", decoding.orjson.loads))
+    if decoding.msgspec is not None:
+        candidates.append(("selective (msgspec)", selective))
+
+    def fallback(body):
+        # Same call with msgspec hidden, i.e. the orjson/json + projection path.
+        saved, decoding.msgspec = decoding.msgspec, None
+        try:
+            return selective(body)
+        finally:
+            decoding.msgspec = saved
+
+    candidates.append(("selective (fallback)", fallback))
+    return candidates
+
+
+# /score bodies of days without games, as served and with the key left out
+EMPTY_SLATES = (b'{"currentDate": "2025-07-01", "games": []}', b'{"currentDate": "2025-07-01"}')
+
+
+def check_empty_slate():
+    """Returns the names of selective decoders that lose "games" on an off-day."""
+    failures = []
+    for name, decode in decoders("score"):
+        if not name.startswith("selective"):
+            continue
+        for body in EMPTY_SLATES:
+            if decode(body).get("games") != []:
+                failures.append(f"{name}: {body.decode()}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("fixture", nargs="?")
+    parser.add_argument("--games", type=int, default=4, help="Synthetic games if no fixture")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    failures = check_empty_slate()
+    for failure in failures:
+        print(f"empty slate decoded without games: {failure}")
+    if failures:
+        return 1
+
+    fixture = Fixture.load(args.fixture) if args.fixture else build_slate(args.games, step=30)
+    print(f"{'payload':<14} {'decoder':<22} {'avg size':>10} {'CPU/decode (us)':>16} {'peak alloc (B)':>15}")
+    for kind in ("landing", "play-by-play", "score"):
+        bodies = payloads(fixture, kind)
+        if not bodies:
+            continue
+        size = sum(len(b) for b in bodies) / len(bodies)
+        baseline = None
+        for name, decode in decoders(kind):
+            cpu, peak = measure(decode, bodies, args.repeat)
+            baseline = baseline or (cpu, peak)
+            print(f"{kind:<14} {name:<22} {size:>10,.0f} {cpu:>10.1f} ({cpu / baseline[0]:>3.0%}) "
+                  f"{peak:>9,} ({peak / baseline[1]:>3.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
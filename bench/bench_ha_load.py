@@ -0,0 +1,378 @@
+"""
+Load harness for the Home Assistant sensor platform with a large slate.
+
+    python bench_ha_load.py [--games 300] [--entries 1] [--max-lag-ms 100]
+
+Runs the integration's own coordinator, sensor platform
+(sensor.async_setup_entry and NHLGameSensor) and league ticker for N
+synthetic games on a virtual clock. Home Assistant is replaced by the
+stand-ins in ha_stubs.py, which behave like it where the integration relies
+on it: entities subscribe to the coordinator when they are added, an entity
+update asks the coordinator for a refresh, and every state write builds and
+serializes the attributes. The NHL API is replaced by a client that serves
+the synthetic games' documents at the current virtual time.
+
+Every game sensor apply and state write is attributed to what caused it (a
+coordinator update, a ticker tick or the final details fetch) and reported
+per sensor the update reached; each update should apply and write a sensor
+once. A lag monitor runs on the real event loop alongside and records how
+late its 10 ms timer fires, i.e. the longest stretch the integration keeps
+the loop busy. The harness builds and encodes documents in a worker thread
+while virtual time stands still, so only its GIL hold can show up as lag.
+
+Exits non-zero if the worst lag exceeds --max-lag-ms, if an update applies
+or writes a sensor more than once, or if entities request refreshes.
+"""
+import argparse
+import asyncio
+import contextvars
+import gc
+import json
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import ha_stubs
+
+ha_stubs.install()
+
+from bench_pollers import (  # noqa: E402
+    HA_SCAN_INTERVAL_SECONDS, load_integration_module, virtual_asyncio, virtual_datetime)
+from clock import VirtualClock  # noqa: E402
+from synthetic import PREGAME_SECONDS, TEAMS, SyntheticGame  # noqa: E402
+
+api_client = load_integration_module("api_client")
+const = load_integration_module("const")
+coordinator_module = load_integration_module("coordinator")
+sensor = load_integration_module("sensor")
+ticker = load_integration_module("ticker")
+
+# Seconds between the documents the fake API serves, like a recording's samples
+STEP_SECONDS = 10
+SCORE_FIELDS = ("id", "gameType", "gameState", "startTimeUTC", "awayTeam", "homeTeam", "periodDescriptor", "clock")
+
+# What the running code is doing: "setup", "refresh", "tick" or "details".
+# Tasks inherit it, so a state write scheduled by a refresh counts as the refresh's.
+CAUSE = contextvars.ContextVar("cause", default=None)
+# (wall, CPU) at which the current tick started, held by the ticker's task
+TICK = contextvars.ContextVar("tick", default=None)
+
+
+class LagMonitor:
+    """Measures how late a periodic real-time timer fires on the running loop."""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.lags = []
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, loop.time() - expected))
+
+    def start(self):
+        self._task = asyncio.ensure_future(self._run())
+
+    def stop(self):
+        self._task.cancel()
+
+    def quantile(self, q):
+        if not self.lags:
+            return 0.0
+        ordered = sorted(self.lags)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class Stats:
+    def __init__(self):
+        self.applies = Counter()  # cause -> NHLGameSensor._apply calls
+        self.writes = Counter()  # cause -> game sensor state writes
+        self.updates = Counter()  # cause -> updates
+        self.reached = Counter()  # cause -> game sensors the updates were for, summed
+        self.tick_cpu = []
+        # phase -> longest synchronous section in real seconds
+        self.longest = {"coordinator": 0.0, "ticker": 0.0, "decode": 0.0}
+
+    def blocked(self, phase, seconds):
+        self.longest[phase] = max(self.longest[phase], seconds)
+
+    def per_sensor(self, cause):
+        """(applies, writes) per game sensor an update of this cause reached."""
+        reached = self.reached[cause] or 1
+        return self.applies[cause] / reached, self.writes[cause] / reached
+
+
+class FixtureClient(api_client.NHLAPIClient):
+    """NHLAPIClient whose requests are answered from a synthetic slate at the current virtual time."""
+
+    def __init__(self, hass, slate, date, clock, pool, stats):
+        super().__init__(hass, daemon_url="http://bench")
+        self.slate = slate
+        self.games = {game.id: game for game in slate}
+        self.date = date
+        self.clock = clock
+        self.pool = pool
+        self.stats = stats
+        self.ticker = None
+        self.last_decode_cpu = 0.0
+        self._bodies = {}  # path -> (sample time, encoded body)
+
+    def _encode(self, path, t):
+        """The body served for a path at sample time t; harness work, run in the pool."""
+        if path.startswith("score/"):
+            doc = {"currentDate": self.date, "games": [
+                {k: landing[k] for k in SCORE_FIELDS if k in landing}
+                for landing in (game.landing(t) for game in self.slate)]}
+        elif path.startswith("schedule/"):
+            doc = {"gameWeek": [{"date": self.date, "games": [game.landing(t) for game in self.slate]}]}
+        elif path.startswith("gamecenter/"):
+            doc = self.games[int(path.split("/")[1])].landing(t)
+        else:
+            doc = {"games": []}  # club-schedule-season; the calendar isn't under load here
+        return json.dumps(doc).encode()
+
+    async def _async_get_json(self, endpoint, path, decode=api_client.decode_json):
+        t = self.clock.now() // STEP_SECONDS * STEP_SECONDS
+        cached = self._bodies.get(path)
+        if cached is None or cached[0] != t:
+            body = await self.clock.wait_for(
+                asyncio.get_running_loop().run_in_executor(self.pool, self._encode, path, t))
+            cached = self._bodies[path] = (t, body)
+        with self.metrics.track(endpoint) as call:
+            call["bytes"] = len(cached[1])
+        wall, cpu = time.perf_counter(), time.process_time()
+        result = decode(cached[1])
+        self.stats.blocked("decode", time.perf_counter() - wall)
+        if endpoint == "score":
+            self.last_decode_cpu = time.process_time() - cpu
+        return result
+
+    async def get_scores(self, date_str="now"):
+        scores = await super().get_scores(date_str)
+        # This runs in the ticker's own task (the fetch itself ran in another):
+        # from here to its next sleep is the tick's fan-out.
+        CAUSE.set("tick")
+        TICK.set((time.perf_counter(), time.process_time() - self.last_decode_cpu))
+        self.stats.updates["tick"] += 1
+        self.stats.reached["tick"] += sum(len(callbacks) for callbacks in self.ticker._listeners.values())
+        return scores
+
+    async def get_game_details(self, game_id):
+        CAUSE.set("details")
+        self.stats.updates["details"] += 1
+        self.stats.reached["details"] += 1
+        return await super().get_game_details(game_id)
+
+
+def patch_integration(clock, stats):
+    """Puts the sensor and ticker modules on the virtual clock and counts game sensor applies."""
+    async def ticker_sleep(delay):
+        tick = TICK.get()
+        if tick is not None:
+            TICK.set(None)
+            CAUSE.set(None)
+            stats.blocked("ticker", time.perf_counter() - tick[0])
+            stats.tick_cpu.append(time.process_time() - tick[1])
+        await clock.sleep(delay)
+
+    sensor.asyncio = virtual_asyncio(clock.sleep)
+    sensor.datetime = virtual_datetime(clock)
+    ticker.asyncio = virtual_asyncio(ticker_sleep)
+
+    apply = sensor.NHLGameSensor._apply
+
+    def counted_apply(self, doc):
+        stats.applies[CAUSE.get()] += 1
+        return apply(self, doc)
+    sensor.NHLGameSensor._apply = counted_apply
+
+
+def count_writes(hass, entity_ids, stats):
+    set_state = hass.states.async_set
+
+    def counted_set(entity_id, state, attributes=None):
+        if entity_id in entity_ids:
+            stats.writes[CAUSE.get()] += 1
+        set_state(entity_id, state, attributes)
+    hass.states.async_set = counted_set
+
+
+async def settle():
+    """Lets the tasks an update scheduled (state writes, new entities) run."""
+    for _ in range(50):
+        await asyncio.sleep(0)
+
+
+class LoadEntry:
+    """One config entry: its coordinator, sensor platform and league ticker."""
+
+    def __init__(self, hass, index, slate, date, clock, pool, stats, interval):
+        self.hass = hass
+        self.clock = clock
+        self.stats = stats
+        self.entry = ha_stubs.ConfigEntry(entry_id=f"bench{index}", title=f"NHL Tracker {index}")
+        self.coordinator = coordinator_module.NHLDataUpdateCoordinator(
+            hass, self.entry, timedelta(seconds=HA_SCAN_INTERVAL_SECONDS))
+        client = FixtureClient(hass, slate, date, clock, pool, stats)
+        self.coordinator.api_client = client
+        self.coordinator.ticker = client.ticker = ticker.NHLLeagueTicker(hass, client, interval)
+        self.adder = ha_stubs.entity_adder(hass)
+        self._count_updates()
+
+    def game_sensors(self):
+        return [entity for entity in self.adder.entities if isinstance(entity, sensor.NHLGameSensor)]
+
+    def _count_updates(self):
+        update_listeners = self.coordinator.async_update_listeners
+
+        def counted_update_listeners():
+            reached = len(self.game_sensors())
+            if reached:
+                self.stats.updates["refresh"] += 1
+                self.stats.reached["refresh"] += reached
+            token = CAUSE.set("refresh")
+            started = time.perf_counter()
+            try:
+                update_listeners()
+            finally:
+                self.stats.blocked("coordinator", time.perf_counter() - started)
+                CAUSE.reset(token)
+        self.coordinator.async_update_listeners = counted_update_listeners
+
+    async def setup(self):
+        """What the integration's async_setup_entry does: first refresh, then the sensor platform."""
+        self.hass.data.setdefault(const.DOMAIN, {})[self.entry.entry_id] = self.coordinator
+        await self.coordinator.async_config_entry_first_refresh()
+        token = CAUSE.set("setup")
+        try:
+            await sensor.async_setup_entry(self.hass, self.entry, self.adder)
+            await self.clock.wait_for(settle())
+        finally:
+            CAUSE.reset(token)
+
+    async def run(self, until):
+        """The coordinator's scheduled refreshes."""
+        while True:
+            await self.clock.sleep(HA_SCAN_INTERVAL_SECONDS)
+            if self.clock.now() >= until:
+                return
+            await self.coordinator.async_refresh()
+            await self.clock.wait_for(settle())
+
+
+def build_games(count, seed, start, stagger):
+    rng = random.Random(seed)
+    teams = TEAMS[:]
+    rng.shuffle(teams)
+    return [SyntheticGame(2024020000 + i + 1, teams[(2 * i) % len(teams)], teams[(2 * i + 1) % len(teams)],
+                          start + (i % 4) * stagger, rng)
+            for i in range(count)]
+
+
+async def run(games, entries, hours, interval, seed):
+    start = time.time() // 3600 * 3600 + 3600
+    date = (datetime.fromtimestamp(start, timezone.utc) - timedelta(hours=5)).strftime("%Y-%m-%d")
+    clock = VirtualClock(start - PREGAME_SECONDS - 60)
+    until = clock.now() + hours * 3600
+    stats = Stats()
+    monitor = LagMonitor()
+    patch_integration(clock, stats)
+
+    hass = ha_stubs.HomeAssistant()
+    hass.states.async_set(coordinator_module.DATE_SELECTOR_ENTITY_ID, date)
+    pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bench-documents")
+    loads = [LoadEntry(hass, i, build_games(games, seed + i, start, 30 * 60), date, clock, pool, stats, interval)
+             for i in range(entries)]
+    # The slates' play-by-play isn't served here, but would make every full
+    # collection walk it; keep the fixtures out of the integration's GC pauses.
+    gc.freeze()
+
+    monitor.start()
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    await asyncio.gather(*(load.setup() for load in loads))
+    game_entities = {entity.entity_id for load in loads for entity in load.game_sensors()}
+    count_writes(hass, game_entities, stats)
+    tasks = [asyncio.ensure_future(load.run(until)) for load in loads]
+    await clock.run(until)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    for load in loads:
+        load.coordinator.ticker.async_stop()
+    await hass.async_stop()
+    monitor.stop()
+    pool.shutdown()
+    return {
+        "stats": stats,
+        "monitor": monitor,
+        "hass": hass,
+        "sensors": len(game_entities),
+        "refresh_requests": sum(load.coordinator.refresh_requests for load in loads),
+        "wall": time.perf_counter() - wall,
+        "cpu": time.process_time() - cpu,
+        "virtual": until - (start - PREGAME_SECONDS - 60),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=300, help="Games per config entry")
+    parser.add_argument("--entries", type=int, default=1, help="Config entries, each with its own slate")
+    parser.add_argument("--hours", type=float, default=4.5, help="Virtual hours to run")
+    parser.add_argument("--interval", type=int, default=const.LIVE_GAME_POLL_INTERVAL_SECONDS,
+                        help="Ticker interval in virtual seconds")
+    # asyncio's own slow callback threshold (loop.slow_callback_duration)
+    parser.add_argument("--max-lag-ms", type=float, default=100.0,
+                        help="Fail if the event loop is ever blocked for longer")
+    parser.add_argument("--seed", type=int, default=2025)
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(run(args.games, args.entries, args.hours, args.interval, args.seed))
+    stats, monitor, hass = result["stats"], result["monitor"], result["hass"]
+    wall, virtual = result["wall"], result["virtual"]
+    failures = []
+
+    print(f"game sensors         {result['sensors']} in {args.entries} config entr{'y' if args.entries == 1 else 'ies'}")
+    for cause, label in (("refresh", "coordinator updates"), ("tick", "ticker ticks")):
+        applies, writes = stats.per_sensor(cause)
+        print(f"{label:<20} {stats.updates[cause]:,}; per sensor: {applies:.2f} applies, {writes:.2f} state writes")
+        if applies > 1 or writes > 1:
+            failures.append(f"{label} apply a sensor {applies:.2f} times and write it {writes:.2f} times")
+    print(f"refresh requests     {result['refresh_requests']:,}")
+    if result["refresh_requests"]:
+        failures.append(f"entities requested {result['refresh_requests']:,} coordinator refreshes")
+    print(f"state writes         {hass.states.writes:,} ({hass.states.writes / virtual:.1f}/s virtual, "
+          f"{hass.states.writes / wall:,.0f}/s real), {hass.states.changes:,} changed, "
+          f"{hass.states.serialized_bytes:,} B serialized")
+    print(f"bus events           {sum(hass.bus.fired.values()):,} "
+          f"({', '.join(f'{name}={count}' for name, count in sorted(hass.bus.fired.items()))})")
+
+    ticks = stats.tick_cpu or [0.0]
+    worst_lag = max(monitor.lags, default=0.0) * 1000
+    print(f"CPU/tick (ms)        mean={statistics.mean(ticks) * 1000:.2f} "
+          f"p95={sorted(ticks)[int(0.95 * (len(ticks) - 1))] * 1000:.2f} ticks={len(stats.tick_cpu)}")
+    print(f"loop lag (ms)        p50={monitor.quantile(0.5) * 1000:.2f} p99={monitor.quantile(0.99) * 1000:.2f} "
+          f"max={worst_lag:.2f} samples={len(monitor.lags)}")
+    print("longest section (ms) " + " ".join(
+        f"{phase}={seconds * 1000:.2f}" for phase, seconds in stats.longest.items()))
+    print(f"run                  {virtual / 3600:.1f}h virtual in {wall:.1f}s wall, {result['cpu']:.1f}s CPU")
+
+    if worst_lag > args.max_lag_ms:
+        failures.append(f"event loop blocked for {worst_lag:.1f}ms (limit {args.max_lag_ms:.0f}ms)")
+    if failures:
+        print("FAILED: " + "; ".join(failures))
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
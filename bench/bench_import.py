@@ -0,0 +1,83 @@
+"""
+Tracks the import cost of the integration and the bot with python -X importtime.
+
+    python bench_import.py [--runs 5] [--top 15]
+
+Each target is imported in a fresh interpreter; the reported time is the best
+of --runs. Home Assistant's own modules are included in the cumulative time of
+nhl_tracker but listed separately, so the integration's share stays visible.
+Exits non-zero if nhlpy is imported while loading the integration, since it
+is meant to be loaded on the first request.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+from bench_pollers import ROOT
+
+TARGETS = {
+    "nhl_tracker": (ROOT, "import nhl_tracker"),
+    "nhl_tracker.sensor": (ROOT, "import nhl_tracker.sensor"),
+    "Discord.api_utils": (os.path.join(ROOT, "Discord"), "import api_utils"),
+}
+LAZY_MODULES = ("nhlpy",)
+LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def importtime(cwd, statement):
+    """Returns {module: (self_us, cumulative_us)} or raises with the import error."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                          cwd=cwd, capture_output=True, text=True)
+    if proc.returncode:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    modules = {}
+    for line in proc.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            modules[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return modules
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for name, (cwd, statement) in TARGETS.items():
+        best = None
+        try:
+            for _ in range(args.runs):
+                modules = importtime(cwd, statement)
+                if best is None or sum(s for s, _ in modules.values()) < sum(s for s, _ in best.values()):
+                    best = modules
+        except RuntimeError as e:
+            print(f"{name}: not importable here ({e})\n")
+            continue
+
+        total = sum(s for s, _ in best.values())
+        own = sum(s for m, (s, _) in best.items()
+                  if m.startswith("nhl_tracker") or m in ("api_utils", "metrics", "resilience", "decoding", "utils"))
+        ha = sum(s for m, (s, _) in best.items() if m.startswith("homeassistant"))
+        print(f"{name}: {total / 1000:.1f}ms total, {own / 1000:.1f}ms own modules, "
+              f"{ha / 1000:.1f}ms homeassistant, {len(best)} modules")
+        for module, (self_us, cumulative_us) in sorted(best.items(), key=lambda kv: -kv[1][0])[:args.top]:
+            print(f"  {self_us / 1000:>8.2f}ms self {cumulative_us / 1000:>8.2f}ms cumulative  {module}")
+
+        eager = [m for m in best if m.split(".")[0] in LAZY_MODULES]
+        if eager and name.startswith("nhl_tracker"):
+            print(f"  LAZY IMPORT REGRESSION: {', '.join(sorted(eager)[:5])} imported at load")
+            failures += 1
+        if "nhl_tracker.__init__" in best:
+            print("  DOUBLE EXECUTION: nhl_tracker/__init__.py imported under a second name")
+            failures += 1
+        print()
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
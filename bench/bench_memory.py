@@ -0,0 +1,73 @@
+"""
+Compares per-game resident memory of the old live merge (the whole game feed
+dict.update()d into the sensor's data) with nhl_tracker/projection.py's
+GameSnapshot as a game goes on.
+
+    python bench_memory.py [fixture.json.gz] [--tolerance 0.1]
+
+Exits non-zero if a snapshot grows by more than --tolerance between the first
+and last live poll of any game.
+"""
+import argparse
+import json
+import sys
+
+from bench_pollers import load_integration_module
+from fixtures import Fixture
+from synthetic import build_slate
+
+projection = load_integration_module("projection")
+
+
+def measure(fixture, game_id):
+    """Returns [(progress, legacy_bytes, snapshot_bytes)] over the game's feed."""
+    feed = fixture.samples(f"gamecenter/{game_id}/play-by-play")
+    schedule = fixture.samples(f"schedule/{fixture.date}")[0][1]
+    entry = next(g for day in schedule["gameWeek"] for g in day["games"] if g["id"] == game_id)
+
+    # Decode every poll afresh, as the sensor receives a new document each time.
+    legacy = json.loads(json.dumps(entry))
+    snapshot = projection.GameSnapshot(game_id)
+    snapshot.apply(json.loads(json.dumps(entry)))
+
+    rows = []
+    for i, (_, body) in enumerate(feed):
+        live = json.loads(json.dumps(body))
+        legacy.update(live)
+        snapshot.apply(live)
+        del live
+        rows.append(((i + 1) / len(feed),
+                     projection.deep_sizeof(legacy),
+                     snapshot.memory_bytes()))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("fixture", nargs="?")
+    parser.add_argument("--games", type=int, default=4, help="Synthetic games if no fixture")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    fixture = Fixture.load(args.fixture) if args.fixture else build_slate(args.games, step=30)
+    failures = 0
+    print(f"{'game':>12} {'progress':>9} {'merged feed (B)':>16} {'snapshot (B)':>13}")
+    for game_id in fixture.game_ids():
+        rows = measure(fixture, game_id)
+        if not rows:
+            continue
+        for checkpoint in (0.0, 0.25, 0.5, 0.75, 1.0):
+            progress, legacy, slim = rows[min(int(checkpoint * len(rows)), len(rows) - 1)]
+            print(f"{game_id:>12} {progress:>8.0%} {legacy:>16,} {slim:>13,}")
+        first, last = rows[0][2], rows[-1][2]
+        growth = (last - first) / first
+        if growth > args.tolerance:
+            print(f"  snapshot grew {growth:.0%} over the game")
+            failures += 1
+
+    print("OK" if not failures else f"FAILED ({failures})")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
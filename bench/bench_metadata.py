@@ -0,0 +1,120 @@
+"""
+Compares the memory of a full season of finished games held as GameSnapshots,
+with per-game copies of team and player metadata versus records shared
+through nhl_tracker/metadata.py's MetadataCache.
+
+    python bench_metadata.py [--games 1312] [--min-saving 0.2]
+
+Every game document is decoded separately, as the integration receives them,
+so the per-game mode keeps one copy of every name, abbreviation and state
+string per game, which is what the snapshot held before the cache. Exits
+non-zero if the shared mode's attributes differ from the per-game ones or if
+it saves less than --min-saving of the snapshots' memory.
+"""
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from bench_pollers import load_integration_module
+from synthetic import TEAMS, SyntheticGame
+
+metadata = load_integration_module("metadata")
+projection = load_integration_module("projection")
+
+SEASON_START = 1728600000  # 2024-10-11
+GOALIES_PER_TEAM = 3
+SKATERS_PER_TEAM = 22
+
+
+def roster(team_index, rng):
+    """(goalies, skaters) as winningGoalie/winningGoalScorer objects."""
+    def player(n):
+        first, last = rng.choice("ABCDEJKLMNRST"), f"Player{team_index:02d}{n:02d}"
+        return {"playerId": 8470000 + team_index * 100 + n,
+                "firstInitial": {"default": f"{first}."}, "lastName": {"default": last}}
+    players = [player(n) for n in range(GOALIES_PER_TEAM + SKATERS_PER_TEAM)]
+    return players[:GOALIES_PER_TEAM], players[GOALIES_PER_TEAM:]
+
+
+def season_documents(count, seed):
+    """Encoded final landing documents of `count` games, about 82 per team at full size."""
+    rng = random.Random(seed)
+    rosters = [roster(i, rng) for i in range(len(TEAMS))]
+    bodies = []
+    for i in range(count):
+        away, home = rng.sample(range(len(TEAMS)), 2)
+        game = SyntheticGame(2024020001 + i, TEAMS[away], TEAMS[home], SEASON_START + i * 3 * 3600, rng)
+        doc = game.landing(game.end)
+        winner = away if doc["awayTeam"]["score"] > doc["homeTeam"]["score"] else home
+        goalies, skaters = rosters[winner]
+        doc["winningGoalie"] = rng.choice(goalies)
+        doc["winningGoalScorer"] = rng.choice(skaters)
+        doc["venueTimezone"] = "America/Toronto"
+        doc["easternUTCOffset"] = "-04:00"
+        bodies.append(json.dumps(doc).encode())
+    return bodies
+
+
+def hold_season(bodies, cache):
+    """Decode and apply every document; returns (snapshots, seconds spent applying)."""
+    snapshots = []
+    applying = 0.0
+    for body in bodies:
+        doc = json.loads(body)
+        started = time.perf_counter()
+        snapshot = projection.GameSnapshot(doc["id"])
+        snapshot.apply(doc, cache)
+        applying += time.perf_counter() - started
+        snapshots.append(snapshot)
+    return snapshots, applying
+
+
+def measure(bodies, share):
+    """Returns (snapshots, deep size, traced bytes, apply seconds) for one mode."""
+    cache = metadata.MetadataCache(share=share)
+    gc.collect()
+    tracemalloc.start()
+    snapshots, applying = hold_season(bodies, cache)
+    gc.collect()
+    traced = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    seen = set()
+    size = sum(snapshot.memory_bytes(seen) for snapshot in snapshots)
+    return snapshots, size, traced, applying
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=len(TEAMS) * 82 // 2, help="Games in the season")
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--min-saving", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    bodies = season_documents(args.games, args.seed)
+    per_game, per_game_size, per_game_traced, per_game_time = measure(bodies, share=False)
+    shared, shared_size, shared_traced, shared_time = measure(bodies, share=True)
+
+    mismatches = sum(a.as_attributes() != b.as_attributes() for a, b in zip(per_game, shared))
+    saving = 1 - shared_size / per_game_size
+
+    print(f"{args.games} games, {len(TEAMS)} teams")
+    print(f"{'':<22} {'per-game':>12} {'shared':>12}")
+    print(f"{'snapshots (B)':<22} {per_game_size:>12,} {shared_size:>12,}")
+    print(f"{'per game (B)':<22} {per_game_size // args.games:>12,} {shared_size // args.games:>12,}")
+    print(f"{'traced (B)':<22} {per_game_traced:>12,} {shared_traced:>12,}")
+    print(f"{'apply (us/game)':<22} {per_game_time / args.games * 1e6:>12.1f} {shared_time / args.games * 1e6:>12.1f}")
+    print(f"saving {saving:.0%}, {mismatches} attribute mismatch(es)")
+
+    if mismatches or saving < args.min_saving:
+        print("FAILED")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,381 @@
+"""
+Replays a recorded (or synthetic) slate against the pollers and reports, per
+component: upstream requests per game, alert latency and CPU time per tick.
+
+    python bench_pollers.py fixtures/2025-04-03.json.gz
+    python bench_pollers.py --synthetic 8 > ../bench_output.txt
+
+Components:
+    discord.period_tracker  Discord/sens_tracker.period_tracker, run unmodified
+                            against the replay server on a virtual clock.
+    ha.live_polling         The HA integration's coordinator and sensor
+                            platform, run on the ha_stubs stand-ins with
+                            LIVE_POLLING_MODE = "per_game": the schedule
+                            refresh every scan interval plus one live poll
+                            per game every LIVE_GAME_POLL_INTERVAL_SECONDS.
+    ha.league_ticker        The same with LIVE_POLLING_MODE = "ticker": one
+                            /score/now poll per tick (NHLLeagueTicker) for
+                            all live games, and a single detail fetch per
+                            game once it is final.
+The HA components reach the replay server as if it were the fetch daemon,
+so live polls fetch the landing document.
+
+Alert latency is measured from the true start of each period (derived from
+the recorded landing documents) to the moment the component noticed it: the
+Discord post, or the integration's period start event.
+
+--outage START:MINUTES makes the replay server answer 503 for MINUTES starting
+START minutes after the first puck drop; the "outage" count shows how many
+requests each component spent on the dead API. --no-resilience replays the
+HA patterns without circuit breakers or backoff, for comparison.
+"""
+import argparse
+import asyncio
+import contextvars
+import functools
+import importlib.util
+import logging
+import os
+import statistics
+import sys
+import time
+import types
+from datetime import datetime, timedelta
+
+import ha_stubs
+
+# Before any nhl_tracker import; a harness importing this module may have done it already.
+if "homeassistant" not in sys.modules:
+    ha_stubs.install()
+
+from clock import VirtualClock  # noqa: E402
+from fixtures import Fixture, period_starts  # noqa: E402
+from replay import ReplayServer  # noqa: E402
+from synthetic import build_slate  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FINISHED_STATES = ("OFF", "FINAL")
+
+
+def load_module(name, path):
+    """Loads a single source file without importing its package."""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_integration_module(name):
+    """
+    Imports nhl_tracker.<name> without running nhl_tracker/__init__.py, which
+    needs Home Assistant. Only modules free of Home Assistant imports work,
+    and their relative imports resolve within the package.
+    """
+    if "nhl_tracker" not in sys.modules:
+        package_dir = os.path.join(ROOT, "nhl_tracker")
+        spec = importlib.util.spec_from_file_location(
+            "nhl_tracker", os.path.join(package_dir, "__init__.py"),
+            submodule_search_locations=[package_dir])
+        sys.modules["nhl_tracker"] = importlib.util.module_from_spec(spec)
+    return importlib.import_module(f"nhl_tracker.{name}")
+
+
+HA_API_CLIENT = load_integration_module("api_client")
+HA_CONST = load_integration_module("const")
+HA_COORDINATOR = load_integration_module("coordinator")
+HA_RESILIENCE = load_integration_module("resilience")
+HA_SENSOR = load_integration_module("sensor")
+HA_TICKER = load_integration_module("ticker")
+HA_SCAN_INTERVAL_SECONDS = 5 * 60
+# CPU time at which the current task's tick started, see ReplayClient
+TICK = contextvars.ContextVar("tick", default=None)
+
+
+class Results:
+    """Measurements collected for one component run."""
+
+    def __init__(self, name, games):
+        self.name = name
+        self.games = games
+        self.tick_cpu = []
+        self.alerts = []  # (game_id, period, latency_seconds)
+        self.requests = {}
+        self.bytes = 0
+        self.skipped = None
+
+    def tick(self, started_cpu):
+        self.tick_cpu.append(time.process_time() - started_cpu)
+
+    def alert(self, fixture, game_id, period, t):
+        start = period_starts(fixture, game_id).get(period)
+        if start is not None:
+            self.alerts.append((game_id, period, t - start))
+
+    def summary(self):
+        if self.skipped:
+            return f"{self.name}: skipped ({self.skipped})"
+        per_game = self.requests.get("total", 0) / max(len(self.games), 1)
+        lines = [f"{self.name}:",
+                 f"  requests/game      {per_game:.1f}  "
+                 f"({', '.join(f'{k}={v}' for k, v in sorted(self.requests.items()) if k != 'total')})",
+                 f"  bytes/game         {self.bytes / max(len(self.games), 1):.0f}"]
+        if self.alerts:
+            latencies = [a[2] for a in self.alerts]
+            lines.append(f"  alert latency (s)  mean={statistics.mean(latencies):.1f} "
+                         f"max={max(latencies):.1f} n={len(latencies)}")
+        else:
+            lines.append("  alert latency (s)  no alerts")
+        if self.tick_cpu:
+            cpu_us = sorted(c * 1e6 for c in self.tick_cpu)
+            lines.append(f"  CPU/tick (us)      mean={statistics.mean(cpu_us):.0f} "
+                         f"p95={cpu_us[int(len(cpu_us) * 0.95)]:.0f} ticks={len(cpu_us)}")
+        return "\n".join(lines)
+
+
+async def run_with_clock(clock, until, *coros):
+    """Runs coroutines to completion while the virtual clock advances."""
+    tasks = [asyncio.ensure_future(c) for c in coros]
+    await clock.run(until)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def bench_discord(fixture, server, clock):
+    results = Results("discord.period_tracker", fixture.game_ids())
+    os.environ.setdefault("TODAYS_GAMES_CHANNEL_ID", "0")
+    os.environ.setdefault("SENS_GAMES_CHANNEL_ID", "0")
+    sys.path.insert(0, os.path.join(ROOT, "Discord"))
+    try:
+        import api_utils
+        import sens_tracker
+    except ImportError as e:
+        results.skipped = e
+        return results
+
+    api_utils.NHL_API = server.base_url
+    # Breakers must time their reset windows on the virtual clock too.
+    api_utils.breakers.clear()
+    api_utils.CircuitBreaker = functools.partial(api_utils.CircuitBreaker, clock=clock.now)
+
+    class VirtualDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.fromtimestamp(clock.now(), tz)
+
+    class AlertRecorder:
+        """Stands in for MyClient: records the alert instead of posting it."""
+
+        def __init__(self, action, channel_id, game=None, games=None, lease=None):
+            if action == "game":
+                results.alert(fixture, game.id, game.period, clock.now())
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def start(self, token):
+            pass
+
+    def timed_get_game(game_id):
+        started = time.process_time()
+        try:
+            return api_utils.get_game(game_id)
+        finally:
+            results.tick(started)
+
+    sens_tracker.asyncio = types.SimpleNamespace(sleep=clock.sleep)
+    sens_tracker.datetime = VirtualDatetime
+    sens_tracker.MyClient = AlertRecorder
+    sens_tracker.get_game = timed_get_game
+
+    games = api_utils.get_games_by_date(fixture.date)
+    server.reset_counters()
+    asyncio.run(run_with_clock(clock, fixture.end,
+                               *(sens_tracker.period_tracker(g) for g in games)))
+    results.requests = dict(server.requests)
+    results.bytes = server.bytes_sent
+    return results
+
+
+class ReplayClient(HA_API_CLIENT.NHLAPIClient):
+    """
+    NHLAPIClient pointed at the replay server as if it were the fetch daemon.
+    Virtual time stands still while a request is out, and each fetch the
+    integration awaits starts a tick in the caller's task.
+    """
+
+    def __init__(self, hass, server, clock):
+        super().__init__(hass, daemon_url=server.base_url.removesuffix("/v1"))
+        self.clock = clock
+        self.decode_cpu = 0.0
+
+    async def _async_get_json(self, endpoint, path, decode=HA_API_CLIENT.decode_json):
+        def timed_decode(body):
+            started = time.process_time()
+            try:
+                return decode(body)
+            finally:
+                self.decode_cpu = time.process_time() - started
+        return await self.clock.wait_for(super()._async_get_json(endpoint, path, timed_decode))
+
+    def _ticked(self, result):
+        # The decode ran in the request's own task; count it towards this tick.
+        TICK.set(time.process_time() - self.decode_cpu)
+        return result
+
+    async def get_schedule(self, date_str):
+        return self._ticked(await super().get_schedule(date_str))
+
+    async def get_scores(self, date_str="now"):
+        return self._ticked(await super().get_scores(date_str))
+
+    async def get_game_details(self, game_id):
+        return self._ticked(await super().get_game_details(game_id))
+
+
+def virtual_datetime(clock):
+    class VirtualDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.fromtimestamp(clock.now(), tz)
+    return VirtualDatetime
+
+
+def virtual_asyncio(sleep):
+    """What the sensor and ticker modules use of asyncio, with sleep on the virtual clock."""
+    return types.SimpleNamespace(sleep=sleep, Task=asyncio.Task, CancelledError=asyncio.CancelledError)
+
+
+def bench_ha(fixture, server, clock, mode="per_game", resilient=True):
+    """
+    Runs the integration's own coordinator, sensor platform and league ticker
+    (on the ha_stubs stand-ins) against the replay server, with sensors
+    following live games per game or through the ticker. A tick is one
+    schedule refresh, live poll or ticker poll: its decode plus the
+    integration's work on the result, up to the poller's next sleep.
+    """
+    name = "ha.league_ticker" if mode == "ticker" else "ha.live_polling"
+    if not resilient:
+        name += " (no resilience)"
+    results = Results(name, fixture.game_ids())
+
+    async def tick_sleep(delay):
+        started = TICK.get()
+        if started is not None:
+            TICK.set(None)
+            results.tick(started)
+        await clock.sleep(delay)
+
+    class VirtualCircuitBreaker(HA_RESILIENCE.CircuitBreaker):
+        def __init__(self, endpoint, **kwargs):
+            if not resilient:
+                kwargs["failure_threshold"] = float("inf")
+            super().__init__(endpoint, clock=clock.now, **kwargs)
+
+    class FixedBackoff(HA_RESILIENCE.Backoff):
+        def next_delay(self):
+            return self.base
+
+    backoff = HA_RESILIENCE.Backoff if resilient else FixedBackoff
+    # An outage's failed requests are counted; logging each one would bury the report.
+    logging.getLogger("nhl_tracker").setLevel(logging.CRITICAL)
+    HA_API_CLIENT.CircuitBreaker = VirtualCircuitBreaker
+    HA_SENSOR.asyncio = virtual_asyncio(tick_sleep)
+    HA_SENSOR.datetime = virtual_datetime(clock)
+    HA_SENSOR.Backoff = HA_TICKER.Backoff = backoff
+    HA_SENSOR.LIVE_POLLING_MODE = mode
+    HA_TICKER.asyncio = virtual_asyncio(tick_sleep)
+
+    hass = ha_stubs.HomeAssistant()
+    hass.states.async_set(HA_COORDINATOR.DATE_SELECTOR_ENTITY_ID, fixture.date)
+    fire = hass.bus.async_fire
+
+    def recorded_fire(event_type, event_data=None):
+        if event_type == HA_CONST.EVENT_PERIOD_START:
+            results.alert(fixture, event_data["game_id"], event_data["period"], clock.now())
+        fire(event_type, event_data)
+    hass.bus.async_fire = recorded_fire
+
+    entry = ha_stubs.ConfigEntry()
+    coordinator = HA_COORDINATOR.NHLDataUpdateCoordinator(
+        hass, entry, timedelta(seconds=HA_SCAN_INTERVAL_SECONDS))
+    client = coordinator.api_client = ReplayClient(hass, server, clock)
+    # The daemon URL would pick the daemon's push ticker; the replay server only polls.
+    coordinator.ticker = HA_TICKER.NHLLeagueTicker(hass, client)
+    hass.data.setdefault(HA_CONST.DOMAIN, {})[entry.entry_id] = coordinator
+
+    def all_finished():
+        games = (coordinator.data or {}).values()
+        return bool(games) and all(game.get("gameState") in FINISHED_STATES for game in games)
+
+    async def refresh():
+        """The coordinator's scheduled refreshes, until every game is over."""
+        while not all_finished():
+            await tick_sleep(HA_SCAN_INTERVAL_SECONDS)
+            await coordinator.async_refresh()
+
+    async def run():
+        server.reset_counters()
+        await coordinator.async_config_entry_first_refresh()
+        await HA_SENSOR.async_setup_entry(hass, entry, ha_stubs.entity_adder(hass))
+        await run_with_clock(clock, fixture.end, refresh())
+        coordinator.ticker.async_stop()
+        await hass.async_stop()
+
+    asyncio.run(run())
+    results.requests = dict(server.requests)
+    results.bytes = server.bytes_sent
+    return results
+
+
+COMPONENTS = {
+    "discord.period_tracker": bench_discord,
+    "ha.live_polling": bench_ha,
+    "ha.league_ticker": functools.partial(bench_ha, mode="ticker"),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("fixture", nargs="?", help="Recorded fixture (.json.gz)")
+    parser.add_argument("--synthetic", type=int, metavar="GAMES",
+                        help="Use a synthetic slate with this many games instead")
+    parser.add_argument("--component", action="append", choices=sorted(COMPONENTS),
+                        help="Only run these components (repeatable)")
+    parser.add_argument("--outage", metavar="START:MINUTES",
+                        help="Inject an API outage, START minutes after the first puck drop")
+    parser.add_argument("--no-resilience", action="store_true",
+                        help="Replay the HA patterns without breakers or backoff")
+    args = parser.parse_args(argv)
+
+    if args.fixture:
+        fixture = Fixture.load(args.fixture)
+    else:
+        fixture = build_slate(args.synthetic or 8)
+
+    outages = []
+    if args.outage:
+        start, minutes = (float(v) for v in args.outage.split(":"))
+        first_puck = min(period_starts(fixture, g).get(1, fixture.end) for g in fixture.game_ids())
+        outages.append((first_puck + start * 60, first_puck + (start + minutes) * 60))
+
+    print(f"Slate {fixture.date}: {len(fixture.game_ids())} game(s), "
+          f"{(fixture.end - fixture.start) / 3600:.1f}h recorded")
+    for name in args.component or COMPONENTS:
+        clock = VirtualClock(fixture.start)
+        with ReplayServer(fixture, clock, outages=outages) as server:
+            wall = time.perf_counter()
+            bench = COMPONENTS[name]
+            if args.no_resilience and name.startswith("ha."):
+                bench = functools.partial(bench, resilient=False)
+            results = bench(fixture, server, clock)
+            print(results.summary())
+            if not results.skipped:
+                print(f"  replay wall time   {time.perf_counter() - wall:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
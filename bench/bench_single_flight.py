@@ -0,0 +1,86 @@
+"""
+Checks request coalescing in nhl_tracker/single_flight.py: N concurrent
+callers per key must produce exactly one upstream request per burst.
+
+    python bench_single_flight.py --callers 50 --keys 10 --bursts 3
+
+Exits non-zero if any key was fetched more than once in a burst.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import Counter
+
+from bench_pollers import ROOT, load_module
+
+single_flight = load_module(
+    "nhl_tracker_single_flight", os.path.join(ROOT, "nhl_tracker", "single_flight.py"))
+
+
+async def burst(flight, upstream, callers, keys, latency):
+    async def fetch(key):
+        upstream[key] += 1
+        await asyncio.sleep(latency)
+        return {"key": key}
+
+    # Callers arrive spread over the first half of the upstream latency, like
+    # sensors whose poll timers drift relative to each other.
+    async def caller(i):
+        await asyncio.sleep(latency / 2 * (i // keys) / callers)
+        key = ("game_feed", i % keys)
+        result = await flight.do(key, fetch, key)
+        assert result == {"key": key}
+
+    await asyncio.gather(*(caller(i) for i in range(callers * keys)))
+
+
+async def run(callers, keys, bursts, latency):
+    flight = single_flight.SingleFlight()
+    failures = 0
+    for n in range(bursts):
+        upstream = Counter()
+        started = time.perf_counter()
+        await burst(flight, upstream, callers, keys, latency)
+        elapsed = time.perf_counter() - started
+        duplicated = {k: v for k, v in upstream.items() if v != 1}
+        failures += len(duplicated)
+        print(f"burst {n + 1}: {callers * keys} callers, {sum(upstream.values())} upstream "
+              f"request(s) for {keys} key(s) in {elapsed * 1000:.0f}ms"
+              + (f"  DUPLICATED {duplicated}" if duplicated else ""))
+        if flight._in_flight:
+            print(f"  {len(flight._in_flight)} key(s) still marked in flight after burst")
+            failures += 1
+
+    # A caller cancelled mid-flight must not cancel the request for the others.
+    upstream = Counter()
+
+    async def slow(key):
+        upstream[key] += 1
+        await asyncio.sleep(latency)
+        return key
+
+    first = asyncio.ensure_future(flight.do("cancel", slow, "cancel"))
+    await asyncio.sleep(0)
+    second = asyncio.ensure_future(flight.do("cancel", slow, "cancel"))
+    await asyncio.sleep(latency / 2)
+    first.cancel()
+    if await second != "cancel" or upstream["cancel"] != 1:
+        print("cancelling one caller broke the shared request")
+        failures += 1
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--callers", type=int, default=50, help="Concurrent callers per key")
+    parser.add_argument("--keys", type=int, default=10)
+    parser.add_argument("--bursts", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="Simulated upstream latency in seconds")
+    args = parser.parse_args()
+
+    failures = asyncio.run(run(args.callers, args.keys, args.bursts, args.latency))
+    print("OK" if not failures else f"FAILED ({failures})")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,52 @@
+"""
+Checks that the modules the bot shares with the integration have one source.
+
+    python check_shared.py
+
+The integration is installed on its own, so decoding.py, metrics.py,
+resilience.py and season_calendar.py live in nhl_tracker/, and Discord/ has
+a symbolic link to each (the bot and DB/ import them flat from Discord/).
+A link replaced by a copy, or checked out as a plain file holding the link
+target (git's core.symlinks=false), would let the two sides drift again.
+Exits non-zero and says which link is missing or broken.
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_DIR = "nhl_tracker"
+LINK_DIR = "Discord"
+SHARED = ("decoding.py", "metrics.py", "resilience.py", "season_calendar.py")
+
+
+def check(module):
+    """None if LINK_DIR/module is a link to SOURCE_DIR/module, else what is wrong with it."""
+    link = os.path.join(ROOT, LINK_DIR, module)
+    source = os.path.join(ROOT, SOURCE_DIR, module)
+    if not os.path.lexists(link):
+        return "is missing"
+    if not os.path.islink(link):
+        return f"is a file, not a link to {SOURCE_DIR}/{module}"
+    if not os.path.exists(link) or not os.path.samefile(link, source):
+        return f"links to {os.readlink(link)}, not {SOURCE_DIR}/{module}"
+    return None
+
+
+def main():
+    broken = 0
+    for module in SHARED:
+        problem = check(module)
+        if problem:
+            broken += 1
+            print(f"{LINK_DIR}/{module} {problem}")
+
+    if broken:
+        print(f"FAILED: {broken} of {len(SHARED)} shared modules; "
+              f"recreate with: ln -sf ../{SOURCE_DIR}/<module> {LINK_DIR}/<module>")
+        return 1
+    print(f"OK: {len(SHARED)} shared modules linked")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
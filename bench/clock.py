@@ -0,0 +1,97 @@
+import asyncio
+import heapq
+import itertools
+import time
+
+
+class VirtualClock:
+    """
+    Discrete-event clock for replaying recorded games faster than real time.
+
+    Coroutines call `sleep` instead of asyncio.sleep. When every participant
+    is asleep the clock jumps straight to the earliest wake-up, so a three hour
+    game replays in however long the pollers take to do their actual work.
+    """
+
+    def __init__(self, start):
+        self._now = start
+        self._sleepers = []
+        self._counter = itertools.count()
+        self._runner = None
+        self._pending = 0
+        self._settled = None
+
+    def now(self):
+        return self._now
+
+    def time(self):
+        """Alias of now() so the clock can stand in for the time module."""
+        return self._now
+
+    async def sleep(self, seconds):
+        await self.sleep_until(self._now + max(seconds, 0))
+
+    async def sleep_until(self, t):
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._sleepers, (max(t, self._now), next(self._counter), future))
+        await future
+
+    async def wait_for(self, awaitable):
+        """
+        Awaits real work outside the loop (e.g. an executor job) without
+        virtual time moving on meanwhile, as if it took no time at all.
+        """
+        self._pending += 1
+        try:
+            return await awaitable
+        finally:
+            self._pending -= 1
+            if not self._pending and self._settled is not None:
+                self._settled.set()
+
+    async def run(self, until):
+        """
+        Advances virtual time until `until` or until nobody is sleeping.
+
+        Must run as a task alongside the coroutines under test. The clock only
+        advances once the event loop has drained all ready callbacks, i.e. when
+        every task is blocked on the clock (or on I/O that already completed).
+        """
+        while True:
+            # Let every runnable task reach its next await point.
+            for _ in range(50):
+                await asyncio.sleep(0)
+            while self._pending:
+                self._settled = asyncio.Event()
+                await self._settled.wait()
+                for _ in range(50):
+                    await asyncio.sleep(0)
+            while self._sleepers and self._sleepers[0][2].cancelled():
+                heapq.heappop(self._sleepers)
+            if not self._sleepers or self._sleepers[0][0] > until:
+                self._now = until
+                return
+            t, _, future = heapq.heappop(self._sleepers)
+            self._now = t
+            future.set_result(None)
+
+
+class AcceleratedClock:
+    """Wall clock running `speed` times faster than real time from `start`."""
+
+    def __init__(self, start, speed=60.0):
+        self.start = start
+        self.speed = speed
+        self._origin = time.monotonic()
+
+    def now(self):
+        return self.start + (time.monotonic() - self._origin) * self.speed
+
+    def time(self):
+        return self.now()
+
+    async def sleep(self, seconds):
+        await asyncio.sleep(max(seconds, 0) / self.speed)
+
+    async def sleep_until(self, t):
+        await self.sleep(t - self.now())
@@ -0,0 +1,114 @@
+import gzip
+import json
+import os
+from bisect import bisect_right
+
+
+class Fixture:
+    """
+    A recorded slate of NHL API responses.
+
+    Each endpoint path (relative to the v1 API root, e.g. "score/2025-04-03" or
+    "gamecenter/2024021230/landing") maps to a timeline of (epoch_seconds, body)
+    pairs. Only changed bodies are stored, so a lookup returns the most recent
+    body recorded at or before the requested time.
+    """
+
+    def __init__(self, date, start, end, timelines=None):
+        self.date = date
+        self.start = start
+        self.end = end
+        self.timelines = timelines or {}
+        self._times = {}
+
+    def add(self, path, t, body):
+        """
+        Appends a response to a path's timeline, skipping it if unchanged.
+
+        Returns:
+            bool: True if the body was stored.
+        """
+        timeline = self.timelines.setdefault(path, [])
+        if timeline and timeline[-1][1] == body:
+            return False
+        timeline.append([t, body])
+        self._times.pop(path, None)
+        self.end = max(self.end, t)
+        return True
+
+    def at(self, path, t):
+        """
+        Returns the body recorded for a path at time t, or None.
+
+        Before the first recorded sample the first body is returned so that
+        pollers started slightly early still see a response.
+        """
+        timeline = self.timelines.get(path)
+        if not timeline:
+            return None
+        times = self._times.get(path)
+        if times is None:
+            times = self._times[path] = [sample[0] for sample in timeline]
+        index = bisect_right(times, t) - 1
+        return timeline[max(index, 0)][1]
+
+    def samples(self, path):
+        """Returns the (t, body) samples recorded for a path."""
+        return self.timelines.get(path, [])
+
+    def game_ids(self):
+        """Returns the ids of every game seen in the slate's score timeline."""
+        ids = []
+        for _, body in self.samples(f"score/{self.date}"):
+            for game in body.get("games", []):
+                if game["id"] not in ids:
+                    ids.append(game["id"])
+        return ids
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump({
+                "date": self.date,
+                "start": self.start,
+                "end": self.end,
+                "timelines": self.timelines,
+            }, f)
+
+    @classmethod
+    def load(cls, path):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["date"], data["start"], data["end"], data["timelines"])
+
+
+def period_starts(fixture, game_id):
+    """
+    Derives the true start time of each period from a game's landing timeline.
+
+    A period starts when the period number changes while the game is live, or
+    when the clock leaves intermission. The first sample past an intermission
+    can be up to a sample step late, so the intermission's last sample and its
+    clock (seconds left in the intermission) date the start instead.
+
+    Returns:
+        dict[int, float]: period number -> epoch seconds.
+    """
+    starts = {}
+    previous = None
+    intermission_ends = None
+    for t, body in fixture.samples(f"gamecenter/{game_id}/landing"):
+        if body.get("gameState") not in ("LIVE", "CRIT"):
+            previous = None
+            continue
+        period = body.get("periodDescriptor", {}).get("number")
+        clock = body.get("clock", {})
+        if clock.get("inIntermission", False):
+            previous = (period, True)
+            intermission_ends = t + clock.get("secondsRemaining", 0)
+            continue
+        if previous is None or previous[0] != period or previous[1]:
+            ended = intermission_ends if previous and previous[1] else None
+            starts.setdefault(period, t if ended is None else min(ended, t))
+        previous = (period, False)
+    return starts
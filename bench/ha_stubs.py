@@ -0,0 +1,361 @@
+"""
+Stand-ins for the parts of Home Assistant that nhl_tracker's coordinator,
+tickers and sensors use, so benches can run that code unmodified without
+Home Assistant installed.
+
+    import ha_stubs
+    ha_stubs.install()            # before importing any nhl_tracker module
+    hass = ha_stubs.HomeAssistant()
+
+Only behaviour the integration relies on is emulated, the way Home Assistant
+implements it:
+- CoordinatorEntity subscribes _handle_coordinator_update when it is added,
+  and its async_update asks the coordinator for a refresh.
+- async_write_ha_state builds the state and attributes on every call, and
+  serializes them when they changed (the recorder and websocket API do).
+- Events fired on the bus are serialized as well.
+Coordinators don't schedule their own refreshes; the bench calls
+async_refresh(), and async_request_refresh() is only counted.
+"""
+import asyncio
+import enum
+import json
+import re
+import sys
+import types
+from collections import Counter
+from datetime import datetime, timezone
+
+try:
+    import pytz
+except ImportError:
+    pytz = None
+
+
+def callback(func):
+    return func
+
+
+class State:
+    __slots__ = ("entity_id", "state", "attributes")
+
+    def __init__(self, entity_id, state, attributes):
+        self.entity_id = entity_id
+        self.state = state
+        self.attributes = attributes
+
+
+class StateMachine:
+    """hass.states: counts writes, and serializes the ones that change something."""
+
+    def __init__(self):
+        self._states = {}
+        self.writes = 0
+        self.writes_by_entity = Counter()
+        self.changes = 0
+        self.serialized_bytes = 0
+
+    def get(self, entity_id):
+        return self._states.get(entity_id)
+
+    def async_entity_ids(self):
+        return list(self._states)
+
+    def async_set(self, entity_id, state, attributes=None):
+        self.writes += 1
+        self.writes_by_entity[entity_id] += 1
+        attributes = attributes or {}
+        old = self._states.get(entity_id)
+        if old is not None and old.state == state and old.attributes == attributes:
+            return
+        self.changes += 1
+        self._states[entity_id] = State(entity_id, state, attributes)
+        self.serialized_bytes += len(json.dumps(
+            {"entity_id": entity_id, "state": state, "attributes": attributes}, default=str))
+
+
+class EventBus:
+    """hass.bus: counts and serializes fired events."""
+
+    def __init__(self):
+        self.fired = Counter()
+
+    def async_fire(self, event_type, event_data=None):
+        self.fired[event_type] += 1
+        json.dumps(event_data, default=str)
+
+
+class HomeAssistant:
+    def __init__(self, time_zone="America/Toronto"):
+        self.data = {}
+        self.states = StateMachine()
+        self.bus = EventBus()
+        tz = pytz.timezone(time_zone) if pytz else timezone.utc
+        self.config = types.SimpleNamespace(time_zone=tz)
+        self.entity_ids = set()
+        self.session = None
+        self.tasks = set()
+
+    @property
+    def loop(self):
+        return asyncio.get_running_loop()
+
+    def async_create_task(self, coro, name=None):
+        task = asyncio.get_running_loop().create_task(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    async def async_stop(self):
+        """Cancel every task still running and close the HTTP session."""
+        for task in list(self.tasks):
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        if self.session is not None:
+            await self.session.close()
+
+    def async_add_executor_job(self, target, *args):
+        return asyncio.get_running_loop().run_in_executor(None, target, *args)
+
+
+class ConfigEntry:
+    def __init__(self, entry_id="bench", title="NHL Tracker", data=None, options=None):
+        self.entry_id = entry_id
+        self.title = title
+        self.data = data or {}
+        self.options = options or {}
+        self._on_unload = []
+
+    def async_on_unload(self, func):
+        self._on_unload.append(func)
+
+    def add_update_listener(self, listener):
+        return lambda: None
+
+
+class UpdateFailed(Exception):
+    pass
+
+
+class DataUpdateCoordinator:
+    def __init__(self, hass, logger, *, name, update_interval=None, update_method=None):
+        self.hass = hass
+        self.logger = logger
+        self.name = name
+        self.update_interval = update_interval
+        self.data = None
+        self.last_update_success = True
+        self.refresh_requests = 0
+        self._listeners = {}
+
+    def async_add_listener(self, update_callback, context=None):
+        key = object()
+        self._listeners[key] = update_callback
+
+        def remove_listener():
+            self._listeners.pop(key, None)
+        return remove_listener
+
+    def async_update_listeners(self):
+        for update_callback in list(self._listeners.values()):
+            update_callback()
+
+    async def async_refresh(self):
+        try:
+            self.data = await self._async_update_data()
+            self.last_update_success = True
+        except UpdateFailed as err:
+            self.last_update_success = False
+            self.logger.warning(f"Error fetching {self.name} data: {err}")
+        self.async_update_listeners()
+
+    async_config_entry_first_refresh = async_refresh
+
+    async def async_request_refresh(self):
+        # Home Assistant debounces these into at most one refresh per 10 seconds.
+        self.refresh_requests += 1
+
+
+class Entity:
+    hass = None
+    entity_id = None
+    _attr_name = None
+    _attr_unique_id = None
+    _attr_available = True
+    _attr_icon = None
+    _attr_should_poll = True
+    _attr_entity_category = None
+
+    @property
+    def name(self):
+        return self._attr_name
+
+    @property
+    def unique_id(self):
+        return self._attr_unique_id
+
+    @property
+    def available(self):
+        return self._attr_available
+
+    @property
+    def icon(self):
+        return self._attr_icon
+
+    @property
+    def state(self):
+        return None
+
+    @property
+    def extra_state_attributes(self):
+        return None
+
+    def async_on_remove(self, func):
+        self.__dict__.setdefault("_on_remove", []).append(func)
+
+    async def async_added_to_hass(self):
+        pass
+
+    async def async_will_remove_from_hass(self):
+        pass
+
+    async def async_update(self):
+        pass
+
+    def async_write_ha_state(self):
+        if not self.available:
+            self.hass.states.async_set(self.entity_id, "unavailable", {"friendly_name": self.name})
+            return
+        state = self.state
+        attributes = dict(self.extra_state_attributes or {})
+        attributes["friendly_name"] = self.name
+        if self.icon:
+            attributes["icon"] = self.icon
+        self.hass.states.async_set(self.entity_id, "unknown" if state is None else str(state), attributes)
+
+    def async_schedule_update_ha_state(self, force_refresh=False):
+        self.hass.async_create_task(self.async_update_ha_state(force_refresh))
+
+    async def async_update_ha_state(self, force_refresh=False):
+        if force_refresh:
+            await self.async_update()
+        self.async_write_ha_state()
+
+
+class CoordinatorEntity(Entity):
+    def __init__(self, coordinator, context=None):
+        self.coordinator = coordinator
+        self.coordinator_context = context
+
+    @property
+    def available(self):
+        return super().available and self.coordinator.last_update_success
+
+    async def async_added_to_hass(self):
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.async_add_listener(
+            self._handle_coordinator_update, self.coordinator_context))
+
+    @callback
+    def _handle_coordinator_update(self):
+        self.async_write_ha_state()
+
+    async def async_update(self):
+        await self.coordinator.async_request_refresh()
+
+
+class SensorDeviceClass(str, enum.Enum):
+    TIMESTAMP = "timestamp"
+
+
+class EntityCategory(str, enum.Enum):
+    CONFIG = "config"
+    DIAGNOSTIC = "diagnostic"
+
+
+class SensorEntity(Entity):
+    _attr_native_value = None
+    _attr_native_unit_of_measurement = None
+    _attr_device_class = None
+
+    @property
+    def native_value(self):
+        return self._attr_native_value
+
+    @property
+    def state(self):
+        value = self.native_value
+        return value.isoformat() if isinstance(value, datetime) else value
+
+
+def generate_entity_id(entity_id_format, name, current_ids=None, hass=None):
+    slug = re.sub(r"[^a-z0-9_]+", "_", (name or "").lower()).strip("_") or "unnamed"
+    entity_id = entity_id_format.format(slug)
+    taken = hass.entity_ids if hass is not None else set(current_ids or ())
+    suffix = 2
+    while entity_id in taken:
+        entity_id = entity_id_format.format(f"{slug}_{suffix}")
+        suffix += 1
+    taken.add(entity_id)
+    return entity_id
+
+
+def entity_adder(hass):
+    """An async_add_entities for a platform; the added entities are kept in .entities."""
+
+    async def _add(entity):
+        await entity.async_added_to_hass()
+        entity.async_write_ha_state()
+
+    def async_add_entities(new_entities, update_before_add=False):
+        for entity in new_entities:
+            entity.hass = hass
+            if entity.entity_id is None:
+                entity.entity_id = generate_entity_id("sensor.{}", entity.name, hass=hass)
+            async_add_entities.entities.append(entity)
+            hass.async_create_task(_add(entity))
+
+    async_add_entities.entities = []
+    return async_add_entities
+
+
+def async_get_clientsession(hass):
+    import aiohttp
+
+    if hass.session is None or hass.session.closed:
+        hass.session = aiohttp.ClientSession()
+    return hass.session
+
+
+def _module(name, **attrs):
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    sys.modules[name] = module
+    return module
+
+
+def install():
+    """Register the stand-ins as the homeassistant package (and async_timeout, which it ships)."""
+    if any(name.startswith("nhl_tracker.") for name in sys.modules):
+        raise RuntimeError("install() must run before nhl_tracker modules are imported")
+
+    dt = _module("homeassistant.util.dt", DEFAULT_TIME_ZONE=timezone.utc,
+                 now=lambda time_zone=None: datetime.now(time_zone or timezone.utc),
+                 utcnow=lambda: datetime.now(timezone.utc))
+    _module("homeassistant", __path__=[])
+    _module("homeassistant.core", HomeAssistant=HomeAssistant, callback=callback, State=State)
+    _module("homeassistant.config_entries", ConfigEntry=ConfigEntry)
+    _module("homeassistant.const", ATTR_ATTRIBUTION="attribution", EntityCategory=EntityCategory,
+            CONF_NAME="name", CONF_SCAN_INTERVAL="scan_interval")
+    _module("homeassistant.components", __path__=[])
+    _module("homeassistant.components.sensor", SensorDeviceClass=SensorDeviceClass, SensorEntity=SensorEntity)
+    _module("homeassistant.helpers", __path__=[])
+    _module("homeassistant.helpers.update_coordinator", DataUpdateCoordinator=DataUpdateCoordinator,
+            UpdateFailed=UpdateFailed, CoordinatorEntity=CoordinatorEntity)
+    _module("homeassistant.helpers.entity", Entity=Entity, generate_entity_id=generate_entity_id)
+    _module("homeassistant.helpers.aiohttp_client", async_get_clientsession=async_get_clientsession)
+    _module("homeassistant.util", __path__=[], dt=dt)
+    try:
+        import async_timeout  # noqa: F401
+    except ImportError:
+        _module("async_timeout", timeout=asyncio.timeout)
@@ -0,0 +1,79 @@
+"""
+Records the NHL API responses for a full slate of games into a fixture file.
+
+    python recorder.py 2025-04-03 --interval 10 --out fixtures/2025-04-03.json.gz
+
+Polls /score/{date} and /schedule/{date} for the day, plus the landing and
+play-by-play documents of every game that is in progress, until every game is
+final. Only changed responses are kept (see fixtures.Fixture).
+"""
+import argparse
+import time
+
+import requests
+
+from fixtures import Fixture
+
+NHL_API = "https://api-web.nhle.com/v1"
+FINISHED_STATES = ("OFF", "FINAL")
+ACTIVE_STATES = ("PRE", "LIVE", "CRIT")
+
+
+def fetch(session, path):
+    response = session.get(f"{NHL_API}/{path}", timeout=10)
+    response.raise_for_status()
+    return response.json()
+
+
+def record(date, interval, out, max_hours=8):
+    session = requests.Session()
+    now = time.time()
+    fixture = Fixture(date, now, now)
+    deadline = now + max_hours * 3600
+
+    while time.time() < deadline:
+        t = time.time()
+        try:
+            score = fetch(session, f"score/{date}")
+            fixture.add(f"score/{date}", t, score)
+            fixture.add(f"schedule/{date}", t, fetch(session, f"schedule/{date}"))
+
+            games = score.get("games", [])
+            for game in games:
+                if game["gameState"] not in ACTIVE_STATES:
+                    continue
+                for doc in ("landing", "play-by-play"):
+                    path = f"gamecenter/{game['id']}/{doc}"
+                    fixture.add(path, t, fetch(session, path))
+        except requests.RequestException as e:
+            print(f"Request failed, retrying next tick: {e}")
+            games = None
+
+        fixture.save(out)
+
+        if games is not None and games and all(g["gameState"] in FINISHED_STATES for g in games):
+            # Record the final landing documents once more before stopping.
+            for game in games:
+                path = f"gamecenter/{game['id']}/landing"
+                fixture.add(path, time.time(), fetch(session, path))
+            fixture.save(out)
+            print(f"All {len(games)} game(s) final, recording saved to {out}")
+            return fixture
+
+        time.sleep(interval)
+
+    print(f"Recording stopped after {max_hours}h, saved to {out}")
+    return fixture
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("date", help="Slate date in YYYY-MM-DD format")
+    parser.add_argument("--interval", type=float, default=10,
+                        help="Seconds between polls")
+    parser.add_argument("--out", default=None)
+    parser.add_argument("--max-hours", type=float, default=8)
+    args = parser.parse_args()
+
+    record(args.date, args.interval, args.out or f"fixtures/{args.date}.json.gz",
+           args.max_hours)
@@ -0,0 +1,152 @@
+import json
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from clock import AcceleratedClock
+from fixtures import Fixture
+
+
+def endpoint_name(path):
+    """
+    Collapses a request path to its endpoint, e.g. "gamecenter/1/landing" ->
+    "gamecenter/landing" and "score/2025-04-03" -> "score".
+    """
+    parts = [p for p in path.split("/") if p]
+    if parts and parts[0] == "gamecenter" and len(parts) >= 3:
+        return f"gamecenter/{parts[2]}"
+    return parts[0] if parts else ""
+
+
+class ReplayServer:
+    """
+    Serves a recorded Fixture over localhost HTTP, shaped like api-web.nhle.com.
+
+    Every GET is answered with the body recorded for that path at clock.now(),
+    so pollers pointed at `base_url` see the game unfold on the clock's
+    timeline. Request counts are kept per endpoint, plus an "outage" count of
+    requests that arrived during an injected outage window.
+
+    Usage:
+        with ReplayServer(fixture, clock) as server:
+            api_utils.NHL_API = server.base_url
+    """
+
+    def __init__(self, fixture, clock, host="127.0.0.1", port=0, outages=()):
+        self.fixture = fixture
+        self.clock = clock
+        # (start, end) epoch windows during which every request gets a 503.
+        self.outages = list(outages)
+        self.requests = Counter()
+        self.bytes_sent = 0
+        self._encoded = {}
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def resolve(self, path):
+        """Maps request aliases onto recorded paths ("score/now" -> today's score)."""
+        path = path.split("?", 1)[0].strip("/")
+        if path.startswith("v1/"):
+            path = path[3:]
+        if path == "score/now":
+            return f"score/{self.fixture.date}"
+        if path == "schedule/now":
+            return f"schedule/{self.fixture.date}"
+        return path
+
+    def in_outage(self):
+        now = self.clock.now()
+        return any(start <= now < end for start, end in self.outages)
+
+    def body_for(self, path):
+        """Returns the encoded response body for a path at the current time."""
+        body = self.fixture.at(path, self.clock.now())
+        if body is None:
+            return None
+        # Bodies are immutable once recorded; encode each one only once so the
+        # server adds as little CPU as possible to the pollers being measured.
+        key = id(body)
+        encoded = self._encoded.get(key)
+        if encoded is None:
+            encoded = self._encoded[key] = json.dumps(body).encode("utf-8")
+        return encoded
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = server.resolve(self.path)
+                outage = server.in_outage()
+                body = None if outage else server.body_for(path)
+                with server._lock:
+                    server.requests[endpoint_name(path)] += 1
+                    server.requests["total"] += 1
+                    if outage:
+                        server.requests["outage"] += 1
+                    if body is not None:
+                        server.bytes_sent += len(body)
+                if outage:
+                    self.send_error(503)
+                    return
+                if body is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def reset_counters(self):
+        with self._lock:
+            self.requests.clear()
+            self.bytes_sent = 0
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(
+        description="Replay a recorded NHL slate over HTTP at accelerated speed.")
+    parser.add_argument("fixture")
+    parser.add_argument("--speed", type=float, default=60.0)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    fixture = Fixture.load(args.fixture)
+    clock = AcceleratedClock(fixture.start, args.speed)
+    with ReplayServer(fixture, clock, port=args.port) as server:
+        print(f"Replaying {args.fixture} at {args.speed}x on {server.base_url}")
+        print(f"Point the Discord bot at it with NHL_API={server.base_url}")
+        while clock.now() < fixture.end:
+            time.sleep(1)
+        print(f"Replay finished: {dict(server.requests)}")
@@ -0,0 +1,195 @@
+"""
+Builds synthetic slate fixtures so the benchmarks run without a recording.
+
+    python synthetic.py --games 8 --out fixtures/synthetic.json.gz
+
+Games follow a realistic timeline: ~35 minute periods on the wall clock,
+18 minute intermissions, random goals and a growing play-by-play. The
+documents carry the same fields as api-web.nhle.com, not the full payloads.
+"""
+import argparse
+import random
+from datetime import datetime, timedelta, timezone
+
+from fixtures import Fixture
+
+TEAMS = [
+    ("OTT", "Senators", "Ottawa"), ("TOR", "Maple Leafs", "Toronto"),
+    ("MTL", "Canadiens", "Montréal"), ("BOS", "Bruins", "Boston"),
+    ("DET", "Red Wings", "Detroit"), ("BUF", "Sabres", "Buffalo"),
+    ("TBL", "Lightning", "Tampa Bay"), ("FLA", "Panthers", "Florida"),
+    ("NYR", "Rangers", "New York"), ("NJD", "Devils", "New Jersey"),
+    ("PIT", "Penguins", "Pittsburgh"), ("PHI", "Flyers", "Philadelphia"),
+    ("WSH", "Capitals", "Washington"), ("CAR", "Hurricanes", "Carolina"),
+    ("CBJ", "Blue Jackets", "Columbus"), ("NYI", "Islanders", "New York"),
+    ("CHI", "Blackhawks", "Chicago"), ("COL", "Avalanche", "Colorado"),
+    ("DAL", "Stars", "Dallas"), ("MIN", "Wild", "Minnesota"),
+    ("NSH", "Predators", "Nashville"), ("STL", "Blues", "St. Louis"),
+    ("WPG", "Jets", "Winnipeg"), ("UTA", "Hockey Club", "Utah"),
+    ("ANA", "Ducks", "Anaheim"), ("CGY", "Flames", "Calgary"),
+    ("EDM", "Oilers", "Edmonton"), ("LAK", "Kings", "Los Angeles"),
+    ("SJS", "Sharks", "San Jose"), ("SEA", "Kraken", "Seattle"),
+    ("VAN", "Canucks", "Vancouver"), ("VGK", "Golden Knights", "Vegas"),
+]
+
+PERIOD_SECONDS = 20 * 60
+PERIOD_WALL_SECONDS = 35 * 60
+INTERMISSION_SECONDS = 18 * 60
+PREGAME_SECONDS = 30 * 60
+
+
+def _team(team, score):
+    abbrev, name, place = team
+    return {
+        "abbrev": abbrev,
+        "score": score,
+        "commonName": {"default": name},
+        "placeName": {"default": place},
+        "name": {"default": f"{place} {name}"},
+    }
+
+
+class SyntheticGame:
+    """State machine for one game, evaluated at any wall-clock time."""
+
+    def __init__(self, game_id, away, home, start, rng):
+        self.id = game_id
+        self.away = away
+        self.home = home
+        self.start = start
+        # Stoppages make every game's periods run a little differently.
+        self.period_wall = PERIOD_WALL_SECONDS + rng.uniform(-180, 300)
+        self.end = start + 3 * self.period_wall + 2 * INTERMISSION_SECONDS
+        # Goals as (wall time, team index) pairs; 0 is away, 1 is home.
+        self.goals = sorted(
+            (start + rng.uniform(0, self.end - start), rng.randint(0, 1))
+            for _ in range(rng.randint(2, 9)))
+        self.goals = [g for g in self.goals if self._phase(g[0])[0] == "LIVE"
+                      and not self._phase(g[0])[2]]
+        self.plays = []
+        for i in range(int((self.end - start) / 20)):
+            self.plays.append({
+                "eventId": i,
+                "typeDescKey": "shot-on-goal" if i % 3 else "faceoff",
+                "timeInPeriod": f"{(i * 20 // 60) % 20:02d}:{i * 20 % 60:02d}",
+                "details": {"xCoord": rng.randint(-99, 99), "yCoord": rng.randint(-42, 42)},
+            })
+
+    def _phase(self, t):
+        """Returns (gameState, period, inIntermission, secondsRemaining)."""
+        if t < self.start - PREGAME_SECONDS:
+            return "FUT", 0, False, PERIOD_SECONDS
+        if t < self.start:
+            return "PRE", 0, False, PERIOD_SECONDS
+        if t >= self.end:
+            return "OFF", 3, False, 0
+        elapsed = t - self.start
+        block = self.period_wall + INTERMISSION_SECONDS
+        period = int(elapsed // block) + 1
+        into = elapsed - (period - 1) * block
+        if into < self.period_wall:
+            played = into / self.period_wall * PERIOD_SECONDS
+            return "LIVE", period, False, int(PERIOD_SECONDS - played)
+        return "LIVE", period, True, int(block - into)
+
+    def score(self, t):
+        away = sum(1 for when, side in self.goals if when <= t and side == 0)
+        home = sum(1 for when, side in self.goals if when <= t and side == 1)
+        return away, home
+
+    def landing(self, t):
+        state, period, intermission, remaining = self._phase(t)
+        away_score, home_score = self.score(t)
+        doc = {
+            "id": self.id,
+            "season": 20242025,
+            "gameType": 2,
+            "gameState": state,
+            "gameScheduleState": "OK",
+            "startTimeUTC": datetime.fromtimestamp(self.start, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "venue": {"default": f"{self.home[2]} Arena"},
+            "awayTeam": _team(self.away, away_score),
+            "homeTeam": _team(self.home, home_score),
+        }
+        if state in ("LIVE", "OFF"):
+            doc["periodDescriptor"] = {"number": period, "periodType": "REG"}
+            doc["clock"] = {
+                "timeRemaining": f"{remaining // 60:02d}:{remaining % 60:02d}",
+                "secondsRemaining": remaining,
+                "running": state == "LIVE" and not intermission,
+                "inIntermission": intermission,
+            }
+        return doc
+
+    def play_by_play(self, t):
+        doc = self.landing(t)
+        if doc["gameState"] == "LIVE" or doc["gameState"] == "OFF":
+            count = int(min(t, self.end) - self.start) // 20
+            doc["plays"] = self.plays[:count]
+        else:
+            doc["plays"] = []
+        doc["rosterSpots"] = [{"playerId": 8470000 + i, "teamId": i % 2} for i in range(40)]
+        return doc
+
+
+def build_slate(games=8, step=10, seed=2025, start=None, stagger=30 * 60):
+    """
+    Builds a Fixture for `games` synthetic games sampled every `step` seconds.
+
+    Args:
+        games (int): Number of games in the slate. Teams repeat past 16 games.
+        step (int): Seconds between recorded samples.
+        seed (int): Random seed, so runs are reproducible.
+        start (float): Epoch seconds of the first puck drop. Defaults to 23:00 UTC today.
+        stagger (int): Seconds between consecutive puck drops.
+    """
+    rng = random.Random(seed)
+    if start is None:
+        today = datetime.now(timezone.utc).replace(hour=23, minute=0, second=0, microsecond=0)
+        start = today.timestamp()
+    date = (datetime.fromtimestamp(start, timezone.utc) - timedelta(hours=5)).strftime("%Y-%m-%d")
+
+    teams = TEAMS[:]
+    rng.shuffle(teams)
+    slate = []
+    for i in range(games):
+        away, home = teams[(2 * i) % len(teams)], teams[(2 * i + 1) % len(teams)]
+        slate.append(SyntheticGame(2024020000 + i + 1, away, home,
+                                   start + (i % 4) * stagger, rng))
+
+    first = min(g.start for g in slate) - PREGAME_SECONDS - 60
+    last = max(g.end for g in slate) + 120
+    fixture = Fixture(date, first, last)
+
+    t = first
+    while t <= last:
+        landings = [g.landing(t) for g in slate]
+        fixture.add(f"score/{date}", t, {
+            "currentDate": date,
+            "games": [{k: doc[k] for k in ("id", "gameType", "gameState", "startTimeUTC",
+                                            "awayTeam", "homeTeam", "periodDescriptor", "clock")
+                       if k in doc} for doc in landings],
+        })
+        fixture.add(f"schedule/{date}", t, {
+            "gameWeek": [{"date": date, "games": landings}],
+        })
+        for game, doc in zip(slate, landings):
+            fixture.add(f"gamecenter/{game.id}/landing", t, doc)
+            # Play-by-play is large; like the real feed, refresh it once a minute.
+            if doc["gameState"] in ("LIVE", "OFF") and (t - first) % 60 < step:
+                fixture.add(f"gamecenter/{game.id}/play-by-play", t, game.play_by_play(t))
+        t += step
+    return fixture
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=8)
+    parser.add_argument("--step", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--out", default="fixtures/synthetic.json.gz")
+    args = parser.parse_args()
+
+    fixture = build_slate(args.games, args.step, args.seed)
+    fixture.save(args.out)
+    print(f"Wrote {len(fixture.game_ids())} game(s) to {args.out}")
@@ -1,20 +1,20 @@
 import logging
-from datetime import timedelta, datetime
-import async_timeout
-import asyncio
+from datetime import timedelta
 
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.const import CONF_SCAN_INTERVAL
 from homeassistant.helpers.event import async_track_state_change_event
 
 from .const import DOMAIN
-from .api_client import NHLAPIClient
+from .coordinator import DATE_SELECTOR_ENTITY_ID, NHLDataUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
-DATE_SELECTOR_ENTITY_ID = "input_datetime.nhl_game_date_selector"
+METRICS_VIEW_REGISTERED = f"{DOMAIN}_metrics_view"
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):  # Pass hass
@@ -30,6 +30,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):  # Pass ha
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
 
+    if not hass.data.get(METRICS_VIEW_REGISTERED):
+        hass.http.register_view(NHLMetricsView)
+        hass.data[METRICS_VIEW_REGISTERED] = True
+
     hass.async_create_task(
         hass.config_entries.async_forward_entry_setup(
             hass, entry, "sensor")  # Pass hass
@@ -50,7 +54,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):  # Pass ha
         )
     )
 
-    entry.add_update_listener(async_reload_entry)
+    # Reload on options changes, e.g. a new set of followed teams
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     return True
 
@@ -59,7 +64,10 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_forward_entry_unload(entry, "sensor")
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator.ticker.async_stop()
+        coordinator.async_cancel_calendar_load()
+        await coordinator.api_client.async_close()
     return unload_ok
 
 
@@ -68,63 +76,16 @@ async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry):
     await hass.config_entries.async_reload(entry.entry_id)
 
 
-class NHLDataUpdateCoordinator(DataUpdateCoordinator):
-    """Manages fetching NHL schedule data."""
+class NHLMetricsView(HomeAssistantView):
+    """Serve the API client metrics of every entry as Prometheus text."""
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, update_interval: timedelta):  # Pass hass
-        """Initialize data updater."""
-        self.hass = hass
-        self.entry = entry
-        self.api_client = NHLAPIClient(hass)
-        self.tracked_games = {}
+    url = "/api/nhl_tracker/metrics"
+    name = "api:nhl_tracker:metrics"
 
-        super().__init__(
-            hass,
-            _LOGGER,
-            name=entry.title,
-            update_interval=update_interval,
+    async def get(self, request):
+        hass = request.app["hass"]
+        body = "".join(
+            coordinator.api_client.metrics.render_prometheus({"entry": entry_id})
+            for entry_id, coordinator in hass.data.get(DOMAIN, {}).items()
         )
-
-    async def _async_update_data(self):
-        """Fetch daily NHL schedule data."""
-        try:
-            async with async_timeout.timeout(30):
-                date_state = self.hass.states.get(DATE_SELECTOR_ENTITY_ID)
-                if not date_state or date_state.state == "unknown":
-                    _LOGGER.warning(
-                        f"Date selector {DATE_SELECTOR_ENTITY_ID} not available or unknown, defaulting to today.")
-                    target_date = self.hass.config.time_zone.localize(
-                        datetime.now()).date()
-                else:
-                    try:
-                        target_date = datetime.strptime(
-                            date_state.state, "%Y-%m-%d").date()
-                    except ValueError:
-                        _LOGGER.error(
-                            f"Invalid date format from {DATE_SELECTOR_ENTITY_ID}: {date_state.state}, defaulting to today.")
-                        target_date = self.hass.config.time_zone.localize(
-                            datetime.now()).date()
-
-                target_date_str = target_date.strftime("%Y-%m-%d")
-                _LOGGER.info(
-                    f"Fetching NHL schedule for date: {target_date_str}")
-
-                schedule_data = await self.api_client.get_schedule(target_date_str)
-
-                games_for_day = {}
-                if schedule_data and schedule_data.get("dates"):
-                    for date_entry in schedule_data["dates"]:
-                        if date_entry.get("date") == target_date_str:
-                            for game in date_entry.get("games", []):
-                                game_id = game["gamePk"]
-                                games_for_day[game_id] = game
-
-                if not games_for_day:
-                    _LOGGER.info(f"No NHL games found for {target_date_str}.")
-
-                return games_for_day
-
-        except Exception as err:
-            _LOGGER.exception("Unexpected error during NHL data update")
-            raise UpdateFailed(
-                f"Unexpected error updating daily NHL schedule: {err}") from err
+        return web.Response(text=body, content_type="text/plain")
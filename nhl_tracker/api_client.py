@@ -1,46 +1,240 @@
 import logging
-from nhlpy import NHLClient  # Import the NHLClient
+import threading
+import time
+import aiohttp
+import async_timeout
+
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import NHL_API_BASE_URL, REQUEST_TIMEOUT_SECONDS
+from .decoding import decode_game_details, decode_json, decode_scores
+from .metrics import Metrics
+from .resilience import CircuitBreaker, CircuitOpenError
+from .single_flight import SingleFlight
 
 _LOGGER = logging.getLogger(__name__)
 
+# Past this many breakers, idle ones (closed, no failures) are dropped.
+MAX_BREAKERS = 64
+
 
 class NHLAPIClient:
     """Client for fetching NHL data using nhl-api-py."""
 
-    def __init__(self, hass):
-        """Initialize the client."""
+    def __init__(self, hass, daemon_url: str | None = None):
+        """
+        Initialize the client. With daemon_url (http://host:port or
+        unix:///path.sock), every request goes to a local nhl_fetchd instead.
+        """
         self.hass = hass
-        # Initialize NHLClient. nhlpy handles the underlying HTTP client.
-        # You might consider making verbose configurable if you want detailed logs from nhlpy
-        self._nhl_client = NHLClient(timeout=10, verbose=False)
+        self.daemon_url = daemon_url
+        self._unix_socket = None
+        self._own_session = None
+        if daemon_url and daemon_url.startswith("unix://"):
+            self._unix_socket = daemon_url[len("unix://"):]
+            self.base_url = "http://localhost/v1"
+        elif daemon_url:
+            self.base_url = f"{daemon_url.rstrip('/')}/v1"
+        else:
+            self.base_url = NHL_API_BASE_URL
+        # nhlpy (and its HTTP stack) is imported and its client built on the
+        # first request, in the executor, so loading the integration stays cheap.
+        self._nhl_client_instance = None
+        self._nhl_client_lock = threading.Lock()
+        self.metrics = Metrics()
+        self._single_flight = SingleFlight()
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    @property
+    def _nhl_client(self):
+        """The nhlpy client, created on first use. Call from the executor only."""
+        if self._nhl_client_instance is None:
+            with self._nhl_client_lock:
+                if self._nhl_client_instance is None:
+                    from nhlpy import NHLClient
+
+                    # You might consider making verbose configurable if you want detailed logs from nhlpy
+                    self._nhl_client_instance = NHLClient(
+                        timeout=REQUEST_TIMEOUT_SECONDS, verbose=False)
+        return self._nhl_client_instance
+
+    def breaker(self, name: str) -> CircuitBreaker:
+        """
+        Return the circuit breaker shared by every caller of an endpoint (or of
+        one game's feed, see get_game_details).
+        """
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            if len(self._breakers) >= MAX_BREAKERS:
+                # A closed breaker with no failures holds nothing a new one wouldn't.
+                for idle in [n for n, b in self._breakers.items()
+                             if b.state == CircuitBreaker.CLOSED and not b.failures]:
+                    del self._breakers[idle]
+            breaker = self._breakers[name] = CircuitBreaker(name)
+        return breaker
+
+    async def _async_shared(self, endpoint: str, key: tuple, fetch, *args, breaker: str | None = None):
+        """
+        Run fetch(*args), sharing the request with any concurrent caller for the
+        same key (coordinator refresh, date selector refresh and live polls
+        often land together). The call goes through the `breaker` circuit,
+        the endpoint's by default.
+        """
+        if self._single_flight.is_in_flight(key):
+            self.metrics.record_cache_hit(endpoint)
+        return await self._single_flight.do(key, self._async_guarded, breaker or endpoint, fetch, *args)
+
+    async def _async_guarded(self, breaker: str, fetch, *args):
+        """Run fetch(*args) behind the named circuit breaker."""
+        try:
+            with self.breaker(breaker):
+                return await fetch(*args)
+        except CircuitOpenError:
+            self.metrics.increment("circuit_rejections")
+            raise
+
+    async def _async_fetch(self, endpoint: str, method: str, *args, breaker: str | None = None):
+        """Call an nhlpy client method, coalesced per endpoint and arguments."""
+        return await self._async_shared(
+            endpoint, (endpoint, *args), self._async_fetch_upstream, endpoint, method, *args,
+            breaker=breaker)
+
+    async def _async_fetch_upstream(self, endpoint: str, method: str, *args):
+        """Run a blocking nhlpy call in the executor and record its timings."""
+        submitted = time.monotonic()
+        started = None
+
+        def _job():
+            nonlocal started
+            started = time.monotonic()
+            return getattr(self._nhl_client, method)(*args)
+
+        try:
+            # nhlpy enforces its own timeout; this bounds the executor queue wait too.
+            async with async_timeout.timeout(REQUEST_TIMEOUT_SECONDS * 2):
+                result = await self.hass.async_add_executor_job(_job)
+        except Exception:
+            self.metrics.record_request(
+                endpoint, time.monotonic() - (started or submitted), ok=False)
+            raise
+        finally:
+            if started is not None:
+                self.metrics.record_queue_wait(started - submitted)
+
+        self.metrics.record_request(endpoint, time.monotonic() - started)
+        return result
+
+    def session(self) -> aiohttp.ClientSession:
+        """The HTTP session for base_url; a Unix socket daemon gets one of its own."""
+        if self._unix_socket is None:
+            return async_get_clientsession(self.hass)
+        if self._own_session is None or self._own_session.closed:
+            self._own_session = aiohttp.ClientSession(
+                connector=aiohttp.UnixConnector(path=self._unix_socket))
+        return self._own_session
+
+    async def async_check_daemon(self) -> None:
+        """GET the fetch daemon's /stats; raises if it doesn't answer with 200."""
+        async with self.session().get(f"{self.base_url.removesuffix('/v1')}/stats",
+                                      timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SECONDS)) as response:
+            response.raise_for_status()
+
+    async def async_close(self) -> None:
+        """Close the Unix socket session, if one was opened."""
+        if self._own_session is not None:
+            await self._own_session.close()
+            self._own_session = None
 
     async def get_schedule(self, date_str: str):
         """Fetch the daily NHL schedule."""
         try:
+            if self.daemon_url:
+                return await self._async_shared(
+                    "schedule", ("schedule", date_str), self._async_get_json, "schedule", f"schedule/{date_str}")
             # nhlpy's schedule endpoint takes a datetime object or date string
             # It returns the raw JSON structure from the NHL API.
-            schedule_data = await self.hass.async_add_executor_job(
-                self._nhl_client.schedule, date_str
+            schedule_data = await self._async_fetch(
+                "schedule", "schedule", date_str
             )
             return schedule_data
+        except CircuitOpenError as err:
+            _LOGGER.debug(f"Skipping NHL schedule fetch for {date_str}: {err}")
+            raise
         except Exception as err:
             _LOGGER.error(
                 f"Error fetching NHL schedule for {date_str} using nhlpyr: {err}")
             raise  # Re-raise to be caught by DataUpdateCoordinator
 
     async def get_game_details(self, game_id: int):
-        """Fetch detailed live data for a specific game."""
+        """
+        Fetch detailed live data for a specific game. Each game has its own
+        breaker, so one game's feed failing doesn't stop every other game's.
+        """
+        breaker = f"game_feed:{game_id}"
         try:
+            if self.daemon_url:
+                return await self._async_shared(
+                    "game_feed", ("game_feed", game_id), self._async_get_json,
+                    "game_feed", f"gamecenter/{game_id}/landing", decode_game_details,
+                    breaker=breaker)
             # nhlpy's game_feed endpoint takes the gamePk
-            game_details_data = await self.hass.async_add_executor_job(
-                self._nhl_client.game_feed, game_id
+            game_details_data = await self._async_fetch(
+                "game_feed", "game_feed", game_id, breaker=breaker
             )
             return game_details_data
+        except CircuitOpenError as err:
+            _LOGGER.debug(f"Skipping game details fetch for {game_id}: {err}")
+            raise
         except Exception as err:
             _LOGGER.error(
                 f"Error fetching game details for {game_id} using nhlpy: {err}")
             raise  # Re-raise to be caught by DataUpdateCoordinator
 
+    async def get_scores(self, date_str: str = "now"):
+        """
+        Fetch score, period and clock for every game of a day in one request.
+        date_str is YYYY-MM-DD or "now" for the NHL's current day.
+        """
+        try:
+            return await self._async_shared(
+                "score", ("score", date_str), self._async_get_json, "score", f"score/{date_str}", decode_scores)
+        except CircuitOpenError as err:
+            _LOGGER.debug(f"Skipping NHL scores fetch for {date_str}: {err}")
+            raise
+        except Exception as err:
+            _LOGGER.error(f"Error fetching NHL scores for {date_str}: {err}")
+            raise
+
+    async def get_team_season(self, team: str, season: str = "now"):
+        """
+        Fetch every game of a team's season (club-schedule-season). The games
+        array has the same shape as /score's, so it uses the same decoder.
+        """
+        try:
+            return await self._async_shared(
+                "club_schedule_season", ("club_schedule_season", team, season), self._async_get_json,
+                "club_schedule_season", f"club-schedule-season/{team}/{season}", decode_scores)
+        except CircuitOpenError as err:
+            _LOGGER.debug(f"Skipping NHL season schedule fetch for {team}: {err}")
+            raise
+        except Exception as err:
+            _LOGGER.error(f"Error fetching NHL season schedule for {team}: {err}")
+            raise
+
+    async def _async_get_json(self, endpoint: str, path: str, decode=decode_json):
+        """
+        GET an api-web.nhle.com path (through the daemon if configured). `decode`
+        turns the raw body into the returned object, see decoding.py for
+        selective decoders.
+        """
+        session = self.session()
+        with self.metrics.track(endpoint) as call:
+            async with session.get(f"{self.base_url}/{path}", timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SECONDS)) as response:
+                response.raise_for_status()
+                body = await response.read()
+                call["bytes"] = len(body)
+        return decode(body)
+
     # Add other nhlpy methods if needed, e.g., get_team_roster, get_standings etc.
     # Check nhlpy documentation for available methods.
     # Example:
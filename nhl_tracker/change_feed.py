@@ -0,0 +1,102 @@
+"""
+Tails the game_changes log that the bot's database writes alongside every
+game update (see DB/migrations/20251020_create_game_changes.sql).
+
+One ingester writes the games table; any number of consumers follow the log
+with a cursor instead of polling the NHL API themselves. Named consumers keep
+their cursor in change_cursors, so they resume where they left off; unnamed
+ones open the database read-only and start at the end of the log.
+"""
+import asyncio
+import sqlite3
+
+
+class ChangeFeed:
+    """Reads game_changes rows past a cursor, in seq order."""
+
+    def __init__(self, path: str, consumer: str | None = None):
+        self.path = path
+        self.consumer = consumer
+        self.cursor = None
+        self._conn = None
+        self._data_version = None
+
+    def _connect(self):
+        if self._conn is None:
+            mode = "rw" if self.consumer else "ro"
+            # Executor jobs may run on any thread; only one uses the connection at a time.
+            self._conn = sqlite3.connect(f"file:{self.path}?mode={mode}", uri=True, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            if self.cursor is None:
+                self.cursor = self._load_cursor()
+        return self._conn
+
+    def _load_cursor(self) -> int:
+        if self.consumer:
+            row = self._conn.execute(
+                "SELECT seq FROM change_cursors WHERE consumer = ?;", (self.consumer,)).fetchone()
+            if row:
+                return row[0]
+        # New consumers start at the end of the log rather than replaying history.
+        return self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM game_changes;").fetchone()[0]
+
+    def poll(self, limit: int = 500) -> list[dict]:
+        """Changes after the cursor, oldest first. Blocking, but cheap when nothing changed."""
+        conn = self._connect()
+        # data_version only moves when another connection commits, so an idle
+        # database costs one pragma per poll and no query.
+        version = conn.execute("PRAGMA data_version;").fetchone()[0]
+        if version == self._data_version:
+            return []
+        rows = conn.execute(
+            "SELECT * FROM game_changes WHERE seq > ? ORDER BY seq LIMIT ?;", (self.cursor, limit)).fetchall()
+        if len(rows) < limit:
+            self._data_version = version
+        return [dict(row) for row in rows]
+
+    def ack(self, seq: int) -> None:
+        """Move the cursor past seq, persisting it for named consumers."""
+        self.cursor = seq
+        if self.consumer:
+            with self._conn:
+                self._conn.execute("""
+                    INSERT INTO change_cursors (consumer, seq) VALUES (?, ?)
+                    ON CONFLICT (consumer) DO UPDATE SET seq = excluded.seq, updated_at = CURRENT_TIMESTAMP;
+                    """, (self.consumer, seq))
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    async def tail(self, interval: float = 0.25):
+        """
+        Yields changes as they are committed. A change is acknowledged once the
+        consumer asks for the next one, so a crash redelivers it (at least once).
+        """
+        while True:
+            changes = self.poll()
+            for change in changes:
+                yield change
+                self.ack(change["seq"])
+            if not changes:
+                await asyncio.sleep(interval)
+
+
+def as_score_entry(change: dict) -> dict:
+    """
+    A game_changes row in the shape of a /score game entry, for GameSnapshot.apply.
+    The log has no period type, so periodDescriptor carries only the number.
+    """
+    seconds = change["seconds_remaining"]
+    clock = {"inIntermission": bool(change["in_intermission"]), "secondsRemaining": seconds}
+    if seconds is not None:
+        clock["timeRemaining"] = f"{seconds // 60:02d}:{seconds % 60:02d}"
+    return {
+        "id": change["game_id"],
+        "gameState": change["game_state"],
+        "awayTeam": {"abbrev": change["away_abbrv"], "score": change["away_score"]},
+        "homeTeam": {"abbrev": change["home_abbrv"], "score": change["home_score"]},
+        "periodDescriptor": {"number": change["period"]},
+        "clock": clock,
+    }
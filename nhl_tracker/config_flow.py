@@ -1,12 +1,17 @@
 import logging
+import os
+from urllib.parse import urlparse
+
 import voluptuous as vol # Used for schema validation
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_NAME # We'll still use CONF_NAME for the instance title
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import selector # Used for UI selectors in the schema
 
-from .const import DOMAIN # Import your integration's domain
+from .api_client import NHLAPIClient
+from .const import CONF_DATABASE_FILE, CONF_FETCH_DAEMON_URL, CONF_TEAMS, DOMAIN, NHL_TEAMS # Import your integration's domain
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -64,6 +69,91 @@ class NHLTrackerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             }
         )
 
-    # Since there are no options to configure via the UI, you don't need a separate OptionsFlow class.
-    # The async_get_options_flow method from __init__.py can also be removed if there are truly no options.
-    # However, if you previously had one and don't remove the reference, it won't break things if the class is gone.
\ No newline at end of file
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Get the options flow for this handler."""
+        return NHLTrackerOptionsFlow(config_entry)
+
+
+class NHLTrackerOptionsFlow(config_entries.OptionsFlow):
+    """Choose which teams' games become entities."""
+
+    def __init__(self, config_entry):
+        """Initialize options flow."""
+        self.config_entry = config_entry
+
+    async def _async_validate(self, user_input) -> dict:
+        """Check the database file is readable and the fetch daemon answers; returns the errors."""
+        errors = {}
+        database_file = user_input.get(CONF_DATABASE_FILE)
+        if database_file and not await self.hass.async_add_executor_job(
+                lambda: os.path.isfile(database_file) and os.access(database_file, os.R_OK)):
+            errors[CONF_DATABASE_FILE] = "database_not_readable"
+
+        daemon_url = user_input.get(CONF_FETCH_DAEMON_URL)
+        if daemon_url:
+            url = urlparse(daemon_url)
+            if not (url.scheme in ("http", "https") and url.hostname or url.scheme == "unix" and url.path):
+                errors[CONF_FETCH_DAEMON_URL] = "invalid_daemon_url"
+            else:
+                client = NHLAPIClient(self.hass, daemon_url)
+                try:
+                    await client.async_check_daemon()
+                except Exception as err:
+                    _LOGGER.debug(f"Fetch daemon {daemon_url} didn't answer: {err}")
+                    errors[CONF_FETCH_DAEMON_URL] = "daemon_unreachable"
+                finally:
+                    await client.async_close()
+        return errors
+
+    async def async_step_init(self, user_input=None) -> FlowResult:
+        """Manage the followed teams."""
+        errors = {}
+        if user_input is not None:
+            errors = await self._async_validate(user_input)
+            if not errors:
+                # Saving the options reloads the entry, so the coordinator picks up the new filter.
+                return self.async_create_entry(title="", data=user_input)
+
+        # A rejected form is shown again with what was typed.
+        values = user_input or self.config_entry.options
+        data_schema = vol.Schema({
+            vol.Optional(
+                CONF_TEAMS,
+                default=values.get(CONF_TEAMS, []),
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=[
+                        selector.SelectOptionDict(value=abbrev, label=name)
+                        for abbrev, name in sorted(NHL_TEAMS.items(), key=lambda team: team[1])
+                    ],
+                    multiple=True,
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                )
+            ),
+            vol.Optional(
+                CONF_DATABASE_FILE,
+                default=values.get(CONF_DATABASE_FILE, ""),
+            ): selector.TextSelector(
+                selector.TextSelectorConfig(type=selector.TextSelectorType.TEXT),
+            ),
+            vol.Optional(
+                CONF_FETCH_DAEMON_URL,
+                default=values.get(CONF_FETCH_DAEMON_URL, ""),
+            ): selector.TextSelector(
+                selector.TextSelectorConfig(type=selector.TextSelectorType.TEXT),
+            ),
+        })
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=data_schema,
+            errors=errors,
+            description_placeholders={
+                "note": "Leave the teams empty to follow every game in the league. "
+                        "Set the database file to the Discord bot's SQLite database to add standings sensors. "
+                        "Set the fetch daemon to http://127.0.0.1:8765 or unix:///path.sock to share "
+                        "one nhl_fetchd with the bot instead of calling the NHL API directly.",
+            },
+        )
@@ -1,3 +1,69 @@
 DOMAIN = "nhl_tracker"
 # New constant for live game polling interval (e.g., every 15 seconds)
 LIVE_GAME_POLL_INTERVAL_SECONDS = 30
+# Root of the NHL web API, used for endpoints nhlpy doesn't wrap
+NHL_API_BASE_URL = "https://api-web.nhle.com/v1"
+# "ticker" polls /score/now once per interval for every LIVE game,
+# "per_game" polls each game's feed separately
+LIVE_POLLING_MODE = "ticker"
+# Upper bound on a single NHL API request
+REQUEST_TIMEOUT_SECONDS = 10
+# Options key for the followed teams; empty means every game in the league
+CONF_TEAMS = "teams"
+# Team abbreviations offered in the options flow, as used by the NHL API
+NHL_TEAMS = {
+    "ANA": "Anaheim Ducks",
+    "BOS": "Boston Bruins",
+    "BUF": "Buffalo Sabres",
+    "CAR": "Carolina Hurricanes",
+    "CBJ": "Columbus Blue Jackets",
+    "CGY": "Calgary Flames",
+    "CHI": "Chicago Blackhawks",
+    "COL": "Colorado Avalanche",
+    "DAL": "Dallas Stars",
+    "DET": "Detroit Red Wings",
+    "EDM": "Edmonton Oilers",
+    "FLA": "Florida Panthers",
+    "LAK": "Los Angeles Kings",
+    "MIN": "Minnesota Wild",
+    "MTL": "Montréal Canadiens",
+    "NJD": "New Jersey Devils",
+    "NSH": "Nashville Predators",
+    "NYI": "New York Islanders",
+    "NYR": "New York Rangers",
+    "OTT": "Ottawa Senators",
+    "PHI": "Philadelphia Flyers",
+    "PIT": "Pittsburgh Penguins",
+    "SEA": "Seattle Kraken",
+    "SJS": "San Jose Sharks",
+    "STL": "St. Louis Blues",
+    "TBL": "Tampa Bay Lightning",
+    "TOR": "Toronto Maple Leafs",
+    "UTA": "Utah Hockey Club",
+    "VAN": "Vancouver Canucks",
+    "VGK": "Vegas Golden Knights",
+    "WPG": "Winnipeg Jets",
+    "WSH": "Washington Capitals",
+}
+# Event bus types fired on game transitions, see events.py
+EVENT_GOAL = f"{DOMAIN}_goal"
+EVENT_GOAL_DISALLOWED = f"{DOMAIN}_goal_disallowed"
+EVENT_PERIOD_START = f"{DOMAIN}_period_start"
+EVENT_PERIOD_END = f"{DOMAIN}_period_end"
+EVENT_INTERMISSION = f"{DOMAIN}_intermission"
+EVENT_FINAL = f"{DOMAIN}_final"
+# How often the full season calendar is reloaded; daily schedule fetches update it in between
+CALENDAR_REFRESH_INTERVAL_SECONDS = 24 * 60 * 60
+# Options key for the bot's SQLite database (DB/db_utils.py); standings sensors are added when set
+CONF_DATABASE_FILE = "database_file"
+# Options key that follows live games through the bot database's change log instead of
+# /score/now. Off unless set: nothing fills the log until the bot runs an ingester
+# (DB/db_utils.update_games_from_objects), so the options flow doesn't offer it yet.
+CONF_CHANGE_FEED = "change_feed"
+# How often the bot database's change log is checked when it replaces the league ticker
+CHANGE_FEED_POLL_INTERVAL_SECONDS = 0.5
+# A live game the change log has said nothing about for this long is fetched from the API instead
+CHANGE_FEED_STALE_SECONDS = 2 * LIVE_GAME_POLL_INTERVAL_SECONDS
+# Options key for a local nhl_fetchd (Daemon/nhl_fetchd.py), http://host:port or unix:///path.sock;
+# when set, every request and live update goes through it instead of the NHL API
+CONF_FETCH_DAEMON_URL = "fetch_daemon_url"
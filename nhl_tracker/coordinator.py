@@ -0,0 +1,182 @@
+import logging
+import time
+from datetime import timedelta, datetime
+import async_timeout
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .api_client import NHLAPIClient
+from .const import (
+    CALENDAR_REFRESH_INTERVAL_SECONDS,
+    CONF_CHANGE_FEED,
+    CONF_DATABASE_FILE,
+    CONF_FETCH_DAEMON_URL,
+    CONF_TEAMS,
+)
+from .season_calendar import SeasonCalendar, schedule_days, schedule_game_id, season_for, team_abbrevs
+from .standings import read_team_aggregates
+from .ticker import NHLChangeFeedTicker, NHLDaemonTicker, NHLLeagueTicker
+
+_LOGGER = logging.getLogger(__name__)
+
+DATE_SELECTOR_ENTITY_ID = "input_datetime.nhl_game_date_selector"
+
+
+class NHLDataUpdateCoordinator(DataUpdateCoordinator):
+    """Manages fetching NHL schedule data."""
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, update_interval: timedelta):  # Pass hass
+        """Initialize data updater."""
+        self.hass = hass
+        self.entry = entry
+        self.api_client = NHLAPIClient(hass, entry.options.get(CONF_FETCH_DAEMON_URL) or None)
+        self.tracked_games = {}
+        # Abbreviations of the teams chosen in the options flow; empty follows every game
+        self.followed_teams = frozenset(entry.options.get(CONF_TEAMS, ()))
+        # game_id -> GameSnapshot, the slim per-game state the sensors expose
+        self.snapshots = {}
+        # Season schedule per team, for next-game lookups without the network
+        self.calendar = SeasonCalendar()
+        self._calendar_loaded_at = None
+        self._calendar_task = None
+        # Bot database with the standings aggregates, and the followed teams' rows read from it
+        self.database_file = entry.options.get(CONF_DATABASE_FILE) or None
+        self.standings = {}
+        # Live games are pushed by the fetch daemon, or polled from /score/now; the bot's
+        # change log replaces the latter only when asked for, as the database alone doesn't fill it.
+        if self.api_client.daemon_url:
+            self.ticker = NHLDaemonTicker(hass, self.api_client)
+        elif self.database_file and entry.options.get(CONF_CHANGE_FEED):
+            self.ticker = NHLChangeFeedTicker(hass, self.api_client, self.database_file)
+        else:
+            self.ticker = NHLLeagueTicker(hass, self.api_client)
+
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=entry.title,
+            update_interval=update_interval,
+        )
+
+    @property
+    def calendar_teams(self):
+        """
+        Teams whose season is kept in the calendar: the followed ones. With none
+        followed, no sensor reads the calendar, so no season is loaded.
+        """
+        return self.followed_teams
+
+    @callback
+    def _async_schedule_calendar_load(self) -> None:
+        """Load, in the background, the seasons that are missing or due for a daily reload."""
+        if self._calendar_task and not self._calendar_task.done():
+            return
+        if self._calendar_loaded_at is None or (
+                time.monotonic() - self._calendar_loaded_at >= CALENDAR_REFRESH_INTERVAL_SECONDS):
+            teams = self.calendar_teams
+            self._calendar_loaded_at = time.monotonic()
+        else:
+            # Teams whose season failed to load last time.
+            teams = self.calendar_teams - self.calendar.loaded_teams
+        if teams:
+            self._calendar_task = self.hass.async_create_task(self._async_load_calendar(teams))
+
+    @callback
+    def async_cancel_calendar_load(self) -> None:
+        """Cancel a season load still running, on unload."""
+        if self._calendar_task and not self._calendar_task.done():
+            self._calendar_task.cancel()
+        self._calendar_task = None
+
+    async def _async_load_calendar(self, teams) -> None:
+        """Ingest the given teams' season schedules, one request per team."""
+        changed = 0
+        for team in sorted(teams):
+            try:
+                season = await self.api_client.get_team_season(team)
+            except Exception as err:
+                # Retried on the next refresh; other teams can still load.
+                _LOGGER.debug(f"Season schedule for {team} not loaded: {err}")
+                continue
+            changed += self.calendar.ingest_team_season(team, season)
+
+        _LOGGER.debug(f"Season calendar updated for {len(teams)} teams, {changed} games changed, "
+                      f"{len(self.calendar)} games total")
+        self.async_update_listeners()
+
+    async def _async_refresh_standings(self, target_date) -> None:
+        """Re-read the followed teams' aggregates; they're only a few indexed rows."""
+        opponents = {}
+        for team in self.followed_teams:
+            game = self.calendar.next_game(team)
+            if game:
+                opponents[team] = game["opponent"]
+        try:
+            self.standings = await self.hass.async_add_executor_job(
+                read_team_aggregates, self.database_file, self.followed_teams, opponents, season_for(target_date))
+        except Exception as err:
+            # Keep the last good rows; the schedule refresh itself succeeded.
+            _LOGGER.warning(f"Could not read standings from {self.database_file}: {err}")
+
+    async def _async_update_data(self):
+        """Fetch daily NHL schedule data."""
+        try:
+            async with async_timeout.timeout(30):
+                date_state = self.hass.states.get(DATE_SELECTOR_ENTITY_ID)
+                if not date_state or date_state.state == "unknown":
+                    _LOGGER.warning(
+                        f"Date selector {DATE_SELECTOR_ENTITY_ID} not available or unknown, defaulting to today.")
+                    target_date = self.hass.config.time_zone.localize(
+                        datetime.now()).date()
+                else:
+                    try:
+                        target_date = datetime.strptime(
+                            date_state.state, "%Y-%m-%d").date()
+                    except ValueError:
+                        _LOGGER.error(
+                            f"Invalid date format from {DATE_SELECTOR_ENTITY_ID}: {date_state.state}, defaulting to today.")
+                        target_date = self.hass.config.time_zone.localize(
+                            datetime.now()).date()
+
+                target_date_str = target_date.strftime("%Y-%m-%d")
+                _LOGGER.info(
+                    f"Fetching NHL schedule for date: {target_date_str}")
+
+                schedule_data = await self.api_client.get_schedule(target_date_str)
+
+                # nhlpy returns statsapi-shaped schedules ("dates"/"gamePk"), the
+                # fetch daemon api-web ones ("gameWeek"/"id"); both are read here.
+                games_for_day = {}
+                scheduled = []
+                for day, games in schedule_days(schedule_data):
+                    scheduled.extend(games)
+                    if day != target_date_str:
+                        continue
+                    for game in games:
+                        # Unfollowed games are dropped here, before any sensor or poller exists for them.
+                        # A game whose teams can't be named is kept rather than guessed away.
+                        teams = team_abbrevs(game)
+                        if self.followed_teams and None not in teams and self.followed_teams.isdisjoint(teams):
+                            continue
+                        games_for_day[schedule_game_id(game)] = game
+
+                # Keep the calendar current (postponements, new start times) from what we fetched anyway.
+                self.calendar.ingest(scheduled)
+                self._async_schedule_calendar_load()
+
+                if self.database_file and self.followed_teams:
+                    await self._async_refresh_standings(target_date)
+
+                if not games_for_day:
+                    _LOGGER.info(f"No NHL games found for {target_date_str}.")
+                    if self.followed_teams:
+                        _LOGGER.info(f"Following only: {', '.join(sorted(self.followed_teams))}")
+
+                return games_for_day
+
+        except Exception as err:
+            _LOGGER.exception("Unexpected error during NHL data update")
+            raise UpdateFailed(
+                f"Unexpected error updating daily NHL schedule: {err}") from err
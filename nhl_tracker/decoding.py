@@ -0,0 +1,175 @@
+"""
+Selective decoding of NHL API payloads.
+
+Landing and play-by-play documents are mostly large arrays (plays, rosters,
+scoring summaries) that the trackers never read. With msgspec installed the
+documents are decoded against typed structs that declare only the fields we
+use, so everything else is skipped by the parser without building Python
+objects. Otherwise orjson (or the stdlib json module) decodes the whole
+document and the same fields are projected out of it.
+
+Either way the result is a plain dict with the NHL API's own key names,
+containing only the selected fields.
+
+Shared with the bot: Discord/decoding.py is a link to this file, as the
+integration is installed on its own (bench/check_shared.py checks).
+"""
+import json
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def decode_json(body: bytes):
+    """Decode a whole JSON document with the fastest decoder available."""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+# Field selections, as {key: None} for scalars or {key: {...}} for objects.
+# Only objects (not arrays) are projected; arrays are kept or dropped whole.
+TEAM_FIELDS = {"id": None, "abbrev": None, "score": None,
+               "commonName": None, "placeName": None, "name": None}
+GAME_FIELDS = {
+    "id": None,
+    "season": None,
+    "gameType": None,
+    "gameState": None,
+    "gameScheduleState": None,
+    "startTimeUTC": None,
+    "venue": None,
+    "awayTeam": TEAM_FIELDS,
+    "homeTeam": TEAM_FIELDS,
+    "periodDescriptor": {"number": None, "periodType": None},
+    "clock": {"timeRemaining": None, "secondsRemaining": None,
+              "running": None, "inIntermission": None},
+}
+# Everything GameSnapshot reads from a landing document, for the one-off
+# fetches after a game ends: winners, recaps, broadcasts and series status
+# aren't on /score.
+GAME_DETAIL_FIELDS = {
+    **GAME_FIELDS,
+    "easternUTCOffset": None,
+    "venueUTCOffset": None,
+    "venueTimezone": None,
+    "gameCenterLink": None,
+    "seriesUrl": None,
+    "threeMinRecap": None,
+    "condensedGame": None,
+    "winningGoalie": None,
+    "winningGoalScorer": None,
+    "seriesStatus": None,
+    "tvBroadcasts": None,
+}
+SCORES_FIELDS = {"currentDate": None, "games": GAME_FIELDS}
+
+
+def project(doc, selection: dict):
+    """Keep only the selected fields of a decoded document (lists are mapped)."""
+    if isinstance(doc, list):
+        return [project(item, selection) for item in doc]
+    result = {}
+    for key, sub_selection in selection.items():
+        if key in doc:
+            value = doc[key]
+            if sub_selection is not None and isinstance(value, (dict, list)):
+                value = project(value, sub_selection)
+            result[key] = value
+    return result
+
+
+if msgspec is not None:
+    class _Localized(msgspec.Struct, omit_defaults=True):
+        default: str | None = None
+
+    class _Team(msgspec.Struct, omit_defaults=True):
+        id: int | None = None
+        abbrev: str | None = None
+        score: int | None = None
+        commonName: _Localized | None = None
+        placeName: _Localized | None = None
+        name: _Localized | None = None
+
+    class _PeriodDescriptor(msgspec.Struct, omit_defaults=True):
+        number: int | None = None
+        periodType: str | None = None
+
+    class _Clock(msgspec.Struct, omit_defaults=True):
+        timeRemaining: str | None = None
+        secondsRemaining: int | None = None
+        running: bool | None = None
+        inIntermission: bool | None = None
+
+    class _Game(msgspec.Struct, omit_defaults=True):
+        id: int | None = None
+        season: int | None = None
+        gameType: int | None = None
+        gameState: str | None = None
+        gameScheduleState: str | None = None
+        startTimeUTC: str | None = None
+        venue: _Localized | None = None
+        awayTeam: _Team | None = None
+        homeTeam: _Team | None = None
+        periodDescriptor: _PeriodDescriptor | None = None
+        clock: _Clock | None = None
+
+    class _GameDetails(_Game, omit_defaults=True):
+        easternUTCOffset: str | None = None
+        venueUTCOffset: str | None = None
+        venueTimezone: str | None = None
+        gameCenterLink: str | None = None
+        seriesUrl: str | None = None
+        threeMinRecap: str | None = None
+        condensedGame: str | None = None
+        # Small objects, kept whole
+        winningGoalie: dict | None = None
+        winningGoalScorer: dict | None = None
+        seriesStatus: dict | None = None
+        tvBroadcasts: list | None = None
+
+    # Not omit_defaults: callers index ["games"], which must be there (empty) on off-days.
+    class _Scores(msgspec.Struct):
+        currentDate: str | None = None
+        games: list[_Game] = []
+
+    _game_decoder = msgspec.json.Decoder(_Game)
+    _game_details_decoder = msgspec.json.Decoder(_GameDetails)
+    _scores_decoder = msgspec.json.Decoder(_Scores)
+
+
+def _decode(body: bytes, decoder, selection: dict) -> dict:
+    if msgspec is not None:
+        try:
+            return msgspec.to_builtins(decoder.decode(body))
+        except msgspec.ValidationError:
+            # The API changed a field's type; still serve the fields we can.
+            pass
+    return project(decode_json(body), selection)
+
+
+def decode_game(body: bytes) -> dict:
+    """Decode the game fields of a landing, play-by-play or boxscore document."""
+    return _decode(body, _game_decoder if msgspec else None, GAME_FIELDS)
+
+
+def decode_game_details(body: bytes) -> dict:
+    """Decode a landing document down to every field GameSnapshot tracks."""
+    return _decode(body, _game_details_decoder if msgspec else None, GAME_DETAIL_FIELDS)
+
+
+def decode_scores(body: bytes) -> dict:
+    """
+    Decode a /score/{date} document down to each game's live fields. "games"
+    is always present, as an empty list on a day without games.
+    """
+    scores = _decode(body, _scores_decoder if msgspec else None, SCORES_FIELDS)
+    scores.setdefault("games", [])
+    return scores
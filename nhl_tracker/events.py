@@ -0,0 +1,119 @@
+"""
+Game transitions, computed once per update and fired on the HA event bus.
+
+Every event carries the game, both teams and the game's state before and
+after the update, so automations can trigger on e.g. nhl_tracker_goal
+instead of templating the sensor's attributes on every write.
+
+Period and game state transitions are computed against the furthest state
+seen for the game, not the previous document: the schedule, /score and
+landing documents aren't refreshed together, so a lagging one can step a
+game backwards, and an event must not fire again when it catches up.
+Scores are the exception, as they do go down when a goal is overturned:
+the last score seen is kept, a drop fires nhl_tracker_goal_disallowed, and
+the next goal fires as usual.
+"""
+from dataclasses import asdict, dataclass
+
+from .const import (
+    EVENT_FINAL,
+    EVENT_GOAL,
+    EVENT_GOAL_DISALLOWED,
+    EVENT_INTERMISSION,
+    EVENT_PERIOD_END,
+    EVENT_PERIOD_START,
+)
+from .projection import GameSnapshot
+
+FINISHED_GAME_STATES = ("FINAL", "OFF")
+# Game states in the order a game goes through them; others rank with FUT
+GAME_STATE_RANK = {"PRE": 1, "LIVE": 2, "CRIT": 2, "FINAL": 3, "OFF": 3}
+
+
+@dataclass(slots=True, frozen=True)
+class GameState:
+    """The snapshot fields transitions are computed from."""
+
+    game_state: str | None = None
+    period: int | None = None
+    in_intermission: bool | None = None
+    away_score: int | None = None
+    home_score: int | None = None
+
+    @classmethod
+    def of(cls, snapshot: GameSnapshot) -> "GameState":
+        return cls(snapshot.game_state, snapshot.period, snapshot.in_intermission,
+                   snapshot.away.score, snapshot.home.score)
+
+    def advanced_by(self, later: "GameState") -> "GameState":
+        """
+        This state moved on by a later document's. The game state and the
+        (period, intermission) position never go back: parts of `later` that
+        are behind are ignored. Scores are the later document's, as a goal
+        can be overturned.
+        """
+        if self.game_state is None:
+            return later
+        game_state = self.game_state
+        if later.game_state is not None and \
+                GAME_STATE_RANK.get(later.game_state, 0) >= GAME_STATE_RANK.get(self.game_state, 0):
+            game_state = later.game_state
+        period, in_intermission = self.period, self.in_intermission
+        if later.period is not None and \
+                (later.period, bool(later.in_intermission)) >= (period or 0, bool(in_intermission)):
+            period, in_intermission = later.period, later.in_intermission
+        return GameState(game_state, period, in_intermission,
+                         _latest(self.away_score, later.away_score),
+                         _latest(self.home_score, later.home_score))
+
+
+def _latest(old, new):
+    return old if new is None else new
+
+
+def transitions(snapshot: GameSnapshot, before: GameState, after: GameState) -> list:
+    """
+    Returns [(event_type, event_data)] for what changed between two states.
+    `before` is the state seen so far and `after` is
+    before.advanced_by(<the new document's state>), so each period and
+    intermission fires once however documents interleave.
+    """
+    if before == after or before.game_state is None:
+        # Nothing new, or the first document seen for this game (e.g. after a restart).
+        return []
+
+    common = {
+        "game_id": snapshot.game_id,
+        "away_team": snapshot.away.abbrev,
+        "home_team": snapshot.home.abbrev,
+        "before": asdict(before),
+        "after": asdict(after),
+    }
+    events = []
+
+    for side, team, old, new in (("away", snapshot.away.abbrev, before.away_score, after.away_score),
+                                 ("home", snapshot.home.abbrev, before.home_score, after.home_score)):
+        if old is None or new is None or new == old:
+            continue
+        events.append((EVENT_GOAL if new > old else EVENT_GOAL_DISALLOWED,
+                       {**common, "team": team, "side": side, "score": new,
+                        "period": after.period, "time_remaining": snapshot.time_remaining}))
+
+    intermission_started = bool(after.in_intermission) and not before.in_intermission
+    finished = after.game_state in FINISHED_GAME_STATES and before.game_state not in FINISHED_GAME_STATES
+    new_period = after.period is not None and after.period != before.period
+    # A period ends at intermission, at the final horn, or (if both were missed
+    # between two polls) when the next one has already started.
+    if before.period and (intermission_started or (finished and not before.in_intermission)
+                          or (new_period and not before.in_intermission)):
+        events.append((EVENT_PERIOD_END, {**common, "period": before.period}))
+    if bool(after.in_intermission) != bool(before.in_intermission):
+        events.append((EVENT_INTERMISSION, {**common, "period": after.period,
+                                            "in_intermission": bool(after.in_intermission)}))
+    if new_period and not finished:
+        events.append((EVENT_PERIOD_START, {**common, "period": after.period}))
+
+    if finished:
+        events.append((EVENT_FINAL, {**common, "away_score": after.away_score,
+                                     "home_score": after.home_score}))
+    return events
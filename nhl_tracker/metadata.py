@@ -0,0 +1,104 @@
+"""
+Team and player metadata, shared by every game that mentions them.
+
+Every NHL API document repeats each team's abbreviation and localized names
+and each player's name parts. Decoding them for every game leaves one copy
+of each string per game in memory, and the player names have to be rebuilt
+from firstInitial/lastName each time. The cache keeps one immutable record
+per team and player id, with interned strings, and hands out that record
+instead. Entries are kept for one season and filled lazily from whatever
+documents arrive: a record missing a field (a /score entry has no placeName)
+is replaced once a document that carries it shows up.
+"""
+import sys
+from dataclasses import dataclass
+
+
+def _default(localized: dict | None) -> str | None:
+    """Pull the default translation out of an NHL localized-string dict."""
+    return localized.get("default") if localized else None
+
+
+@dataclass(frozen=True, slots=True)
+class TeamInfo:
+    id: int | None = None
+    abbrev: str | None = None
+    name: str | None = None
+    place: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class PlayerInfo:
+    id: int | None = None
+    name: str | None = None
+
+
+UNKNOWN_TEAM = TeamInfo()
+
+
+class MetadataCache:
+    """
+    TeamInfo by team id and abbreviation, PlayerInfo by player id.
+
+    share=False hands out a fresh, uninterned record for every document, which
+    is what holding the decoded fields per game amounts to (for comparisons).
+    """
+
+    def __init__(self, share: bool = True):
+        self.share = share
+        self.season = None
+        self._teams: dict[int | str, TeamInfo] = {}
+        self._players: dict[int, PlayerInfo] = {}
+
+    def __len__(self):
+        return len(set(map(id, self._teams.values()))) + len(self._players)
+
+    def text(self, value):
+        """An interned copy of a repeated string (states, venues, offsets)."""
+        return sys.intern(value) if self.share and type(value) is str else value
+
+    def start_season(self, season) -> None:
+        """Drop every entry when the season changes: names, rosters and teams move between seasons."""
+        if season and season != self.season:
+            self.season = season
+            self._teams.clear()
+            self._players.clear()
+
+    def team(self, team: dict) -> TeamInfo:
+        """The record for an awayTeam/homeTeam object."""
+        team_id = team.get("id")
+        abbrev = team.get("abbrev")
+        cached = (self._teams.get(team_id) or self._teams.get(abbrev)) if self.share else None
+        if cached is not None and (cached.abbrev or not abbrev) and (cached.name or "commonName" not in team) \
+                and (cached.place or "placeName" not in team) and (cached.id or not team_id):
+            return cached
+
+        cached = cached or UNKNOWN_TEAM
+        info = TeamInfo(
+            team_id or cached.id,
+            self.text(abbrev) or cached.abbrev,
+            self.text(_default(team.get("commonName"))) or cached.name,
+            self.text(_default(team.get("placeName"))) or cached.place)
+        if self.share:
+            for key in (info.id, info.abbrev):
+                if key:
+                    self._teams[key] = info
+        return info
+
+    def player(self, player: dict | None) -> PlayerInfo | None:
+        """The record for a player object with playerId, firstInitial and lastName."""
+        if not player:
+            return None
+        player_id = player.get("playerId")
+        cached = self._players.get(player_id) if self.share and player_id else None
+        if cached is not None:
+            return cached
+        name = f"{_default(player.get('firstInitial')) or ''} {_default(player.get('lastName')) or ''}".strip()
+        info = PlayerInfo(player_id, self.text(name))
+        if self.share and player_id:
+            self._players[player_id] = info
+        return info
+
+
+# One cache per process: every config entry, sensor and snapshot shares it.
+METADATA = MetadataCache()
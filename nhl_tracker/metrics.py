@@ -0,0 +1,201 @@
+# Shared with the bot: Discord/metrics.py is a link to this file (bench/check_shared.py checks).
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+# Upper bounds in seconds, roughly the spread of NHL API round trips.
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUEUE_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram, cheap enough to update on every request."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate a quantile by interpolating inside the matching bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1]
+
+
+class EndpointStats:
+    """Counters and latency histogram for a single upstream endpoint."""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.bytes = 0
+        self.cache_hits = 0
+        self.latency = Histogram(LATENCY_BUCKETS)
+
+
+class Metrics:
+    """
+    Hot-path instrumentation for the NHL API client and the live pollers.
+
+    The integration calls it from the event loop only, so by default no
+    locking is done; its values are exposed through the diagnostic sensors.
+    The bot makes requests from asyncio.to_thread workers as well (see
+    game_index.py), so it passes thread_safe=True and every update and read
+    takes a lock. Both render Prometheus text via render_prometheus(), which
+    write_textfile() dumps for node_exporter's textfile collector.
+    """
+
+    def __init__(self, namespace: str = "nhl_tracker", thread_safe: bool = False):
+        self.namespace = namespace
+        self.endpoints: dict[str, EndpointStats] = {}
+        self.queue_wait = Histogram(QUEUE_WAIT_BUCKETS)
+        self.counters = Counter()
+        self._lock = threading.RLock() if thread_safe else nullcontext()
+
+    def endpoint(self, name: str) -> EndpointStats:
+        stats = self.endpoints.get(name)
+        if stats is None:
+            stats = self.endpoints[name] = EndpointStats()
+        return stats
+
+    def record_request(self, endpoint: str, seconds: float, ok: bool = True, nbytes: int = 0) -> None:
+        with self._lock:
+            stats = self.endpoint(endpoint)
+            stats.requests += 1
+            stats.latency.observe(seconds)
+            stats.bytes += nbytes
+            if not ok:
+                stats.errors += 1
+
+    def record_cache_hit(self, endpoint: str) -> None:
+        with self._lock:
+            self.endpoint(endpoint).cache_hits += 1
+
+    def record_queue_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.queue_wait.observe(seconds)
+
+    def increment(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += value
+
+    @contextmanager
+    def track(self, endpoint: str):
+        """
+        Time a request. The yielded dict may be given a "bytes" value.
+
+            with metrics.track("landing") as call:
+                response = requests.get(url)
+                call["bytes"] = len(response.content)
+        """
+        call = {"bytes": 0}
+        started = time.monotonic()
+        try:
+            yield call
+        except Exception:
+            self.record_request(endpoint, time.monotonic() - started, False, call["bytes"])
+            raise
+        self.record_request(endpoint, time.monotonic() - started, True, call["bytes"])
+
+    @property
+    def total_requests(self) -> int:
+        with self._lock:
+            return sum(s.requests for s in self.endpoints.values())
+
+    @property
+    def total_errors(self) -> int:
+        with self._lock:
+            return sum(s.errors for s in self.endpoints.values())
+
+    def snapshot(self) -> dict:
+        """Return a JSON-friendly summary, used for sensor attributes."""
+        def ms(value):
+            return round(value * 1000, 1) if value is not None else None
+
+        with self._lock:
+            return {
+                "endpoints": {
+                    name: {
+                        "requests": s.requests,
+                        "errors": s.errors,
+                        "bytes": s.bytes,
+                        "cache_hits": s.cache_hits,
+                        "latency_p50_ms": ms(s.latency.quantile(0.5)),
+                        "latency_p95_ms": ms(s.latency.quantile(0.95)),
+                    }
+                    for name, s in self.endpoints.items()
+                },
+                "queue_wait_p95_ms": ms(self.queue_wait.quantile(0.95)),
+                **dict(self.counters),
+            }
+
+    def render_prometheus(self, labels: dict | None = None) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        ns = self.namespace
+        base = dict(labels or {})
+        lines = []
+
+        def fmt(extra=None):
+            merged = {**base, **(extra or {})}
+            if not merged:
+                return ""
+            return "{" + ",".join(f'{k}="{v}"' for k, v in merged.items()) + "}"
+
+        def histogram(name, hist, extra=None):
+            cumulative = 0
+            for bound, count in zip(hist.buckets, hist.counts):
+                cumulative += count
+                lines.append(f"{name}_bucket{fmt({**(extra or {}), 'le': bound})} {cumulative}")
+            lines.append(f"{name}_bucket{fmt({**(extra or {}), 'le': '+Inf'})} {hist.count}")
+            lines.append(f"{name}_sum{fmt(extra)} {hist.sum}")
+            lines.append(f"{name}_count{fmt(extra)} {hist.count}")
+
+        with self._lock:
+            for field, help_text in (("requests", "Upstream requests"),
+                                     ("errors", "Failed upstream requests"),
+                                     ("bytes", "Response bytes received"),
+                                     ("cache_hits", "Requests answered without going upstream")):
+                lines.append(f"# HELP {ns}_{field}_total {help_text}.")
+                lines.append(f"# TYPE {ns}_{field}_total counter")
+                for name, stats in self.endpoints.items():
+                    lines.append(f"{ns}_{field}_total{fmt({'endpoint': name})} {getattr(stats, field)}")
+
+            lines.append(f"# HELP {ns}_request_seconds Upstream request latency.")
+            lines.append(f"# TYPE {ns}_request_seconds histogram")
+            for name, stats in self.endpoints.items():
+                histogram(f"{ns}_request_seconds", stats.latency, {"endpoint": name})
+
+            lines.append(f"# HELP {ns}_queue_wait_seconds Time spent waiting for an executor thread.")
+            lines.append(f"# TYPE {ns}_queue_wait_seconds histogram")
+            histogram(f"{ns}_queue_wait_seconds", self.queue_wait)
+
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"# TYPE {ns}_{name}_total counter")
+                lines.append(f"{ns}_{name}_total{fmt()} {value}")
+
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str) -> None:
+        """Atomically replace `path` with the Prometheus dump."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp_path, path)
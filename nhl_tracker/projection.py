@@ -0,0 +1,228 @@
+import sys
+from dataclasses import dataclass, fields
+
+from .metadata import METADATA, UNKNOWN_TEAM, MetadataCache, PlayerInfo, TeamInfo, _default
+
+
+def _broadcasts(broadcasts: list, country: str) -> str:
+    return ", ".join(b.get("network") for b in broadcasts
+                     if b.get("countryCode") == country and b.get("market") == "N")
+
+
+@dataclass(slots=True)
+class TeamLine:
+    """One side of a game: the shared team record plus current score."""
+
+    team: TeamInfo = UNKNOWN_TEAM
+    score: int | None = None
+
+    @property
+    def abbrev(self) -> str | None:
+        return self.team.abbrev
+
+    @property
+    def name(self) -> str | None:
+        return self.team.name
+
+    @property
+    def place(self) -> str | None:
+        return self.team.place
+
+    def apply(self, team: dict, metadata: MetadataCache = METADATA) -> None:
+        if "id" in team or "abbrev" in team:
+            self.team = metadata.team(team)
+        if "score" in team:
+            self.score = team["score"]
+
+
+@dataclass(slots=True)
+class SeriesLine:
+    """Playoff series status for a game."""
+
+    round: int | None = None
+    abbreviation: str | None = None
+    title: str | None = None
+    needed_to_win: int | None = None
+    top_seed_abbrev: str | None = None
+    top_seed_wins: int | None = None
+    bottom_seed_abbrev: str | None = None
+    bottom_seed_wins: int | None = None
+    game_number: int | None = None
+
+
+@dataclass(slots=True)
+class GameSnapshot:
+    """
+    The fields of a game the sensor actually exposes, and nothing else.
+
+    Schedule entries, /score entries, landing documents and full game feeds all
+    use the same key names for these fields, so any of them can be applied.
+    Only keys present in the document overwrite, which means a schedule refresh
+    no longer throws away what the live poll learned and the play-by-play,
+    rosters and other arrays in a game feed are never kept.
+    """
+
+    game_id: int
+    season: int | None = None
+    game_type: int | None = None
+    venue: str | None = None
+    away: TeamLine | None = None
+    home: TeamLine | None = None
+    game_state: str | None = None
+    game_schedule_state: str | None = None
+    period: int | None = None
+    period_type: str | None = None
+    time_remaining: str | None = None
+    in_intermission: bool | None = None
+    start_time_utc: str | None = None
+    eastern_utc_offset: str | None = None
+    venue_utc_offset: str | None = None
+    venue_timezone: str | None = None
+    winning_goalie: PlayerInfo | None = None
+    winning_goal_scorer: PlayerInfo | None = None
+    series: SeriesLine | None = None
+    series_url: str | None = None
+    tv_broadcasts_us: str | None = None
+    tv_broadcasts_ca: str | None = None
+    three_min_recap: str | None = None
+    condensed_game: str | None = None
+    game_center_link: str | None = None
+
+    def __post_init__(self):
+        self.away = self.away or TeamLine()
+        self.home = self.home or TeamLine()
+
+    def apply(self, doc: dict, metadata: MetadataCache = METADATA) -> None:
+        """
+        Copy the fields this snapshot tracks out of an NHL API game document.
+        Teams, players and strings every game repeats come from metadata.
+        """
+        get = doc.get
+        text = metadata.text
+        if "season" in doc:
+            metadata.start_season(doc["season"])
+        for key, attr in (("season", "season"), ("gameType", "game_type"),
+                          ("gameState", "game_state"), ("gameScheduleState", "game_schedule_state"),
+                          ("startTimeUTC", "start_time_utc"), ("easternUTCOffset", "eastern_utc_offset"),
+                          ("venueUTCOffset", "venue_utc_offset"), ("venueTimezone", "venue_timezone"),
+                          ("seriesUrl", "series_url"), ("threeMinRecap", "three_min_recap"),
+                          ("condensedGame", "condensed_game"), ("gameCenterLink", "game_center_link")):
+            if key in doc:
+                setattr(self, attr, text(doc[key]))
+
+        if "venue" in doc:
+            self.venue = text(_default(doc["venue"]))
+        if "awayTeam" in doc:
+            self.away.apply(doc["awayTeam"], metadata)
+        if "homeTeam" in doc:
+            self.home.apply(doc["homeTeam"], metadata)
+        # Sub-keys are applied one by one too: a change-feed entry, for one,
+        # carries the period number but not its type.
+        if "periodDescriptor" in doc:
+            descriptor = get("periodDescriptor")
+            if "number" in descriptor:
+                self.period = descriptor["number"]
+            if "periodType" in descriptor:
+                self.period_type = text(descriptor["periodType"])
+        if "clock" in doc:
+            clock = get("clock")
+            if "timeRemaining" in clock:
+                self.time_remaining = clock["timeRemaining"]
+            if "inIntermission" in clock:
+                self.in_intermission = clock["inIntermission"]
+        elif "liveData" in doc:
+            self.time_remaining = get("liveData").get("linescore", {}).get("currentPeriodTimeRemaining")
+        if "winningGoalie" in doc:
+            self.winning_goalie = metadata.player(get("winningGoalie"))
+        if "winningGoalScorer" in doc:
+            self.winning_goal_scorer = metadata.player(get("winningGoalScorer"))
+        if "seriesStatus" in doc:
+            status = get("seriesStatus")
+            self.series = SeriesLine(
+                status.get("round"), text(status.get("seriesAbbrev")), text(status.get("seriesTitle")),
+                status.get("neededToWin"), text(status.get("topSeedTeamAbbrev")), status.get("topSeedWins"),
+                text(status.get("bottomSeedTeamAbbrev")), status.get("bottomSeedWins"),
+                status.get("gameNumberOfSeries"))
+        if "tvBroadcasts" in doc:
+            self.tv_broadcasts_us = text(_broadcasts(get("tvBroadcasts"), "US"))
+            self.tv_broadcasts_ca = text(_broadcasts(get("tvBroadcasts"), "CA"))
+
+    def as_attributes(self) -> dict:
+        """The sensor's extra_state_attributes, minus attribution."""
+        series = self.series or SeriesLine()
+        goalie = self.winning_goalie or PlayerInfo()
+        scorer = self.winning_goal_scorer or PlayerInfo()
+        return {
+            "game_id": self.game_id,
+            "season": self.season,
+            "game_type": self.game_type,
+            "venue": self.venue,
+
+            "away_team_name": self.away.name,
+            "away_team_place": self.away.place,
+            "away_team_abbrev": self.away.abbrev,
+            "away_score": self.away.score,
+
+            "home_team_name": self.home.name,
+            "home_team_place": self.home.place,
+            "home_team_abbrev": self.home.abbrev,
+            "home_score": self.home.score,
+
+            "game_state": self.game_state,
+            "game_schedule_state": self.game_schedule_state,
+            "current_period": self.period,
+            "period_type": self.period_type,
+
+            "start_time_utc": self.start_time_utc,
+            "eastern_utc_offset": self.eastern_utc_offset,
+            "venue_utc_offset": self.venue_utc_offset,
+            "venue_timezone": self.venue_timezone,
+
+            "winning_goalie_id": goalie.id,
+            "winning_goalie_name": goalie.name,
+            "winning_goal_scorer_id": scorer.id,
+            "winning_goal_scorer_name": scorer.name,
+
+            "series_round": series.round,
+            "series_abbreviation": series.abbreviation,
+            "series_title": series.title,
+            "series_needed_to_win": series.needed_to_win,
+            "top_seed_team_abbrev": series.top_seed_abbrev,
+            "top_seed_wins": series.top_seed_wins,
+            "bottom_seed_team_abbrev": series.bottom_seed_abbrev,
+            "bottom_seed_wins": series.bottom_seed_wins,
+            "game_number_of_series": series.game_number,
+            "series_url": self.series_url,
+
+            "tv_broadcasts_us": self.tv_broadcasts_us or "",
+            "tv_broadcasts_ca": self.tv_broadcasts_ca or "",
+
+            "three_min_recap_link": self.three_min_recap,
+            "condensed_game_link": self.condensed_game,
+            "game_center_link": self.game_center_link,
+
+            "current_period_time_remaining": self.time_remaining,
+        }
+
+    def memory_bytes(self, _seen: set | None = None) -> int:
+        """
+        Resident size of the snapshot, including the objects it references.
+        Pass the same set for several snapshots to count shared objects once.
+        """
+        return deep_sizeof(self, _seen)
+
+
+def deep_sizeof(obj, _seen: set | None = None) -> int:
+    """sys.getsizeof, following containers, slots and dataclass fields."""
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__dataclass_fields__"):
+        size += sum(deep_sizeof(getattr(obj, f.name), seen) for f in fields(obj))
+    return size
@@ -0,0 +1,124 @@
+# Shared with the bot: Discord/resilience.py is a link to this file (bench/check_shared.py checks).
+import random
+import time
+from asyncio import CancelledError
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit is open."""
+
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(f"Circuit for {endpoint} is open, next probe in {retry_in:.0f}s")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+def is_client_error(exc: BaseException) -> bool:
+    """
+    True for a 4xx response other than 429: the request was wrong (an unknown
+    game or team, say), not the endpoint. Reads the status of aiohttp's
+    ClientResponseError, nhlpy's errors and requests' HTTPError.
+    """
+    status = getattr(exc, "status", None) or getattr(exc, "status_code", None) \
+        or getattr(getattr(exc, "response", None), "status_code", None)
+    return isinstance(status, int) and 400 <= status < 500 and status != 429
+
+
+class Backoff:
+    """
+    Exponential backoff with jitter.
+
+    Each delay is drawn from the upper half of base * factor ** attempt (capped),
+    so callers that failed together spread out instead of retrying in lockstep.
+    """
+
+    def __init__(self, base: float = 15, cap: float = 120, factor: float = 2, rng=random.random):
+        self.base = base
+        self.cap = cap
+        self.factor = factor
+        self.attempt = 0
+        self._rng = rng
+
+    def next_delay(self) -> float:
+        ceiling = min(self.cap, self.base * self.factor ** self.attempt)
+        self.attempt += 1
+        return ceiling / 2 + self._rng() * ceiling / 2
+
+    def reset(self) -> None:
+        self.attempt = 0
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker shared by every poller (or bot request) hitting that endpoint.
+
+    CLOSED: calls go through; `failure_threshold` consecutive failures open it.
+    OPEN: calls fail fast with CircuitOpenError until the jittered, exponentially
+    growing reset timeout passes.
+    HALF_OPEN: exactly one probe call goes through. Success closes the circuit,
+    failure re-opens it with the next (longer) timeout.
+    A 4xx response (see is_client_error) counts as success: the endpoint answered.
+
+    Use as a context manager around the upstream call:
+
+        with breaker:
+            data = await fetch()
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, endpoint: str, failure_threshold: int = 3, reset_timeout: float = 15,
+                 max_reset_timeout: float = 120, clock=time.monotonic):
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_until = 0.0
+        self._probe_in_flight = False
+        self._backoff = Backoff(reset_timeout, max_reset_timeout)
+        self._clock = clock
+
+    def retry_in(self) -> float:
+        """Seconds until a probe will be allowed (0 if calls go through now)."""
+        if self.state == self.OPEN:
+            return max(self.opened_until - self._clock(), 0.0)
+        return 0.0
+
+    def before_call(self) -> None:
+        if self.state == self.OPEN:
+            if self._clock() < self.opened_until:
+                raise CircuitOpenError(self.endpoint, self.retry_in())
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN:
+            if self._probe_in_flight:
+                raise CircuitOpenError(self.endpoint, self._backoff.base)
+            self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probe_in_flight = False
+        self._backoff.reset()
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probe_in_flight = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_until = self._clock() + self._backoff.next_delay()
+
+    def __enter__(self):
+        self.before_call()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None or is_client_error(exc):
+            self.record_success()
+        elif issubclass(exc_type, CancelledError):
+            # Nothing was learned about the endpoint; let another probe through.
+            self._probe_in_flight = False
+        else:
+            self.record_failure()
+        return False
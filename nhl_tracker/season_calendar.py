@@ -0,0 +1,172 @@
+"""
+Per-team season calendar for "when does OTT play next" without the network.
+
+The season schedule is ingested once (one club-schedule-season document per
+team) into sorted arrays of start times and game ids per team. Later schedule
+and score documents are fed in as they arrive, and only games whose start
+time, teams or cancellation changed touch the arrays. Lookups are a binary
+search over one team's array.
+
+Shared with the bot: Discord/season_calendar.py is a link to this file, as the
+integration is installed on its own (bench/check_shared.py checks).
+"""
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+
+CANCELLED_SCHEDULE_STATES = ("CNCL",)
+# statsapi schedules name teams by id only ("abbreviation" needs ?hydrate=team)
+STATSAPI_TEAM_ABBREVS = {
+    1: "NJD", 2: "NYI", 3: "NYR", 4: "PHI", 5: "PIT", 6: "BOS", 7: "BUF", 8: "MTL",
+    9: "OTT", 10: "TOR", 12: "CAR", 13: "FLA", 14: "TBL", 15: "WSH", 16: "CHI", 17: "DET",
+    18: "NSH", 19: "STL", 20: "CGY", 21: "COL", 22: "EDM", 23: "VAN", 24: "ANA", 25: "DAL",
+    26: "LAK", 28: "SJS", 29: "CBJ", 30: "MIN", 52: "WPG", 53: "ARI", 54: "VGK", 55: "SEA",
+    59: "UTA", 68: "UTA",
+}
+
+
+def team_abbrevs(game: dict) -> tuple:
+    """
+    Both teams' abbreviations, from an api-web or a statsapi schedule entry.
+    They are interned, so a whole season's entries share 32 strings. A team
+    that can't be named is None.
+    """
+    if "awayTeam" in game or "homeTeam" in game:
+        abbrevs = (game.get("awayTeam", {}).get("abbrev"), game.get("homeTeam", {}).get("abbrev"))
+    else:
+        teams = [game.get("teams", {}).get(side, {}).get("team", {}) for side in ("away", "home")]
+        abbrevs = tuple(team.get("abbreviation") or STATSAPI_TEAM_ABBREVS.get(team.get("id")) for team in teams)
+    return tuple(sys.intern(abbrev) if abbrev else abbrev for abbrev in abbrevs)
+
+
+def schedule_days(schedule: dict | None):
+    """
+    Yields (date, games) for each day of a schedule document, either an
+    api-web /schedule/{date} ("gameWeek") or a statsapi one ("dates").
+    """
+    for day in (schedule or {}).get("gameWeek") or (schedule or {}).get("dates") or ():
+        yield day.get("date"), day.get("games", [])
+
+
+def schedule_game_id(game: dict):
+    """The game's id, from an api-web ("id") or a statsapi ("gamePk") entry."""
+    return game.get("id") or game.get("gamePk")
+
+
+def season_for(day) -> str:
+    """
+    The NHL season a date (or "YYYY-MM-DD..." string) falls in, as the API
+    writes it (e.g. "20242025"). Seasons start in the fall, so anything before
+    July belongs to the previous year's season.
+    """
+    if isinstance(day, str):
+        day = datetime.strptime(day[:10], "%Y-%m-%d").date()
+    start_year = day.year if day.month >= 7 else day.year - 1
+    return f"{start_year}{start_year + 1}"
+
+
+def _timestamp(start_time_utc: str) -> float:
+    return datetime.fromisoformat(start_time_utc.replace("Z", "+00:00")).timestamp()
+
+
+class _TeamDates:
+    """One team's games as parallel arrays, sorted by start time."""
+
+    __slots__ = ("starts", "game_ids")
+
+    def __init__(self):
+        self.starts = array("d")
+        self.game_ids = array("q")
+
+    def add(self, start: float, game_id: int) -> None:
+        i = bisect_right(self.starts, start)
+        self.starts.insert(i, start)
+        self.game_ids.insert(i, game_id)
+
+    def remove(self, start: float, game_id: int) -> None:
+        i = bisect_left(self.starts, start)
+        while i < len(self.starts) and self.starts[i] == start:
+            if self.game_ids[i] == game_id:
+                del self.starts[i]
+                del self.game_ids[i]
+                return
+            i += 1
+
+
+class SeasonCalendar:
+    """Sorted per-team start times, updated in place as schedule documents arrive."""
+
+    def __init__(self):
+        # game_id -> (start timestamp, away abbrev, home abbrev)
+        self._games = {}
+        self._teams = {}
+        self.loaded_teams = set()
+
+    def __len__(self):
+        return len(self._games)
+
+    def ingest(self, games) -> int:
+        """Upsert schedule/score game entries; returns how many games changed."""
+        changed = 0
+        for game in games:
+            game_id = schedule_game_id(game)
+            start_time = game.get("startTimeUTC") or game.get("gameDate")
+            if not game_id or not start_time:
+                continue
+            cancelled = game.get("gameScheduleState") in CANCELLED_SCHEDULE_STATES
+            old = self._games.get(game_id)
+            teams = team_abbrevs(game)
+            if old is not None:
+                # A team this entry can't name keeps the one already known.
+                teams = tuple(team or known for team, known in zip(teams, old[1:]))
+            entry = None if cancelled else (_timestamp(start_time), *teams)
+
+            if old == entry:
+                continue
+            changed += 1
+            if old is not None:
+                for team in old[1:]:
+                    if team in self._teams:
+                        self._teams[team].remove(old[0], game_id)
+                del self._games[game_id]
+            if entry is not None:
+                self._games[game_id] = entry
+                for team in entry[1:]:
+                    if team:
+                        self._teams.setdefault(team, _TeamDates()).add(entry[0], game_id)
+        return changed
+
+    def ingest_team_season(self, team: str, season: dict) -> int:
+        """Ingest a club-schedule-season document and mark the team as loaded."""
+        self.loaded_teams.add(team)
+        return self.ingest(season.get("games", []))
+
+    def next_game(self, team: str, now: datetime | None = None) -> dict | None:
+        """The team's first game starting at or after now, or None."""
+        dates = self._teams.get(team)
+        if not dates:
+            return None
+        now = (now or datetime.now(timezone.utc)).timestamp()
+        i = bisect_left(dates.starts, now)
+        if i == len(dates.starts):
+            return None
+        game_id = dates.game_ids[i]
+        start, away, home = self._games[game_id]
+        return {
+            "game_id": game_id,
+            "start": datetime.fromtimestamp(start, timezone.utc),
+            "away_team": away,
+            "home_team": home,
+            "opponent": home if away == team else away,
+            "home": home == team,
+        }
+
+    def days_until_next_game(self, team: str, now: datetime | None = None, tz=None) -> int | None:
+        """Calendar days from now to the team's next game, in tz (default UTC)."""
+        now = now or datetime.now(timezone.utc)
+        game = self.next_game(team, now)
+        if game is None:
+            return None
+        tz = tz or timezone.utc
+        return (game["start"].astimezone(tz).date() - now.astimezone(tz).date()).days
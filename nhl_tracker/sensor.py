@@ -2,18 +2,34 @@ import logging
 import asyncio
 from datetime import datetime, timezone, timedelta
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.entity import generate_entity_id
-from homeassistant.const import ATTR_ATTRIBUTION
+from homeassistant.const import ATTR_ATTRIBUTION, EntityCategory
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, LIVE_GAME_POLL_INTERVAL_SECONDS
-from .__init__ import NHLDataUpdateCoordinator
+from .const import DOMAIN, LIVE_GAME_POLL_INTERVAL_SECONDS, LIVE_POLLING_MODE, NHL_TEAMS
+from .events import FINISHED_GAME_STATES, GameState, transitions
+from .metadata import METADATA
+from .projection import GameSnapshot
+from .resilience import Backoff, CircuitOpenError
+from .coordinator import NHLDataUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
 ATTRIBUTION = "Data provided by the NHL API (v2)"
+# Keys the live feed (league ticker or per-game poll) keeps current while it follows a game
+LIVE_FIELDS = ("gameState", "periodDescriptor", "clock")
+
+
+def _without_live_fields(doc: dict) -> dict:
+    """A schedule entry minus the state, score, period and clock, which the live feed has newer."""
+    doc = {key: value for key, value in doc.items() if key not in LIVE_FIELDS}
+    for side in ("awayTeam", "homeTeam"):
+        if side in doc:
+            doc[side] = {key: value for key, value in doc[side].items() if key != "score"}
+    return doc
 
 
 async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entities):  # Pass hass
@@ -45,9 +61,7 @@ async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entitie
                 entities_to_remove.append(sensor_obj.entity_id)
                 sensor_obj.async_will_remove_from_hass()
                 del current_game_sensors[unique_id]
-            else:
-                sensor_obj._game_data = coordinator.data[sensor_obj._game_id]
-                sensor_obj.async_schedule_update_ha_state(True)
+        # Existing sensors apply the update themselves, in _handle_coordinator_update
 
         if entities_to_remove:
             pass
@@ -55,6 +69,191 @@ async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entitie
     coordinator.async_add_listener(async_update_coordinator_data)
     async_update_coordinator_data()
 
+    async_add_entities([
+        NHLDiagnosticSensor(coordinator, key, name, unit, value_fn, attrs_fn)
+        for key, name, unit, value_fn, attrs_fn in DIAGNOSTIC_SENSORS
+    ])
+
+    async_add_entities([
+        NHLNextGameSensor(coordinator, team, key, name, unit, device_class, value_fn)
+        for team in sorted(coordinator.followed_teams)
+        for key, name, unit, device_class, value_fn in NEXT_GAME_SENSORS
+    ])
+
+    if coordinator.database_file:
+        async_add_entities([
+            NHLTeamRecordSensor(coordinator, team) for team in sorted(coordinator.followed_teams)
+        ])
+
+
+def _endpoint_attrs(field):
+    return lambda c: {name: stats[field] for name, stats in c.api_client.metrics.snapshot()["endpoints"].items()}
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+
+def _shared_memory_bytes(snapshots):
+    """Total size of the snapshots, counting the team and player records they share once."""
+    seen = set()
+    return sum(snapshot.memory_bytes(seen) for snapshot in snapshots)
+
+
+# (key, name, unit, value from the coordinator, attributes from the coordinator)
+DIAGNOSTIC_SENSORS = (
+    ("api_requests", "NHL API Requests", None,
+     lambda c: c.api_client.metrics.total_requests, _endpoint_attrs("requests")),
+    ("api_errors", "NHL API Errors", None,
+     lambda c: c.api_client.metrics.total_errors, _endpoint_attrs("errors")),
+    ("api_bytes", "NHL API Bytes Received", "B",
+     lambda c: sum(s.bytes for s in c.api_client.metrics.endpoints.values()), _endpoint_attrs("bytes")),
+    ("api_cache_hits", "NHL API Cache Hits", None,
+     lambda c: sum(s.cache_hits for s in c.api_client.metrics.endpoints.values()), _endpoint_attrs("cache_hits")),
+    ("api_latency_p95", "NHL API Latency p95", "ms",
+     lambda c: max((_ms(s.latency.quantile(0.95)) or 0 for s in c.api_client.metrics.endpoints.values()), default=None),
+     _endpoint_attrs("latency_p95_ms")),
+    ("executor_queue_wait_p95", "NHL Executor Queue Wait p95", "ms",
+     lambda c: _ms(c.api_client.metrics.queue_wait.quantile(0.95)),
+     lambda c: {"samples": c.api_client.metrics.queue_wait.count}),
+    ("live_polls", "NHL Live Polls", None,
+     lambda c: c.api_client.metrics.counters["live_polls"],
+     lambda c: {"errors": c.api_client.metrics.counters["live_poll_errors"],
+                "change_feed_rows": c.api_client.metrics.counters["change_feed_rows"],
+                "change_feed_errors": c.api_client.metrics.counters["change_feed_errors"]}),
+    ("tracked_game_memory", "NHL Tracked Game Memory", "B",
+     lambda c: _shared_memory_bytes(c.snapshots.values()),
+     lambda c: {"games": len(c.snapshots), "metadata_entries": len(METADATA),
+                **{str(game_id): snapshot.memory_bytes() for game_id, snapshot in c.snapshots.items()}}),
+)
+
+
+class NHLDiagnosticSensor(CoordinatorEntity, SensorEntity):
+    """Exposes one of the integration's instrumentation values."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_should_poll = True  # Refresh on HA's scan interval, not just coordinator updates
+
+    def __init__(self, coordinator: NHLDataUpdateCoordinator, key: str, name: str, unit, value_fn, attrs_fn):
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._value_fn = value_fn
+        self._attrs_fn = attrs_fn
+        self._attr_name = name
+        self._attr_unique_id = f"{coordinator.entry.entry_id}_{key}"
+        self._attr_native_unit_of_measurement = unit
+
+    @property
+    def native_value(self):
+        """Return the state of the sensor."""
+        return self._value_fn(self.coordinator)
+
+    @property
+    def extra_state_attributes(self):
+        """Return the state attributes."""
+        return self._attrs_fn(self.coordinator)
+
+    async def async_update(self) -> None:
+        """Metrics are read straight from memory; nothing to fetch."""
+
+
+# (key, name suffix, unit, device class, value from the calendar's next game and days until it)
+NEXT_GAME_SENSORS = (
+    ("next_game", "Next Game", None, SensorDeviceClass.TIMESTAMP,
+     lambda game, days: game["start"] if game else None),
+    ("days_until_next_game", "Days Until Next Game", "d", None,
+     lambda game, days: days),
+)
+
+
+class NHLNextGameSensor(CoordinatorEntity, SensorEntity):
+    """A followed team's next game, looked up in the season calendar without any request."""
+
+    _attr_should_poll = True  # "Next" moves with the clock, not just with coordinator updates
+
+    def __init__(self, coordinator: NHLDataUpdateCoordinator, team: str, key: str, name: str, unit, device_class, value_fn):
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._team = team
+        self._value_fn = value_fn
+        self._attr_name = f"{NHL_TEAMS.get(team, team)} {name}"
+        self._attr_unique_id = f"{coordinator.entry.entry_id}_{team.lower()}_{key}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_device_class = device_class
+        self._attr_icon = "mdi:calendar-clock"
+
+    @property
+    def native_value(self):
+        """Return the state of the sensor."""
+        calendar = self.coordinator.calendar
+        return self._value_fn(calendar.next_game(self._team),
+                              calendar.days_until_next_game(self._team, tz=dt_util.DEFAULT_TIME_ZONE))
+
+    @property
+    def available(self) -> bool:
+        """Unavailable until the team's season has been loaded."""
+        return self._team in self.coordinator.calendar.loaded_teams
+
+    @property
+    def extra_state_attributes(self):
+        """Return the state attributes."""
+        game = self.coordinator.calendar.next_game(self._team)
+        if game is None:
+            return {"team": self._team}
+        return {
+            "team": self._team,
+            "game_id": game["game_id"],
+            "opponent": game["opponent"],
+            "home": game["home"],
+            "away_team_abbrev": game["away_team"],
+            "home_team_abbrev": game["home_team"],
+        }
+
+    async def async_update(self) -> None:
+        """Answered from the in-memory calendar; nothing to fetch."""
+
+
+class NHLTeamRecordSensor(CoordinatorEntity, SensorEntity):
+    """A followed team's W-L-OTL record, from the aggregates DB/db_utils.py maintains."""
+
+    _attr_icon = "mdi:format-list-numbered"
+
+    def __init__(self, coordinator: NHLDataUpdateCoordinator, team: str):
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._team = team
+        self._attr_name = f"{NHL_TEAMS.get(team, team)} Record"
+        self._attr_unique_id = f"{coordinator.entry.entry_id}_{team.lower()}_record"
+
+    @property
+    def native_value(self):
+        """Return the state of the sensor."""
+        record = self.coordinator.standings.get(self._team)
+        if record is None:
+            return None
+        return f"{record['wins']}-{record['losses']}-{record['ot_losses']}"
+
+    @property
+    def extra_state_attributes(self):
+        """Return the state attributes."""
+        record = self.coordinator.standings.get(self._team)
+        if record is None:
+            return {"team": self._team}
+        last_10 = record["last_10"] or ""
+        return {
+            "team": self._team,
+            "season": record["season"],
+            "games_played": record["games_played"],
+            "points": record["points"],
+            "goals_for": record["goals_for"],
+            "goals_against": record["goals_against"],
+            "streak": f"{record['streak_type']}{record['streak_count']}" if record["streak_type"] else None,
+            "last_10": f"{last_10.count('W')}-{last_10.count('L')}-{last_10.count('O')}",
+            "last_10_results": last_10,
+            "head_to_head": record["head_to_head"],
+            "series": record["series"],
+        }
+
 
 class NHLGameSensor(CoordinatorEntity, SensorEntity):
     """Representation of an NHL game sensor."""
@@ -64,13 +263,17 @@ class NHLGameSensor(CoordinatorEntity, SensorEntity):
         super().__init__(coordinator)
         self.hass = hass  # Store hass
         self._game_id = game_id
-        self._game_data = initial_game_data
+        self._snapshot = coordinator.snapshots.setdefault(
+            game_id, GameSnapshot(game_id))
+        self._snapshot.apply(initial_game_data)
+        # The state seen so far, which events are computed against (see events.py)
+        self._announced = GameState.of(self._snapshot)
         self._live_update_task: asyncio.Task | None = None
+        self._detail_task: asyncio.Task | None = None
+        self._unsub_ticker = None
 
-        away_name = self._game_data.get('awayTeam', {}).get(
-            'commonName', {}).get('default', 'Unknown Away')
-        home_name = self._game_data.get('homeTeam', {}).get(
-            'commonName', {}).get('default', 'Unknown Home')
+        away_name = self._snapshot.away.name or 'Unknown Away'
+        home_name = self._snapshot.home.name or 'Unknown Home'
 
         self._attr_name = f"{away_name} vs {home_name} Game"
         self._attr_unique_id = f"nhl_game_{game_id}"
@@ -84,7 +287,7 @@ class NHLGameSensor(CoordinatorEntity, SensorEntity):
 
     async def _async_schedule_live_polling(self):
         """Schedule live polling to start at the game's start time."""
-        start_time_utc_str = self._game_data.get('startTimeUTC')
+        start_time_utc_str = self._snapshot.start_time_utc
         if not start_time_utc_str:
             _LOGGER.warning(
                 f"No startTimeUTC found for game {self.entity_id}.  Starting live polling immediately.")
@@ -124,76 +327,29 @@ class NHLGameSensor(CoordinatorEntity, SensorEntity):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        return self._game_data.get('gameState', 'UNKNOWN')
+        return self._snapshot.game_state or 'UNKNOWN'
 
     @property
     def extra_state_attributes(self):
         """Return the state attributes."""
         attrs = {
             ATTR_ATTRIBUTION: ATTRIBUTION,
-            "game_id": self._game_id,
-            "season": self._game_data.get('season'),
-            "game_type": self._game_data.get('gameType'),
-            "venue": self._game_data.get('venue', {}).get('default'),
-
-            "away_team_name": self._game_data.get('awayTeam', {}).get('commonName', {}).get('default'),
-            "away_team_place": self._game_data.get('awayTeam', {}).get('placeName', {}).get('default'),
-            "away_team_abbrev": self._game_data.get('awayTeam', {}).get('abbrev'),
-            "away_score": self._game_data.get('awayTeam', {}).get('score'),
-
-            "home_team_name": self._game_data.get('homeTeam', {}).get('commonName', {}).get('default'),
-            "home_team_place": self._game_data.get('homeTeam', {}).get('placeName', {}).get('default'),
-            "home_team_abbrev": self._game_data.get('homeTeam', {}).get('abbrev'),
-            "home_score": self._game_data.get('homeTeam', {}).get('score'),
-
-            "game_state": self._game_data.get('gameState'),
-            "game_schedule_state": self._game_data.get('gameScheduleState'),
-            "current_period": self._game_data.get('periodDescriptor', {}).get('number'),
-            "period_type": self._game_data.get('periodDescriptor', {}).get('periodType'),
-
-            "start_time_utc": self._game_data.get('startTimeUTC'),
-            "eastern_utc_offset": self._game_data.get('easternUTCOffset'),
-            "venue_utc_offset": self._game_data.get('venueUTCOffset'),
-            "venue_timezone": self._game_data.get('venueTimezone'),
-
-            "winning_goalie_id": self._game_data.get('winningGoalie', {}).get('playerId'),
-            "winning_goalie_name": f"{self._game_data.get('winningGoalie', {}).get('firstInitial', {}).get('default', '')} {self._game_data.get('winningGoalie', {}).get('lastName', {}).get('default', '')}".strip() if self._game_data.get('winningGoalie') else None,
-            "winning_goal_scorer_id": self._game_data.get('winningGoalScorer', {}).get('playerId'),
-            "winning_goal_scorer_name": f"{self._game_data.get('winningGoalScorer', {}).get('firstInitial', {}).get('default', '')} {self._game_data.get('winningGoalScorer', {}).get('lastName', {}).get('default', '')}".strip() if self._game_data.get('winningGoalScorer') else None,
-
-            "series_round": self._game_data.get('seriesStatus', {}).get('round'),
-            "series_abbreviation": self._game_data.get('seriesStatus', {}).get('seriesAbbrev'),
-            "series_title": self._game_data.get('seriesStatus', {}).get('seriesTitle'),
-            "series_needed_to_win": self._game_data.get('seriesStatus', {}).get('neededToWin'),
-            "top_seed_team_abbrev": self._game_data.get('seriesStatus', {}).get('topSeedTeamAbbrev'),
-            "top_seed_wins": self._game_data.get('seriesStatus', {}).get('topSeedWins'),
-            "bottom_seed_team_abbrev": self._game_data.get('seriesStatus', {}).get('bottomSeedTeamAbbrev'),
-            "bottom_seed_wins": self._game_data.get('seriesStatus', {}).get('bottomSeedWins'),
-            "game_number_of_series": self._game_data.get('seriesStatus', {}).get('gameNumberOfSeries'),
-            "series_url": self._game_data.get('seriesUrl'),
-
-            "tv_broadcasts_us": ", ".join([b.get('network') for b in self._game_data.get('tvBroadcasts', []) if b.get('countryCode') == 'US' and b.get('market') == 'N']),
-            "tv_broadcasts_ca": ", ".join([b.get('network') for b in self._game_data.get('tvBroadcasts', []) if b.get('countryCode') == 'CA' and b.get('market') == 'N']),
-
-            "three_min_recap_link": self._game_data.get('threeMinRecap'),
-            "condensed_game_link": self._game_data.get('condensedGame'),
-            "game_center_link": self._game_data.get('gameCenterLink'),
-
-            # This attribute will be populated ONLY when the game is LIVE and game_feed is fetched
-            "current_period_time_remaining": self._game_data.get("liveData", {}).get("linescore", {}).get("currentPeriodTimeRemaining")
+            **self._snapshot.as_attributes(),
         }
         return attrs
 
     async def async_added_to_hass(self) -> None:
         """Run when entity about to be added to Home Assistant."""
+        # CoordinatorEntity subscribes _handle_coordinator_update, and the state
+        # is written once the entity is added; __init__ applied the initial data.
         await super().async_added_to_hass()
-        self._handle_coordinator_update()
-        self.async_on_remove(self.coordinator.async_add_listener(
-            self._handle_coordinator_update))
 
     async def async_will_remove_from_hass(self) -> None:
         """Run when entity will be removed from Home Assistant."""
         self._stop_live_game_polling()
+        if self._detail_task:
+            self._detail_task.cancel()
+        self.coordinator.snapshots.pop(self._game_id, None)
         await super().async_will_remove_from_hass()
 
     @callback
@@ -203,58 +359,132 @@ class NHLGameSensor(CoordinatorEntity, SensorEntity):
 
         if updated_game_data is None:
             self._attr_available = False
-            self._game_data = {}
+            self._snapshot = self.coordinator.snapshots[self._game_id] = GameSnapshot(
+                self._game_id)
+            self._announced = GameState()
             self._stop_live_game_polling()
             self.async_write_ha_state()
             return
 
-        old_game_state = self._game_data.get("gameState")
-        new_game_state = updated_game_data.get("gameState")
-
-        self._game_data = updated_game_data
+        following = self._live_update_task or self._unsub_ticker
+        was_finished = self._snapshot.game_state in FINISHED_GAME_STATES
+        if following and updated_game_data.get("gameState") not in FINISHED_GAME_STATES:
+            # The schedule is refreshed every few minutes and the live feed every tick.
+            updated_game_data = _without_live_fields(updated_game_data)
+        self._apply(updated_game_data)
         self._attr_available = True
 
         # No need to start live polling here.  It's started in __init__ at the scheduled time.
-        # Only stop it if the game transitions away from LIVE
-        if new_game_state != "LIVE" and self._live_update_task:
+        # Only stop it once the game is over: CRIT, or PRE past a late puck drop, still needs it.
+        if following and self._snapshot.game_state in FINISHED_GAME_STATES:
             _LOGGER.debug(
-                f"Game {self.entity_id} transitioned away from LIVE. Stopping live polling.")
+                f"Game {self.entity_id} is over. Stopping live polling.")
+            if not was_finished:
+                # The live feed missed the final horn; get what it would have fetched then.
+                self._async_fetch_details()
             self._stop_live_game_polling()
 
         self.async_write_ha_state()
 
     async def _start_live_game_polling(self) -> None:
-        """Start an asyncio task to poll for live game details."""
-        if self._live_update_task:
+        """Start following live game details."""
+        if self._live_update_task or self._unsub_ticker:
             self._stop_live_game_polling()
 
+        if LIVE_POLLING_MODE == "ticker":
+            _LOGGER.debug(f"Following {self.entity_id} through the league ticker")
+            self._unsub_ticker = self.coordinator.ticker.async_subscribe(
+                self._game_id, self._handle_ticker_update)
+            return
+
         async def _poll_live_game_data():
             _LOGGER.debug(f"Starting live polling loop for {self.entity_id}")
+            backoff = Backoff(base=LIVE_GAME_POLL_INTERVAL_SECONDS)
             while True:
+                delay = LIVE_GAME_POLL_INTERVAL_SECONDS
+                metrics = self.coordinator.api_client.metrics
+                metrics.increment("live_polls")
                 try:
                     live_details = await self.coordinator.api_client.get_game_details(self._game_id)
-                    self._game_data.update(live_details)
+                    backoff.reset()
+                    self._apply(live_details)
                     self.async_write_ha_state()
                     _LOGGER.debug(
-                        f"Updated live data for {self.entity_id}: {self._game_data.get('awayTeam', {}).get('score')} - {self._game_data.get('homeTeam', {}).get('score')}")
+                        f"Updated live data for {self.entity_id}: {self._snapshot.away.score} - {self._snapshot.home.score}")
 
                 except asyncio.CancelledError:
                     _LOGGER.debug(
                         f"Live polling for {self.entity_id} was cancelled.")
                     break
+                except CircuitOpenError as e:
+                    # Another sensor is already probing the endpoint.
+                    delay = max(e.retry_in, LIVE_GAME_POLL_INTERVAL_SECONDS)
                 except Exception as e:
-                    _LOGGER.exception(
-                        f"Unhandled exception during live polling for {self.entity_id}: {e}")
+                    metrics.increment("live_poll_errors")
+                    delay = backoff.next_delay()
+                    _LOGGER.warning(
+                        f"Live polling for {self.entity_id} failed, retrying in {delay:.0f}s: {e}")
 
-                await asyncio.sleep(LIVE_GAME_POLL_INTERVAL_SECONDS)
+                await asyncio.sleep(delay)
 
         self._live_update_task = self.hass.async_create_task(
             _poll_live_game_data())
         self.async_on_remove(lambda: self._live_update_task.cancel())
 
+    @callback
+    def _handle_ticker_update(self, score_entry: dict | None) -> None:
+        """Apply this game's entry from the league-wide /score response."""
+        if score_entry is None:
+            # Not on the NHL's current day (e.g. past midnight), ask for the game itself.
+            self._async_fetch_details()
+            return
+
+        old_game_state = self._snapshot.game_state
+        self._apply(score_entry)
+        self.async_write_ha_state()
+
+        if score_entry.get("gameState") in FINISHED_GAME_STATES and old_game_state not in FINISHED_GAME_STATES:
+            # Winning goalie, scorer, recaps etc. only come with the full feed.
+            _LOGGER.debug(
+                f"Game {self.entity_id} finished, fetching final details.")
+            self._async_fetch_details()
+            self._stop_live_game_polling()
+
+    @callback
+    def _async_fetch_details(self) -> None:
+        """Fetch the full game feed once, for fields /score doesn't carry."""
+        if self._detail_task and not self._detail_task.done():
+            return
+        self._detail_task = self.hass.async_create_task(
+            self._async_update_details())
+
+    async def _async_update_details(self) -> None:
+        try:
+            live_details = await self.coordinator.api_client.get_game_details(self._game_id)
+        except Exception as e:
+            _LOGGER.warning(
+                f"Could not fetch details for {self.entity_id}: {e}")
+            return
+        self._apply(live_details)
+        self.async_write_ha_state()
+
+    @callback
+    def _apply(self, doc: dict) -> None:
+        """Apply an NHL API document to the snapshot and fire any resulting game events."""
+        self._snapshot.apply(doc)
+        after = self._announced.advanced_by(GameState.of(self._snapshot))
+        for event_type, event_data in transitions(self._snapshot, self._announced, after):
+            _LOGGER.debug(f"{event_type} for {self.entity_id}: {event_data['after']}")
+            self.hass.bus.async_fire(event_type, event_data)
+        self._announced = after
+
     @callback
     def _stop_live_game_polling(self) -> None:
         """Stop the asyncio task for live game polling."""
+        if self._unsub_ticker:
+            self._unsub_ticker()
+            self._unsub_ticker = None
+            _LOGGER.debug(f"Stopped following {self.entity_id} in the league ticker.")
         if self._live_update_task:
             self._live_update_task.cancel()
             self._live_update_task = None
@@ -0,0 +1,29 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into a single in-flight call.
+
+    The first caller for a key starts the work; anyone asking for the same key
+    before it finishes awaits the same task instead of issuing another request.
+    Nothing is cached afterwards: the next call once it completes goes upstream.
+    """
+
+    def __init__(self):
+        self._in_flight: dict[Hashable, asyncio.Future] = {}
+
+    def is_in_flight(self, key: Hashable) -> bool:
+        return key in self._in_flight
+
+    async def do(self, key: Hashable, func: Callable[..., Awaitable[Any]], *args) -> Any:
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func(*args))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        # Shield so one caller being cancelled (e.g. a sensor removed mid-poll)
+        # doesn't cancel the request for everyone else sharing it.
+        return await asyncio.shield(task)
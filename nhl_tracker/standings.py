@@ -0,0 +1,38 @@
+"""
+Reads the standings, streak, last-10 and head-to-head aggregates that
+DB/db_utils.py maintains in the bot's SQLite database as games go final.
+The integration never writes to that database, it only opens it read-only.
+"""
+import sqlite3
+
+REGULAR_SEASON = 2
+PLAYOFFS = 3
+
+
+def read_team_aggregates(path: str, teams, opponents: dict, season: str) -> dict:
+    """
+    Returns {team: record} for the given teams, where record is the team's
+    team_standings row plus "head_to_head" and "series" against the opponent
+    given for it in `opponents` (if any). Blocking; run it in the executor.
+    """
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        records = {}
+        for team in teams:
+            row = conn.execute(
+                "SELECT * FROM team_standings WHERE season = ? AND game_type = ? AND team = ?;",
+                (season, REGULAR_SEASON, team)).fetchone()
+            if row is None:
+                continue
+            record = dict(row)
+            opponent = opponents.get(team)
+            for key, game_type in (("head_to_head", REGULAR_SEASON), ("series", PLAYOFFS)):
+                matchup = opponent and conn.execute(
+                    "SELECT * FROM head_to_head WHERE season = ? AND game_type = ? AND team = ? AND opponent = ?;",
+                    (season, game_type, team, opponent)).fetchone()
+                record[key] = dict(matchup) if matchup else None
+            records[team] = record
+        return records
+    finally:
+        conn.close()
@@ -0,0 +1,260 @@
+import logging
+import asyncio
+import json
+import time
+from collections.abc import Callable
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant, callback
+
+from .change_feed import ChangeFeed, as_score_entry
+from .const import CHANGE_FEED_POLL_INTERVAL_SECONDS, CHANGE_FEED_STALE_SECONDS, LIVE_GAME_POLL_INTERVAL_SECONDS
+from .resilience import Backoff, CircuitOpenError
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class NHLLeagueTicker:
+    """
+    Polls /score/now once per tick and fans the result out to every LIVE game.
+
+    The score endpoint carries the score, period and clock of every game of the
+    day, so one request per tick replaces one request per live game. Sensors
+    subscribe while their game is live; the loop stops when nobody is left.
+    """
+
+    def __init__(self, hass: HomeAssistant, api_client, interval: int = LIVE_GAME_POLL_INTERVAL_SECONDS):
+        """Initialize the ticker."""
+        self.hass = hass
+        self.api_client = api_client
+        self.interval = interval
+        self._listeners: dict[int, list[Callable[[dict | None], None]]] = {}
+        self._task: asyncio.Task | None = None
+
+    @callback
+    def async_subscribe(self, game_id: int, update_callback: Callable[[dict | None], None]) -> Callable[[], None]:
+        """
+        Call update_callback with the game's /score entry on every tick, or
+        None if the game is missing from the response. Returns an unsubscribe.
+        """
+        self._listeners.setdefault(game_id, []).append(update_callback)
+        if self._task is None:
+            self._task = self.hass.async_create_task(self._async_run())
+
+        @callback
+        def _unsubscribe():
+            callbacks = self._listeners.get(game_id, [])
+            if update_callback in callbacks:
+                callbacks.remove(update_callback)
+            if not callbacks:
+                self._listeners.pop(game_id, None)
+
+        return _unsubscribe
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop polling, e.g. when the config entry is unloaded."""
+        self._listeners.clear()
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _async_run(self) -> None:
+        _LOGGER.debug("Starting league ticker")
+        metrics = self.api_client.metrics
+        backoff = Backoff(base=self.interval)
+        try:
+            while self._listeners:
+                delay = self.interval
+                metrics.increment("live_polls")
+                try:
+                    scores = await self.api_client.get_scores("now")
+                    backoff.reset()
+                    games = {game["id"]: game for game in scores.get("games", [])}
+                    for game_id, callbacks in list(self._listeners.items()):
+                        for update_callback in list(callbacks):
+                            update_callback(games.get(game_id))
+                except asyncio.CancelledError:
+                    raise
+                except CircuitOpenError as e:
+                    delay = max(e.retry_in, self.interval)
+                except Exception as e:
+                    metrics.increment("live_poll_errors")
+                    delay = backoff.next_delay()
+                    _LOGGER.warning(
+                        f"League ticker poll failed, retrying in {delay:.0f}s: {e}")
+
+                await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            _LOGGER.debug("League ticker was cancelled.")
+        finally:
+            self._task = None
+        _LOGGER.debug("League ticker stopped, no live games left")
+
+
+class NHLChangeFeedTicker(NHLLeagueTicker):
+    """
+    Follows live games through the bot database's change log instead of the API.
+
+    When the Discord side already ingests live games into SQLite, tailing its
+    game_changes table delivers every score, period and clock change within a
+    poll interval, with no NHL API traffic from Home Assistant. Subscribers get
+    the same /score-shaped entries as from NHLLeagueTicker, but only when their
+    game changed. A game the log has been silent about for
+    CHANGE_FEED_STALE_SECONDS gets None, like a game missing from /score, so
+    its sensor fetches it from the API while the log isn't being written.
+    """
+
+    def __init__(self, hass: HomeAssistant, api_client, path: str, interval: float = CHANGE_FEED_POLL_INTERVAL_SECONDS):
+        """Initialize the ticker."""
+        super().__init__(hass, api_client, interval)
+        self.feed = ChangeFeed(path)
+        # game_id -> time.monotonic() of its last change, or of its subscription
+        self._heard: dict[int, float] = {}
+
+    @callback
+    def async_subscribe(self, game_id: int, update_callback: Callable[[dict | None], None]) -> Callable[[], None]:
+        """Same as NHLLeagueTicker.async_subscribe, with changes from the log."""
+        self._heard.setdefault(game_id, time.monotonic())
+        return super().async_subscribe(game_id, update_callback)
+
+    @callback
+    def _notify_stale(self) -> None:
+        """Send None to the subscribers of games the log has been silent about."""
+        now = time.monotonic()
+        for game_id in self._heard.keys() - self._listeners.keys():
+            del self._heard[game_id]
+        for game_id, callbacks in list(self._listeners.items()):
+            if now - self._heard.setdefault(game_id, now) >= CHANGE_FEED_STALE_SECONDS:
+                self._heard[game_id] = now
+                for update_callback in list(callbacks):
+                    update_callback(None)
+
+    async def _async_run(self) -> None:
+        _LOGGER.debug(f"Tailing the change log in {self.feed.path}")
+        metrics = self.api_client.metrics
+        backoff = Backoff(base=self.interval, cap=LIVE_GAME_POLL_INTERVAL_SECONDS)
+        try:
+            while self._listeners:
+                delay = self.interval
+                try:
+                    changes = await self.hass.async_add_executor_job(self.feed.poll)
+                    backoff.reset()
+                    for change in changes:
+                        metrics.increment("change_feed_rows")
+                        self._heard[change["game_id"]] = time.monotonic()
+                        for update_callback in list(self._listeners.get(change["game_id"], [])):
+                            update_callback(as_score_entry(change))
+                        self.feed.ack(change["seq"])
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    metrics.increment("change_feed_errors")
+                    delay = backoff.next_delay()
+                    _LOGGER.warning(
+                        f"Reading the change log failed, retrying in {delay:.0f}s: {e}")
+
+                self._notify_stale()
+                await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            _LOGGER.debug("Change feed ticker was cancelled.")
+        finally:
+            self._task = None
+            self.feed.close()
+        _LOGGER.debug("Change feed ticker stopped, no live games left")
+
+
+class NHLDaemonTicker(NHLLeagueTicker):
+    """
+    Follows live games through a local nhl_fetchd's /events stream.
+
+    The daemon polls /score/now once for every client on the host and pushes
+    each game's snapshot when it changes, so subscribers get /score-shaped
+    entries as soon as the daemon sees them, without polling anything. The
+    latest snapshot of every game is kept, so a late subscriber gets its
+    game's right away. As from NHLLeagueTicker, subscribers get None for a
+    game missing from /score: one the daemon didn't send before it synced,
+    or announced as gone since.
+    """
+
+    def __init__(self, hass: HomeAssistant, api_client, interval: int = LIVE_GAME_POLL_INTERVAL_SECONDS):
+        """Initialize the ticker."""
+        super().__init__(hass, api_client, interval)
+        self._games: dict[int, dict] = {}
+        # Whether _games holds every game the daemon has, i.e. its "synced" event arrived
+        self._synced = False
+
+    @callback
+    def async_subscribe(self, game_id: int, update_callback: Callable[[dict | None], None]) -> Callable[[], None]:
+        """Same as NHLLeagueTicker.async_subscribe; the game's current snapshot follows right away."""
+        unsubscribe = super().async_subscribe(game_id, update_callback)
+        if game_id in self._games or self._synced:
+            # Not from inside async_subscribe: the caller hasn't stored its unsubscribe yet.
+            self.hass.loop.call_soon(self._deliver, game_id, update_callback)
+        return unsubscribe
+
+    @callback
+    def _deliver(self, game_id: int, update_callback: Callable[[dict | None], None]) -> None:
+        if update_callback in self._listeners.get(game_id, []):
+            update_callback(self._games.get(game_id))
+
+    @callback
+    def _notify(self, game_id: int) -> None:
+        for update_callback in list(self._listeners.get(game_id, [])):
+            update_callback(self._games.get(game_id))
+
+    @callback
+    def _handle_event(self, event: str, data: dict) -> None:
+        if event == "game":
+            self._games[data["id"]] = data
+            self._notify(data["id"])
+        elif event == "gone":
+            self._games.pop(data["id"], None)
+            self._notify(data["id"])
+        elif event == "synced":
+            self._synced = True
+            for game_id in self._listeners.keys() - self._games.keys():
+                self._notify(game_id)
+
+    async def _async_run(self) -> None:
+        events_url = self.api_client.base_url.removesuffix("/v1") + "/events"
+        _LOGGER.debug(f"Streaming live games from {events_url}")
+        metrics = self.api_client.metrics
+        backoff = Backoff(base=1, cap=LIVE_GAME_POLL_INTERVAL_SECONDS)
+        try:
+            while self._listeners:
+                delay = 1  # The daemon closed the stream (e.g. restarted)
+                try:
+                    # No total timeout: the stream stays open, with keepalives every 15s.
+                    async with self.api_client.session().get(
+                            events_url, timeout=aiohttp.ClientTimeout(total=None, sock_read=60)) as response:
+                        response.raise_for_status()
+                        backoff.reset()
+                        # The daemon sends every current game again on connect.
+                        self._games.clear()
+                        event = "game"
+                        async for line in response.content:
+                            if not self._listeners:
+                                break
+                            if line.startswith(b"event:"):
+                                event = line[len(b"event:"):].strip().decode()
+                            elif line.startswith(b"data:"):
+                                metrics.increment("daemon_events")
+                                self._handle_event(event, json.loads(line[len(b"data:"):]))
+                                event = "game"
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    metrics.increment("live_poll_errors")
+                    delay = backoff.next_delay()
+                    _LOGGER.warning(
+                        f"Fetch daemon stream failed, reconnecting in {delay:.0f}s: {e}")
+                finally:
+                    self._synced = False
+                await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            _LOGGER.debug("Fetch daemon ticker was cancelled.")
+        finally:
+            self._task = None
+        _LOGGER.debug("Fetch daemon ticker stopped, no live games left")